@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Analytics Counters - AIFF Backend
+Incrementally maintained aggregates for the polled dashboard endpoints
+
+The dashboard polls the overview, assignment performance and zone
+analytics endpoints every few seconds. Instead of rescanning all tickets
+and assignments on each call, these counters are updated in O(1) per
+mutation (create, assign, auto-assign, status change, daily assignment
+merge) and the endpoints read them directly.
+
+Each tracker remembers the contribution it recorded for a row, so a row
+mutated in place can be re-tracked: the old contribution is subtracted
+and the new one added.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from ticket_store import parse_timestamp
+
+RESOLVED_STATUSES = ('resolved', 'closed', 'completed')
+PENDING_STATUSES = ('open', 'pending', 'in_progress')
+
+
+class TicketCounters:
+    """
+    Per-status, per-priority, per-zone and per-team ticket counters plus a
+    running sum of resolution hours
+
+    Registered as a TicketStore observer, so it sees every add/reindex.
+    """
+
+    def __init__(self):
+        self._rows: Dict[str, Tuple] = {}
+        self.reset()
+
+    def reset(self):
+        """Drop all counts (store cleared)"""
+        self._rows.clear()
+        self.by_status = Counter()
+        self.by_priority = Counter()
+        self.by_zone: Dict[str, Counter] = {}
+        self.by_team: Dict[str, Counter] = {}
+        self.auto_assigned = 0
+        self.resolution_hours_sum = 0.0
+        self.resolution_count = 0
+
+    def track(self, ticket_id: str, ticket: Dict, times: Dict[str, Optional[float]]):
+        """Record (or replace) a ticket's contribution"""
+        self.untrack(ticket_id)
+
+        status = ticket.get('status')
+        resolution_hours = None
+        if status in RESOLVED_STATUSES and ticket.get('resolvedAt'):
+            created, resolved = times.get('createdAt'), times.get('resolvedAt')
+            if created is not None and resolved is not None:
+                resolution_hours = (resolved - created) / 3600
+
+        row = (
+            status,
+            ticket.get('priority'),
+            (ticket.get('location') or {}).get('zone'),
+            ticket.get('assignedTeam'),
+            ticket.get('assignedBy') == 'AI',
+            resolution_hours
+        )
+        self._rows[ticket_id] = row
+        self._apply(row, 1)
+
+    def untrack(self, ticket_id: str):
+        """Remove a ticket's contribution, if any"""
+        row = self._rows.pop(ticket_id, None)
+        if row is not None:
+            self._apply(row, -1)
+
+    def _apply(self, row: Tuple, sign: int):
+        status, priority, zone, team, auto_assigned, resolution_hours = row
+        self.by_status[status] += sign
+        self.by_priority[priority] += sign
+        self.by_zone.setdefault(zone, Counter())[status] += sign
+        if team:
+            self.by_team.setdefault(team, Counter())[status] += sign
+        if auto_assigned:
+            self.auto_assigned += sign
+        if resolution_hours is not None:
+            self.resolution_hours_sum += sign * resolution_hours
+            self.resolution_count += sign
+
+    @property
+    def total(self) -> int:
+        return len(self._rows)
+
+    def count_status(self, statuses: Iterable[str]) -> int:
+        return sum(self.by_status[s] for s in statuses)
+
+    def average_resolution_hours(self) -> float:
+        if not self.resolution_count:
+            return 0
+        return self.resolution_hours_sum / self.resolution_count
+
+
+class AssignmentCounters:
+    """Per-status assignment counters plus a running sum of completion hours"""
+
+    def __init__(self, assignments: Iterable[Dict] = ()):
+        self._rows: Dict[str, Tuple] = {}
+        self.rebuild(assignments)
+
+    def rebuild(self, assignments: Iterable[Dict]):
+        """Recount from scratch (bulk load or list replaced)"""
+        self._rows.clear()
+        self.by_status = Counter()
+        self.completion_hours_sum = 0.0
+        self.completion_count = 0
+        for assignment in assignments:
+            self.track(assignment)
+
+    @staticmethod
+    def _key(assignment: Dict) -> str:
+        # Engine-created assignments carry assignmentId instead of _id
+        return assignment.get('_id') or assignment.get('assignmentId')
+
+    def track(self, assignment: Dict):
+        """Record (or replace) an assignment's contribution"""
+        key = self._key(assignment)
+        self.untrack(assignment)
+
+        status = assignment.get('status')
+        completion_hours = None
+        if status == 'completed' and assignment.get('completedAt'):
+            created = parse_timestamp(assignment.get('createdAt') or assignment.get('assignedAt'))
+            completed = parse_timestamp(assignment['completedAt'])
+            if created is not None and completed is not None:
+                completion_hours = (completed - created) / 3600
+
+        row = (status, completion_hours)
+        self._rows[key] = row
+        self._apply(row, 1)
+
+    def untrack(self, assignment: Dict):
+        row = self._rows.pop(self._key(assignment), None)
+        if row is not None:
+            self._apply(row, -1)
+
+    def _apply(self, row: Tuple, sign: int):
+        status, completion_hours = row
+        self.by_status[status] += sign
+        if completion_hours is not None:
+            self.completion_hours_sum += sign * completion_hours
+            self.completion_count += sign
+
+    @property
+    def total(self) -> int:
+        return len(self._rows)
+
+    def average_completion_hours(self) -> float:
+        if not self.completion_count:
+            return 0
+        return self.completion_hours_sum / self.completion_count
+
+
+class ZoneTeamCounters:
+    """Per-zone team roster, completed-ticket totals and rating sums"""
+
+    def __init__(self):
+        self.zones: Dict[str, Dict] = {}
+        self._zone_of: Dict[str, str] = {}
+
+    def reset(self):
+        self.zones.clear()
+        self._zone_of.clear()
+
+    def track(self, team: Dict):
+        """Add a team to its zone rollup, or replace its entry after a change"""
+        zone = team.get('zone', 'Unknown')
+        entry = {
+            "id": team["_id"],
+            "name": team["name"],
+            "state": team.get("state"),
+            "status": team["status"],
+            "rating": team["productivity"]["customerRating"],
+            "ticketsCompleted": team["productivity"]["totalTicketsCompleted"]
+        }
+        if self._zone_of.get(team["_id"]) == zone:
+            # Same zone: replace in place so the roster keeps its order
+            rollup = self.zones[zone]
+            index = next(i for i, t in enumerate(rollup['teams']) if t["id"] == team["_id"])
+            self._apply(rollup, rollup['teams'][index], -1)
+            rollup['teams'][index] = entry
+        else:
+            self.untrack(team)
+            rollup = self.zones.setdefault(zone, {'teams': [], 'totalTickets': 0, 'ratingSum': 0})
+            rollup['teams'].append(entry)
+            self._zone_of[team["_id"]] = zone
+        self._apply(rollup, entry, 1)
+
+    def untrack(self, team: Dict):
+        """Remove a team from the zone rollup it was tracked in"""
+        zone = self._zone_of.pop(team["_id"], None)
+        if zone is None:
+            return
+        rollup = self.zones[zone]
+        entry = next(t for t in rollup['teams'] if t["id"] == team["_id"])
+        rollup['teams'].remove(entry)
+        self._apply(rollup, entry, -1)
+        if not rollup['teams']:
+            del self.zones[zone]
+
+    @staticmethod
+    def _apply(rollup: Dict, entry: Dict, sign: int):
+        rollup['totalTickets'] += sign * entry["ticketsCompleted"]
+        rollup['ratingSum'] += sign * entry["rating"]
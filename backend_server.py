@@ -4,15 +4,18 @@ AIFF Backend Server - Clean Version
 Advanced Intelligence Field Force Systems - Python Flask Backend
 """
 
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory, make_response
 from flask_cors import CORS
 import json
+import time
 import uuid
+from functools import wraps
 from datetime import datetime, timedelta
 import random
 import math
 import sys
 import os
+import sqlite3
 
 # OpenAI integration (optional)
 try:
@@ -38,23 +41,320 @@ except ImportError:
     ENHANCED_AVAILABLE = False
     print("⚠️  Enhanced data generator not available, using sample data only")
 
+# Dataset snapshot: restarts bulk-load the generated data instead of regenerating it
+try:
+    from dataset_snapshot import load_snapshot, save_snapshot, snapshot_settings
+    SNAPSHOT_AVAILABLE = True
+except ImportError:
+    SNAPSHOT_AVAILABLE = False
+    print("⚠️  Dataset snapshot not available, regenerating data on every start")
+
 # Try to import intelligent assignment engine
 try:
-    from intelligent_assignment_engine import IntelligentAssignmentEngine
+    from intelligent_assignment_engine import IntelligentAssignmentEngine, ASSIGNMENT_ALGORITHMS
     INTELLIGENT_ASSIGNMENT_AVAILABLE = True
     print("✅ Intelligent Assignment Engine available")
 except ImportError:
     INTELLIGENT_ASSIGNMENT_AVAILABLE = False
     print("⚠️  Intelligent Assignment Engine not available")
 
+from ticket_store import TicketStore, ticketv2_performance_counts, parse_timestamp, project
+from analytics_counters import (
+    TicketCounters, AssignmentCounters, ZoneTeamCounters,
+    RESOLVED_STATUSES, PENDING_STATUSES
+)
+
+from response_encoding import EncodedTicketCache, Encoded, FastJSONProvider, json_response
+from change_log import ChangeLog, INSERT, UPDATE, DELETE
+from live_events import LiveEventBroker, TicketEventPublisher, LIVE_HEARTBEAT_SECONDS, RESYNC
+from dataset_lock import DatasetLock
+from spatial_index import SpatialIndex, TicketLocationIndex, team_coordinates, ticket_coordinates
+from route_planner import RoutePlanner, DEFAULT_STOP_MINUTES
+
+# Try to import NumPy columnar analytics, fallback to pure Python aggregation
+try:
+    from ticket_columns import TicketColumns
+    COLUMNAR_ANALYTICS_AVAILABLE = True
+    print("✅ Columnar analytics (NumPy) available")
+except ImportError:
+    COLUMNAR_ANALYTICS_AVAILABLE = False
+    print("⚠️  NumPy not available, using pure Python analytics")
+
+# Mutation journal for multi-worker serving (POSIX flock)
+try:
+    from mutation_journal import MutationJournal
+    JOURNAL_AVAILABLE = True
+except ImportError:
+    JOURNAL_AVAILABLE = False
+
+# Precomputed district/team travel-time matrix (NumPy)
+try:
+    from travel_matrix import TravelTimeMatrix
+    TRAVEL_MATRIX_AVAILABLE = True
+except ImportError:
+    TRAVEL_MATRIX_AVAILABLE = False
+
 app = Flask(__name__)
 CORS(app)
+# orjson-backed jsonify (stdlib fallback), same documents as the default provider
+app.json = FastJSONProvider(app)
 
 # Sample data storage
-tickets = []
+tickets = TicketStore()
 field_teams = []
 assignments = []
 
+# Incrementally maintained dashboard aggregates (O(1) per mutation)
+ticket_counters = TicketCounters()
+tickets.add_observer(ticket_counters)
+
+# Encoded JSON per ticket; list responses splice these instead of re-encoding
+ticket_payloads = EncodedTicketCache()
+tickets.add_observer(ticket_payloads)
+
+# Ticket/assignment change log behind /api/ticketv2/changes (delta sync)
+change_log = ChangeLog()
+tickets.add_observer(change_log)
+
+# Live tracking deltas pushed to /api/live-tracking/stream subscribers
+live_events = LiveEventBroker()
+tickets.add_observer(TicketEventPublisher(live_events))
+
+# Grid indexes over ticket coordinates and team positions (nearest-team queries)
+ticket_locations = TicketLocationIndex()
+tickets.add_observer(ticket_locations)
+team_locations = SpatialIndex()
+
+# Team x district travel minutes, refreshed per team as teams move; shared
+# with every assignment engine run
+travel_times = TravelTimeMatrix() if TRAVEL_MATRIX_AVAILABLE else None
+
+# Per-team stop ordering for /api/live-tracking/routes, re-planned only when
+# a team's in-progress ticket set (or its position) changes
+route_planner = RoutePlanner()
+assignment_counters = AssignmentCounters()
+zone_counters = ZoneTeamCounters()
+
+# Monotonic collection versions behind the GET ETags (tickets use the store's
+# own counter); every route that mutates teams or assignments bumps them
+collection_versions = {'teams': 0, 'assignments': 0}
+# Counters restart at zero with the process, so ETags carry a per-run token
+_etag_epoch = os.urandom(4).hex()
+# Change-log versions are per process; gunicorn workers get their own token
+_sync_epoch = _etag_epoch
+
+# Readers share the dataset, writers get it exclusively (see dataset_lock.py)
+dataset_lock = DatasetLock()
+
+# Single-writer journal shared by gunicorn workers (None when serving from
+# one process); created once the startup dataset is loaded
+journal = None
+
+def bump_version(*collections):
+    """Mark collections as changed so their cached GET responses revalidate"""
+    for name in collections:
+        collection_versions[name] += 1
+
+def dataset_etag(collections, ttl=None):
+    """ETag for a response derived from the given collections (and the clock, if ttl)"""
+    parts = [_etag_epoch]
+    for name in collections:
+        if journal is not None:
+            # Per-process counters differ between workers; journal positions do not
+            version = journal.collection_offsets[name]
+        else:
+            version = tickets.version if name == 'tickets' else collection_versions[name]
+        parts.append(f"{name}{version}")
+    if ttl:
+        # Time-relative analytics (weekly windows etc.) also change with the clock
+        parts.append(f"t{int(time.time() // ttl)}")
+    return '-'.join(parts)
+
+def conditional_get(*collections, ttl=None):
+    """
+    ETag / If-None-Match support for a GET route
+    
+    The ETag is computed from the collection versions before the view
+    runs, so a matching If-None-Match returns 304 without building the
+    response at all.
+    
+    Args:
+        collections: Collections the response is derived from
+            ('tickets', 'teams', 'assignments')
+        ttl: Seconds after which a time-relative response is rebuilt
+            even if no collection changed
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = dataset_etag(collections, ttl)
+            if request.if_none_match.contains(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Let browsers keep the body but revalidate on every poll
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+@app.before_request
+def acquire_dataset_access():
+    """
+    Shared access for reads, exclusive single-writer access for writes
+
+    With the journal, writes also become the writer across all workers and
+    reads first apply other workers' mutations. The journal is locked
+    first: while another worker runs a long write, this worker's writer
+    waits for it without keeping this worker's readers out.
+    """
+    if request.method in WRITE_METHODS:
+        if journal is not None:
+            journal.begin()
+        # Nested in the journal's writer role when there is one
+        dataset_lock.acquire_write()
+        g.dataset_access = 'write'
+    else:
+        if journal is not None:
+            journal.catch_up()
+        dataset_lock.acquire_read()
+        g.dataset_access = 'read'
+
+@app.teardown_request
+def release_dataset_access(exc):
+    """Publish this request's mutations and release access before the response goes out"""
+    access = g.pop('dataset_access', None)
+    if access == 'write':
+        try:
+            if journal is not None:
+                journal.commit()
+        finally:
+            dataset_lock.release_write()
+    elif access == 'read':
+        dataset_lock.release_read()
+
+def apply_journal_entries(entries):
+    """Replay mutations journaled by another worker (see mutation_journal.py)"""
+    global assignments
+    teams_by_id = {t['_id']: t for t in field_teams}
+    assignments_by_key = {assignment_key(a): a for a in assignments}
+    deleted = set()
+    for collection, operation, doc in entries:
+        if collection == 'tickets':
+            stored = tickets.get(doc['_id'])
+            if stored is None:
+                tickets.add(doc)
+            else:
+                stored.clear()
+                stored.update(doc)
+                tickets.reindex(stored)
+        elif collection == 'teams':
+            team = teams_by_id.get(doc['_id'])
+            if team is None:
+                team = teams_by_id[doc['_id']] = doc
+                field_teams.append(team)
+            else:
+                team.clear()
+                team.update(doc)
+            zone_counters.track(team)
+            index_team_location(team)
+            bump_version('teams')
+            live_events.publish('team', team_event(team))
+        elif collection == 'assignments':
+            key = assignment_key(doc)
+            stored = assignments_by_key.get(key)
+            if operation == DELETE:
+                if stored is not None:
+                    deleted.add(key)
+                    del assignments_by_key[key]
+                    assignment_counters.untrack(stored)
+            elif stored is None:
+                assignments.append(doc)
+                assignments_by_key[key] = doc
+                deleted.discard(key)
+                assignment_counters.track(doc)
+            else:
+                stored.clear()
+                stored.update(doc)
+                assignment_counters.track(stored)
+            bump_version('assignments')
+            assignment_changed(operation, assignments_by_key.get(key, doc))
+    if deleted:
+        assignments = [a for a in assignments if assignments_by_key.get(assignment_key(a)) is a]
+
+def assignment_key(assignment):
+    """Assignment id (engine-created assignments carry assignmentId instead of _id)"""
+    return assignment.get('_id') or assignment.get('assignmentId')
+
+def assignment_changed(operation, assignment):
+    """Record an assignment change for delta sync, live subscribers and other workers"""
+    change_log.record('assignments', operation, assignment_key(assignment))
+    if journal is not None:
+        journal.record('assignments', operation, assignment_key(assignment), assignment)
+    live_events.publish('assignment', {
+        'operation': operation,
+        'assignmentId': assignment_key(assignment),
+        'ticketId': assignment.get('ticketId'),
+        'teamId': assignment.get('teamId'),
+        'status': assignment.get('status')
+    })
+
+def team_changed(team):
+    """Mark a team as changed (ETags; journaled for other workers)"""
+    bump_version('teams')
+    if journal is not None:
+        journal.record('teams', UPDATE, team['_id'], team)
+
+def team_event(team):
+    """Live tracking payload of one team"""
+    return {
+        'teamId': team['_id'],
+        'teamName': team['name'],
+        'location': team.get('currentLocation', {}),
+        'status': team.get('status', 'active'),
+        'currentTask': team.get('currentTask', None)
+    }
+
+def index_team_location(team):
+    """Add, move or drop a team in the team spatial index and travel matrix"""
+    coordinates = team_coordinates(team)
+    if coordinates is None:
+        team_locations.remove(team['_id'])
+    else:
+        team_locations.upsert(team['_id'], *coordinates)
+    if travel_times is not None:
+        travel_times.update_team(team)
+
+def rebuild_analytics_counters():
+    """Recount team and assignment aggregates after a bulk load"""
+    bump_version('teams', 'assignments')
+    team_locations.clear()
+    if travel_times is not None:
+        travel_times.clear_teams()
+    for team in field_teams:
+        index_team_location(team)
+    # Bulk-loaded rows are not deltas: clients start from a full load
+    change_log.truncate()
+    assignment_counters.rebuild(assignments)
+    zone_counters.reset()
+    for team in field_teams:
+        zone_counters.track(team)
+
+# Columnar snapshot of tickets, rebuilt when the store version changes
+_ticket_columns = None
+
+def get_ticket_columns():
+    """Return the columnar ticket snapshot for the current store version"""
+    global _ticket_columns
+    if _ticket_columns is None or _ticket_columns.version != tickets.version:
+        _ticket_columns = TicketColumns(tickets)
+    return _ticket_columns
+
 def load_sample_data():
     """Load sample data using modular data system"""
     global tickets, field_teams, assignments
@@ -120,7 +420,7 @@ def load_sample_data():
                 "resolvedAt": ticket.get("resolved_at"),
                 "estimatedDuration": ticket.get("estimated_duration", 90)
             }
-            tickets.append(converted_ticket)
+            tickets.add(converted_ticket)
         
         # Convert assignments
         for assignment in data['assignments']:
@@ -280,7 +580,7 @@ def load_enhanced_data():
                     # Efficiency
                     "efficiencyScore": ticket.get("efficiencyScore")
                 }
-            tickets.append(converted_ticket)
+            tickets.add(converted_ticket)
             new_tickets_added += 1
         
         print(f"✅ Added {new_tickets_added} new tickets (total: {len(tickets)})")
@@ -339,43 +639,162 @@ def health_check():
         "tickets": len(tickets)
     })
 
+# Query-string filters accepted by the ticket listings (comma-separated or repeated)
+TICKET_FILTER_PARAMS = ('status', 'priority', 'state', 'zone', 'district', 'assignedTeam')
+
+def _parse_created_bound(name, end_of_day=False):
+    """createdFrom/createdTo as epoch seconds; a bare date as createdTo includes that day"""
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    value = parse_timestamp(raw)
+    if value is None:
+        raise ValueError(f"Invalid {name}: {raw} (expected YYYY-MM-DD or ISO datetime)")
+    if end_of_day and len(raw) == 10:
+        value = parse_timestamp((datetime.fromisoformat(raw) + timedelta(days=1)).isoformat())
+    return value
+
+def query_tickets_from_request():
+    """
+    Run a ticket listing query from the request's query string
+    
+    Supports status/priority/state/zone/district/assignedTeam filters,
+    createdFrom/createdTo, sort (prefix '-' for descending), cursor
+    (keyset pagination), limit/offset and fields (comma-separated,
+    dotted paths allowed).
+    
+    Returns:
+        (query result from TicketStore.query plus 'count', limit) - tickets
+        are projected when fields= is given, otherwise pre-encoded
+    
+    Raises:
+        ValueError: Invalid parameter (reported as 400)
+    """
+    criteria = {}
+    for name in TICKET_FILTER_PARAMS:
+        values = [value for raw in request.args.getlist(name) for value in raw.split(',') if value]
+        if values:
+            criteria[name] = values
+    
+    sort = request.args.get('sort') or None
+    descending = bool(sort) and sort.startswith('-')
+    if descending:
+        sort = sort[1:]
+    if sort is not None and sort not in TicketStore.SORT_KEYS:
+        raise ValueError(f"Invalid sort: {sort} (expected one of {', '.join(TicketStore.SORT_KEYS)})")
+    
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', type=int, default=0)
+    if (limit is not None and limit < 0) or offset < 0:
+        raise ValueError("limit and offset must be non-negative")
+    
+    result = tickets.query(
+        criteria=criteria,
+        created_from=_parse_created_bound('createdFrom'),
+        created_to=_parse_created_bound('createdTo', end_of_day=True),
+        sort=sort,
+        descending=descending,
+        cursor=request.args.get('cursor') or None,
+        offset=offset,
+        limit=limit or None
+    )
+    
+    fields = [field for field in request.args.get('fields', '').split(',') if field]
+    result['count'] = len(result['tickets'])
+    if fields:
+        result['tickets'] = [project(ticket, fields) for ticket in result['tickets']]
+    else:
+        result['tickets'] = ticket_payloads.encode_list(result['tickets'])
+    return result, limit
+
 @app.route('/api/tickets', methods=['GET'])
+@conditional_get('tickets')
 def get_tickets():
-    """Get all tickets"""
+    """Get tickets (filter, sort, cursor and fields query parameters; see query_tickets_from_request)"""
     try:
-        return jsonify({"tickets": tickets, "total": len(tickets)})
+        result, _ = query_tickets_from_request()
+        return json_response({
+            "tickets": result['tickets'],
+            "total": result['total'],
+            "count": result['count'],
+            "nextCursor": result['next_cursor']
+        })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/ticketv2', methods=['GET'])
+@conditional_get('tickets')
 def get_tickets_v2():
-    """Get all tickets (v2 API with limit and offset support for pagination)"""
+    """Get tickets (v2 API with limit/offset or keyset cursor pagination, filters and fields)"""
     try:
-        limit = request.args.get('limit', type=int)
-        offset = request.args.get('offset', type=int, default=0)
-        
-        # Get total count before pagination
-        total_count = len(tickets)
-        
-        # Apply offset and limit for pagination
-        if limit:
-            start_idx = offset
-            end_idx = offset + limit
-            result_tickets = tickets[start_idx:end_idx]
-        else:
-            result_tickets = tickets
+        result, limit = query_tickets_from_request()
         
-        return jsonify({
-            "tickets": result_tickets, 
-            "total": total_count,
+        return json_response({
+            "tickets": result['tickets'], 
+            "total": result['total'],
             "limit": limit,
-            "offset": offset,
-            "count": len(result_tickets)
+            "offset": request.args.get('offset', type=int, default=0),
+            "count": result['count'],
+            "nextCursor": result['next_cursor']
         })
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/ticketv2/changes', methods=['GET'])
+@conditional_get('tickets', 'assignments')
+def get_ticket_changes():
+    """
+    Delta sync: tickets and assignments changed since a change version
+    
+    Query: since=<version> (from the previous response) or
+    sinceTime=<ISO datetime>; optional epoch=<epoch> from the previous
+    response. When the log no longer covers the window (retention, reload
+    or server restart) the response has resyncRequired=true: reload the
+    full lists, then continue from the returned version.
+    """
+    try:
+        since = request.args.get('since', type=int)
+        since_time = parse_timestamp(request.args.get('sinceTime'))
+        if since is None and since_time is None:
+            return jsonify({'error': 'since (change version) or sinceTime (ISO datetime) is required'}), 400
+        
+        changes = None
+        if request.args.get('epoch', _sync_epoch) == _sync_epoch:
+            changes = change_log.since(version=since, timestamp=since_time)
+        payload = {
+            'version': change_log.version,
+            'epoch': _sync_epoch,
+            'since': since if since is not None else request.args.get('sinceTime'),
+            'resyncRequired': changes is None
+        }
+        if changes is None:
+            return json_response(payload)
+        
+        ticket_changes = changes.get('tickets', {'inserted': [], 'updated': [], 'deleted': []})
+        payload['tickets'] = {
+            'inserted': ticket_payloads.encode_list(tickets.get(i) for i in ticket_changes['inserted'] if i in tickets),
+            'updated': ticket_payloads.encode_list(tickets.get(i) for i in ticket_changes['updated'] if i in tickets),
+            'deleted': ticket_changes['deleted']
+        }
+        
+        assignment_changes = changes.get('assignments', {'inserted': [], 'updated': [], 'deleted': []})
+        changed_ids = set(assignment_changes['inserted']) | set(assignment_changes['updated'])
+        changed = {assignment_key(a): a for a in assignments if assignment_key(a) in changed_ids} if changed_ids else {}
+        payload['assignments'] = {
+            'inserted': [changed[i] for i in assignment_changes['inserted'] if i in changed],
+            'updated': [changed[i] for i in assignment_changes['updated'] if i in changed],
+            'deleted': assignment_changes['deleted']
+        }
+        return json_response(payload)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/teams', methods=['GET'])
+@conditional_get('teams')
 def get_teams():
     """Get all field teams"""
     try:
@@ -384,6 +803,7 @@ def get_teams():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/assignments', methods=['GET'])
+@conditional_get('assignments')
 def get_assignments():
     """Get all assignments"""
     try:
@@ -392,6 +812,7 @@ def get_assignments():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/analytics/tickets/aging', methods=['GET'])
+@conditional_get('tickets')
 def get_ticket_aging():
     """Get ticket aging analytics"""
     try:
@@ -405,6 +826,7 @@ def get_ticket_aging():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/teams/analytics/productivity', methods=['GET'])
+@conditional_get('teams')
 def get_team_productivity():
     """Get team productivity analytics"""
     try:
@@ -424,41 +846,28 @@ def get_team_productivity():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/teams/analytics/zones', methods=['GET'])
+@conditional_get('teams')
 def get_zone_analytics():
     """Get zone-based analytics"""
     try:
         zone_data = {}
         
-        for team in field_teams:
-            zone = team.get('zone', 'Unknown')
-            if zone not in zone_data:
-                zone_data[zone] = {
-                    "zoneName": zone,
-                    "teams": [],
-                    "totalTickets": 0,
-                    "openTickets": 0,
-                    "closedTickets": 0,
-                    "productivityScore": 0,
-                    "averageRating": 0
-                }
-            
-            zone_data[zone]["teams"].append({
-                "id": team["_id"],
-                "name": team["name"],
-                "state": team["state"],
-                "status": team["status"],
-                "rating": team["productivity"]["customerRating"],
-                "ticketsCompleted": team["productivity"]["totalTicketsCompleted"]
-            })
+        # Per-zone team rollups are maintained incrementally (see analytics_counters.py)
+        for zone, rollup in zone_counters.zones.items():
+            teams_in_zone = rollup["teams"]
+            zone_data[zone] = {
+                "zoneName": zone,
+                "teams": teams_in_zone,
+                "totalTickets": rollup["totalTickets"],
+                "openTickets": 0,
+                "closedTickets": 0,
+                "productivityScore": 0,
+                "averageRating": rollup["ratingSum"]
+            }
             
-            zone_data[zone]["totalTickets"] += team["productivity"]["totalTicketsCompleted"]
-            zone_data[zone]["averageRating"] += team["productivity"]["customerRating"]
-        
-        # Calculate zone metrics
-        for zone in zone_data:
-            teams_in_zone = zone_data[zone]["teams"]
+            # Calculate zone metrics
             if teams_in_zone:
-                zone_data[zone]["averageRating"] = round(zone_data[zone]["averageRating"] / len(teams_in_zone), 2)
+                zone_data[zone]["averageRating"] = round(rollup["ratingSum"] / len(teams_in_zone), 2)
                 
                 # Calculate open vs closed tickets
                 total_tickets = zone_data[zone]["totalTickets"]
@@ -476,28 +885,20 @@ def get_zone_analytics():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/tickets/analytics/overview', methods=['GET'])
+@conditional_get('tickets')
 def get_tickets_analytics_overview():
     """Get tickets analytics overview"""
     try:
-        # Calculate analytics
-        total_tickets = len(tickets)
-        resolved_tickets = len([t for t in tickets if t.get('status') in ['resolved', 'closed', 'completed']])
-        pending_tickets = len([t for t in tickets if t.get('status') in ['open', 'pending', 'in_progress']])
-        critical_tickets = len([t for t in tickets if t.get('priority') == 'high'])
+        # Calculate analytics from incrementally maintained counters
+        total_tickets = ticket_counters.total
+        resolved_tickets = ticket_counters.count_status(RESOLVED_STATUSES)
+        pending_tickets = ticket_counters.count_status(PENDING_STATUSES)
+        critical_tickets = ticket_counters.by_priority['high']
         
         resolution_rate = (resolved_tickets / total_tickets * 100) if total_tickets > 0 else 0
         
-        # Calculate average resolution time
-        resolved_with_time = [t for t in tickets if t.get('status') in ['resolved', 'closed', 'completed'] and t.get('resolvedAt')]
-        if resolved_with_time:
-            total_time = 0
-            for ticket in resolved_with_time:
-                created = datetime.fromisoformat(ticket['createdAt'].replace('Z', '+00:00'))
-                resolved = datetime.fromisoformat(ticket['resolvedAt'].replace('Z', '+00:00'))
-                total_time += (resolved - created).total_seconds() / 3600  # hours
-            avg_resolution_time = total_time / len(resolved_with_time)
-        else:
-            avg_resolution_time = 0
+        # Average resolution time (running sum of hours over resolved tickets)
+        avg_resolution_time = ticket_counters.average_resolution_hours()
         
         return jsonify({
             'totalTickets': total_tickets,
@@ -507,7 +908,7 @@ def get_tickets_analytics_overview():
             'resolutionRate': round(resolution_rate, 2),
             'avgResolutionTime': round(avg_resolution_time, 2),
             'customerSatisfaction': 4.5,  # Mock data
-            'autoAssigned': len([t for t in tickets if t.get('assignedBy') == 'AI'])
+            'autoAssigned': ticket_counters.auto_assigned
         })
         
     except Exception as e:
@@ -612,28 +1013,20 @@ def get_zone_materials():
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/assignments/analytics/performance', methods=['GET'])
+@conditional_get('assignments')
 def get_assignments_analytics_performance():
     """Get assignments analytics performance"""
     try:
-        # Calculate assignment performance metrics
+        # Calculate assignment performance metrics from incrementally maintained counters
         total_assignments = len(assignments)
-        completed_assignments = len([a for a in assignments if a.get('status') == 'completed'])
-        in_progress_assignments = len([a for a in assignments if a.get('status') == 'in_progress'])
-        pending_assignments = len([a for a in assignments if a.get('status') == 'pending'])
+        completed_assignments = assignment_counters.by_status['completed']
+        in_progress_assignments = assignment_counters.by_status['in_progress']
+        pending_assignments = assignment_counters.by_status['pending']
         
         completion_rate = (completed_assignments / total_assignments * 100) if total_assignments > 0 else 0
         
-        # Calculate average completion time
-        completed_with_time = [a for a in assignments if a.get('status') == 'completed' and a.get('completedAt')]
-        if completed_with_time:
-            total_time = 0
-            for assignment in completed_with_time:
-                created = datetime.fromisoformat(assignment['createdAt'].replace('Z', '+00:00'))
-                completed = datetime.fromisoformat(assignment['completedAt'].replace('Z', '+00:00'))
-                total_time += (completed - created).total_seconds() / 3600  # hours
-            avg_completion_time = total_time / len(completed_with_time)
-        else:
-            avg_completion_time = 0
+        # Average completion time (assignments carry assignedAt when createdAt is absent)
+        avg_completion_time = assignment_counters.average_completion_hours()
         
         return jsonify({
             'totalAssignments': total_assignments,
@@ -682,7 +1075,7 @@ All teams are performing excellently! 🎯"""
                 response = f"""**Ticket Analytics:**
                 
 - Total Tickets: {len(tickets)}
-- Open Tickets: {len([t for t in tickets if t['status'] == 'open'])}
+- Open Tickets: {tickets.count(status='open')}
 - System is maintaining excellent response times! 📊"""
             
             else:
@@ -942,6 +1335,7 @@ I'm your AI Field Assistant. I can help you with:
 Try the quick action buttons below for common questions!"""
 
 @app.route('/api/teams/analytics/performance', methods=['GET'])
+@conditional_get('tickets', 'teams', ttl=60)
 def get_teams_performance_analytics():
     """Get comprehensive field teams performance analytics with weekly trends and projections"""
     try:
@@ -951,18 +1345,18 @@ def get_teams_performance_analytics():
         now = datetime.now()
         weeks_data = []
         
-        for week_offset in range(-11, 1):  # Past 11 weeks + current week = 12 weeks
+        # Single pass: bucket tickets by week, then collect active teams per week
+        week_buckets = tickets.week_buckets(now, weeks=12)
+        week_active_teams = [
+            set(t['assignedTeam'] for t in bucket if t.get('assignedTeam'))
+            for bucket in week_buckets
+        ]
+        
+        for week_index, week_offset in enumerate(range(-11, 1)):  # Past 11 weeks + current week = 12 weeks
             week_start = now + timedelta(weeks=week_offset)
-            week_end = week_start + timedelta(days=7)
             
-            # Filter teams by their activity in this week (checking if they completed tickets)
-            week_tickets = [t for t in tickets if week_start <= datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')) < week_end]
-            
-            # Count teams by activity status
-            active_teams = set()
-            for ticket in week_tickets:
-                if ticket.get('assignedTeam'):
-                    active_teams.add(ticket['assignedTeam'])
+            # Teams active in this week (assigned to tickets created in it)
+            active_teams = week_active_teams[week_index]
             
             total_active = len(active_teams)
             total_inactive = len(field_teams) - total_active
@@ -1015,14 +1409,11 @@ def get_teams_performance_analytics():
         
         # Performance metrics by week
         performance_weeks = []
-        for week_offset in range(-11, 1):
+        for week_index, week_offset in enumerate(range(-11, 1)):
             week_start = now + timedelta(weeks=week_offset)
-            week_end = week_start + timedelta(days=7)
-            
-            week_tickets = [t for t in tickets if week_start <= datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')) < week_end]
             
             # Calculate average team performance for this week
-            active_team_ids = set([t.get('assignedTeam') for t in week_tickets if t.get('assignedTeam')])
+            active_team_ids = week_active_teams[week_index]
             active_teams_data = [t for t in field_teams if t['_id'] in active_team_ids]
             
             if active_teams_data:
@@ -1048,13 +1439,11 @@ def get_teams_performance_analytics():
         
         for state in states:
             state_teams = [t for t in field_teams if t.get('state') == state]
-            for week_offset in range(-11, 1):
+            state_team_ids = set(team['_id'] for team in state_teams)
+            for week_index, week_offset in enumerate(range(-11, 1)):
                 week_start = now + timedelta(weeks=week_offset)
-                week_end = week_start + timedelta(days=7)
-                
-                week_tickets = [t for t in tickets if week_start <= datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')) < week_end]
                 
-                active_in_week = set([t.get('assignedTeam') for t in week_tickets if t.get('assignedTeam') and any(team['_id'] == t.get('assignedTeam') and team.get('state') == state for team in state_teams)])
+                active_in_week = week_active_teams[week_index] & state_team_ids
                 
                 states_weekly_data[state]['weeks'].append({
                     'week': week_start.strftime('%b %d'),
@@ -1145,38 +1534,38 @@ def get_teams_performance_analytics():
         }), 500
 
 @app.route('/api/ticketv2/analytics/performance', methods=['GET'])
+@conditional_get('tickets', 'teams', ttl=60)
 def get_ticketv2_performance_analytics():
     """Get comprehensive ticketv2 performance analytics with weekly trends and projections"""
     try:
         from collections import defaultdict
         
+        malaysian_states = ['Johor', 'Kedah', 'Kelantan', 'Melaka', 'Negeri Sembilan', 
+                           'Pahang', 'Penang', 'Perak', 'Perlis', 'Sabah', 'Sarawak',
+                           'Selangor', 'Terengganu', 'Kuala Lumpur', 'Putrajaya']
+        
         # Calculate weekly data for the past 12 weeks
         now = datetime.now()
         weeks_data = []
         
-        for week_offset in range(-11, 1):  # Past 11 weeks + current week = 12 weeks
+        # All ticket-derived counts in one pass (NumPy columnar snapshot when available)
+        if COLUMNAR_ANALYTICS_AVAILABLE:
+            counts = get_ticket_columns().ticketv2_performance(now, malaysian_states, weeks=12)
+        else:
+            counts = ticketv2_performance_counts(tickets, now, malaysian_states, weeks=12)
+        
+        for week_index, week_offset in enumerate(range(-11, 1)):  # Past 11 weeks + current week = 12 weeks
             week_start = now + timedelta(weeks=week_offset)
-            week_end = week_start + timedelta(days=7)
-            
-            # Filter tickets for this week
-            week_tickets = [t for t in tickets if week_start <= datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')) < week_end]
-            
-            # Count by status
-            status_counts = {
-                'open': len([t for t in week_tickets if t['status'] in ['open', 'pending']]),
-                'in_progress': len([t for t in week_tickets if t['status'] == 'in_progress']),
-                'completed': len([t for t in week_tickets if t['status'] in ['completed', 'resolved', 'closed']]),
-                'cancelled': len([t for t in week_tickets if t['status'] == 'cancelled'])
-            }
+            week_counts = counts['weeks'][week_index]
             
             weeks_data.append({
                 'week': week_start.strftime('%Y-W%W'),
                 'week_label': week_start.strftime('%b %d'),
-                'total': len(week_tickets),
-                'open': status_counts['open'],
-                'in_progress': status_counts['in_progress'],
-                'completed': status_counts['completed'],
-                'cancelled': status_counts['cancelled']
+                'total': week_counts['total'],
+                'open': week_counts['open'],
+                'in_progress': week_counts['in_progress'],
+                'completed': week_counts['completed'],
+                'cancelled': week_counts['cancelled']
             })
         
         # Project 4 future weeks based on linear regression
@@ -1216,48 +1605,24 @@ def get_ticketv2_performance_analytics():
             projections = []
         
         # Status distribution (all time)
-        all_status_distribution = {
-            'open': len([t for t in tickets if t['status'] in ['open', 'pending']]),
-            'in_progress': len([t for t in tickets if t['status'] == 'in_progress']),
-            'completed': len([t for t in tickets if t['status'] in ['completed', 'resolved', 'closed']]),
-            'cancelled': len([t for t in tickets if t['status'] == 'cancelled'])
-        }
+        all_status_distribution = counts['status_distribution']
         
         # High-level performance metrics by week
         performance_weeks = []
-        for week_offset in range(-11, 1):
+        for week_index, week_offset in enumerate(range(-11, 1)):
             week_start = now + timedelta(weeks=week_offset)
-            week_end = week_start + timedelta(days=7)
-            
-            week_tickets = [t for t in tickets if week_start <= datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')) < week_end]
-            completed_tickets = [t for t in week_tickets if t['status'] in ['completed', 'resolved', 'closed']]
+            week_counts = counts['weeks'][week_index]
             
             # Calculate metrics
-            total_tickets = len(week_tickets)
-            completed_count = len(completed_tickets)
+            total_tickets = week_counts['total']
+            completed_count = week_counts['completed']
             productivity = (completed_count / total_tickets * 100) if total_tickets > 0 else 0
             
             # Availability: % of tickets assigned to teams
-            assigned_count = len([t for t in week_tickets if t.get('assignedTeam')])
-            availability = (assigned_count / total_tickets * 100) if total_tickets > 0 else 0
+            availability = (week_counts['assigned'] / total_tickets * 100) if total_tickets > 0 else 0
             
             # Efficiency: % completed within SLA (assume 24 hours)
-            efficient_count = 0
-            for t in completed_tickets:
-                # Check both resolvedAt and completedAt fields
-                resolved_time = t.get('resolvedAt') or t.get('completedAt')
-                if resolved_time:
-                    try:
-                        created = datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00'))
-                        resolved = datetime.fromisoformat(resolved_time.replace('Z', '+00:00'))
-                        hours_diff = (resolved - created).total_seconds() / 3600
-                        if hours_diff <= 24:
-                            efficient_count += 1
-                    except Exception as e:
-                        # Skip tickets with invalid dates
-                        continue
-            
-            efficiency = (efficient_count / completed_count * 100) if completed_count > 0 else 0
+            efficiency = (week_counts['within_sla'] / completed_count * 100) if completed_count > 0 else 0
             
             performance_weeks.append({
                 'week': week_start.strftime('%Y-W%W'),
@@ -1269,38 +1634,25 @@ def get_ticketv2_performance_analytics():
         
         # States breakdown by week
         states_weekly_data = defaultdict(lambda: [])
-        malaysian_states = ['Johor', 'Kedah', 'Kelantan', 'Melaka', 'Negeri Sembilan', 
-                           'Pahang', 'Penang', 'Perak', 'Perlis', 'Sabah', 'Sarawak',
-                           'Selangor', 'Terengganu', 'Kuala Lumpur', 'Putrajaya']
-        
         for state in malaysian_states:
-            for week_offset in range(-11, 1):
+            for week_index, week_offset in enumerate(range(-11, 1)):
                 week_start = now + timedelta(weeks=week_offset)
-                week_end = week_start + timedelta(days=7)
-                
-                state_tickets = [t for t in tickets if 
-                               t.get('location', {}).get('state') == state and
-                               week_start <= datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')) < week_end]
-                
-                open_tickets = len([t for t in state_tickets if t['status'] in ['open', 'pending', 'in_progress']])
-                completed_tickets = len([t for t in state_tickets if t['status'] in ['completed', 'resolved', 'closed']])
+                open_tickets, completed_tickets, total_state_tickets = counts['states_weekly'][state][week_index]
                 
                 states_weekly_data[state].append({
                     'week': week_start.strftime('%Y-W%W'),
                     'week_label': week_start.strftime('%b %d'),
                     'open': open_tickets,
                     'completed': completed_tickets,
-                    'total': len(state_tickets)
+                    'total': total_state_tickets
                 })
         
         # States performance metrics (overall)
         states_performance = []
         for state in malaysian_states:
-            state_tickets = [t for t in tickets if t.get('location', {}).get('state') == state]
             state_teams = [team for team in field_teams if team.get('state') == state]
             
-            total_tickets = len(state_tickets)
-            completed_count = len([t for t in state_tickets if t['status'] in ['completed', 'resolved', 'closed']])
+            total_tickets, completed_count = counts['states_totals'][state]
             
             # Productivity: completion rate
             productivity = (completed_count / total_tickets * 100) if total_tickets > 0 else 0
@@ -1326,7 +1678,7 @@ def get_ticketv2_performance_analytics():
         
         # AI Recommendations
         total_tickets = len(tickets)
-        completed_rate = (len([t for t in tickets if t['status'] in ['completed', 'resolved', 'closed']]) / total_tickets * 100) if total_tickets > 0 else 0
+        completed_rate = (all_status_distribution['completed'] / total_tickets * 100) if total_tickets > 0 else 0
         
         # Identify states needing attention
         low_performing_states = [s for s in states_performance if s['productivity'] < 60]
@@ -1472,64 +1824,248 @@ def get_reorder_alerts():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _query_point():
+    """lat/lng query parameters (ValueError if missing or invalid)"""
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    if lat is None or lng is None or not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        raise ValueError("lat and lng query parameters are required")
+    return lat, lng
+
+@app.route('/api/spatial/teams/nearest', methods=['GET'])
+def get_nearest_teams():
+    """k nearest teams to a point: ?lat=&lng=&k=5[&status=active]"""
+    try:
+        lat, lng = _query_point()
+        k = max(1, min(request.args.get('k', type=int, default=5), 100))
+        status = request.args.get('status')
+        teams_by_id = {t['_id']: t for t in field_teams if not status or t.get('status') == status}
+        nearest = team_locations.k_nearest(lat, lng, k=k, filter=teams_by_id.__contains__,
+                                           max_km=request.args.get('maxKm', type=float))
+        results = [dict(team_event(teams_by_id[team_id]), distanceKm=round(distance, 3)) for distance, team_id in nearest]
+        return jsonify({'teams': results, 'total': len(results)})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/spatial/tickets/nearby', methods=['GET'])
+def get_nearby_tickets():
+    """Tickets within a radius of a point: ?lat=&lng=&radiusKm=10[&status=open,in_progress][&limit=100]"""
+    try:
+        lat, lng = _query_point()
+        radius_km = request.args.get('radiusKm', type=float, default=10.0)
+        limit = request.args.get('limit', type=int, default=100)
+        statuses = {s for s in request.args.get('status', '').split(',') if s}
+        wanted = (lambda ticket_id: tickets.key(ticket_id, 'status') in statuses) if statuses else None
+        matches = ticket_locations.within_radius(lat, lng, radius_km, filter=wanted)
+        results = [
+            {'distanceKm': round(distance, 3), 'ticket': Encoded(ticket_payloads.fragment(tickets.get(ticket_id)))}
+            for distance, ticket_id in matches[:limit]
+        ]
+        return json_response({'tickets': results, 'total': len(matches)})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/spatial/travel-times', methods=['GET'])
+@conditional_get('teams')
+def get_travel_times():
+    """
+    Precomputed travel minutes: ?teamId= for one team to every district,
+    otherwise the district x district matrix
+    """
+    try:
+        if travel_times is None:
+            return jsonify({'error': 'Travel matrix requires NumPy'}), 503
+        places = [{'state': state, 'district': district or None} for state, district in travel_times.places]
+        minutes = lambda row: [None if math.isnan(m) else round(float(m), 1) for m in row]
+        team_id = request.args.get('teamId')
+        if team_id:
+            if team_id not in travel_times.team_index:
+                return jsonify({'error': 'Team not found'}), 404
+            row = travel_times.team_minutes[travel_times.team_index[team_id]]
+            return jsonify({'teamId': team_id, 'places': places, 'minutes': minutes(row)})
+        return jsonify({
+            'places': places,
+            'minutesPerKm': travel_times.minutes_per_km,
+            'minutes': [minutes(row) for row in travel_times.district_minutes]
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/live-tracking/teams', methods=['GET'])
 def get_live_tracking_teams():
     """Get real-time team locations"""
     try:
-        tracking_data = []
-        for team in field_teams:
-            tracking_data.append({
-                'teamId': team['_id'],
-                'teamName': team['name'],
-                'location': team.get('currentLocation', {}),
-                'status': team.get('status', 'active'),
-                'currentTask': team.get('currentTask', None),
-                'lastUpdate': datetime.now().isoformat()
-            })
+        last_update = datetime.now().isoformat()
+        tracking_data = [dict(team_event(team), lastUpdate=last_update) for team in field_teams]
         return jsonify({'teams': tracking_data, 'total': len(tracking_data)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/live-tracking/teams/<team_id>', methods=['PATCH'])
+def update_live_tracking_team(team_id):
+    """Report a team's position, status or current task (pushed to live subscribers)"""
+    try:
+        team = next((t for t in field_teams if t['_id'] == team_id), None)
+        if not team:
+            return jsonify({'error': 'Team not found'}), 404
+        
+        data = request.get_json() or {}
+        if 'location' in data:
+            location = data['location'] if isinstance(data['location'], dict) else {}
+            latitude = location.get('latitude', location.get('lat'))
+            longitude = location.get('longitude', location.get('lng'))
+            if not all(isinstance(v, (int, float)) for v in (latitude, longitude)):
+                return jsonify({'error': 'location must have numeric latitude and longitude'}), 400
+            current = dict(team.get('currentLocation') or {}, latitude=latitude, longitude=longitude)
+            if location.get('address'):
+                current['address'] = location['address']
+            team['currentLocation'] = current
+            index_team_location(team)
+        for field in ('status', 'currentTask'):
+            if field in data:
+                team[field] = data[field]
+        # The zone rollup lists each team's status
+        zone_counters.track(team)
+        team_changed(team)
+        
+        event = team_event(team)
+        live_events.publish('team', event)
+        return jsonify({'team': event, 'message': 'Team location updated'})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/live-tracking/stream', methods=['GET'])
+def stream_live_tracking():
+    """
+    Server-Sent Events stream of live tracking deltas
+    
+    Events: team, ticket, assignment and resync (reload the snapshot
+    endpoints). Subscribe first, then load /api/live-tracking/* once and
+    apply events on top. A reconnect whose Last-Event-ID is not the
+    latest event starts with a resync event.
+    """
+    subscription = live_events.subscribe()
+    if subscription is None:
+        # Every stream holds a server thread; poll the snapshot endpoints instead
+        return jsonify({'error': 'Too many live tracking subscribers'}), 503, {'Retry-After': '60'}
+    
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    missed = last_event_id is not None and last_event_id != live_events.last_event_id
+    
+    def stream():
+        try:
+            yield b'retry: 3000\n\n'
+            if missed:
+                yield b'event: %s\ndata: {"reason":"reconnected"}\n\n' % RESYNC.encode('ascii')
+            while True:
+                frame = subscription.get(LIVE_HEARTBEAT_SECONDS)
+                # Comment lines keep proxies from closing an idle stream
+                yield frame if frame is not None else b': keepalive\n\n'
+        finally:
+            live_events.unsubscribe(subscription)
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/live-tracking/tickets', methods=['GET'])
 def get_live_tracking_tickets():
     """Get real-time ticket status"""
     try:
-        active_tickets = [t for t in tickets if t.get('status') in ['pending', 'in_progress']]
-        return jsonify({'tickets': active_tickets, 'total': len(active_tickets)})
+        active_tickets = tickets.where(status=['pending', 'in_progress'])
+        return json_response({'tickets': ticket_payloads.encode_list(active_tickets), 'total': len(active_tickets)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/live-tracking/routes', methods=['GET'])
 def get_live_tracking_routes():
-    """Get optimized routes for teams"""
+    """
+    Get optimized routes for teams
+
+    Each team's in-progress tickets are ordered nearest-neighbour + 2-opt
+    from its current position; ETAs add travel time and each ticket's
+    estimatedDuration. Query: stops=N (next N stops per team, default 3).
+    """
     try:
+        stop_limit = max(1, int(request.args.get('stops', 3)))
+    except ValueError:
+        return jsonify({'error': 'stops must be an integer'}), 400
+    try:
+        # One index lookup for all in-progress tickets, grouped by team
+        in_progress_by_team = {}
+        for ticket in tickets.where(status='in_progress'):
+            if ticket.get('assignedTeam'):
+                in_progress_by_team.setdefault(ticket['assignedTeam'], []).append(ticket)
+
+        jobs = {}
+        for team in field_teams:
+            team_tickets = in_progress_by_team.get(team['_id'])
+            start = team_coordinates(team)
+            if not team_tickets or start is None:
+                continue
+            stops = []
+            for t in team_tickets:
+                coordinates = ticket_coordinates(t)
+                if coordinates is not None:
+                    duration = t.get('estimatedDuration')
+                    if not isinstance(duration, (int, float)):
+                        duration = DEFAULT_STOP_MINUTES
+                    stops.append((t['_id'], coordinates[0], coordinates[1], float(duration)))
+            if stops:
+                jobs[team['_id']] = (start, stops)
+        plans = route_planner.plan_all(jobs)
+
+        now = datetime.now()
         routes = []
         for team in field_teams:
-            team_tickets = [t for t in tickets if t.get('assignedTeam') == team['_id'] and t.get('status') == 'in_progress']
-            if team_tickets:
-                routes.append({
-                    'teamId': team['_id'],
-                    'teamName': team['name'],
-                    'currentLocation': team.get('currentLocation', {}),
-                    'stops': [
-                        {
-                            'ticketId': t['_id'],
-                            'location': t.get('location', {}),
-                            'estimatedArrival': (datetime.now() + timedelta(minutes=30)).isoformat()
-                        } for t in team_tickets[:3]  # Next 3 stops
-                    ]
-                })
-        return jsonify({'routes': routes, 'total': len(routes)})
+            team_tickets = in_progress_by_team.get(team['_id'])
+            if not team_tickets:
+                continue
+            by_id = {t['_id']: t for t in team_tickets}
+            plan = plans.get(team['_id'], {'stops': [], 'totalDistanceKm': 0.0, 'totalMinutes': 0.0})
+            planned_ids = {stop['ticketId'] for stop in plan['stops']}
+            stops = [
+                {
+                    'ticketId': stop['ticketId'],
+                    'location': by_id[stop['ticketId']].get('location', {}),
+                    'distanceKm': stop['legKm'],
+                    'estimatedArrival': (now + timedelta(minutes=stop['arrivalMinutes'])).isoformat(),
+                    'estimatedCompletion': (now + timedelta(minutes=stop['departureMinutes'])).isoformat()
+                } for stop in plan['stops'][:stop_limit]
+            ]
+            # Tickets without coordinates cannot be routed; they follow in list order
+            unrouted = [t for t in team_tickets if t['_id'] not in planned_ids]
+            stops.extend(
+                {'ticketId': t['_id'], 'location': t.get('location', {}), 'estimatedArrival': None}
+                for t in unrouted[:max(0, stop_limit - len(stops))]
+            )
+            routes.append({
+                'teamId': team['_id'],
+                'teamName': team['name'],
+                'currentLocation': team.get('currentLocation', {}),
+                'stops': stops,
+                'totalStops': len(team_tickets),
+                'totalDistanceKm': plan['totalDistanceKm'],
+                'totalDurationMinutes': plan['totalMinutes'],
+                'estimatedCompletion': (now + timedelta(minutes=plan['totalMinutes'])).isoformat()
+            })
+        return jsonify({'routes': routes, 'total': len(routes), 'replanned': route_planner.last_planned})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/tickets/<ticket_id>', methods=['GET'])
+@conditional_get('tickets')
 def get_ticket_by_id(ticket_id):
     """Get a specific ticket by ID"""
     try:
-        ticket = next((t for t in tickets if t['_id'] == ticket_id), None)
+        ticket = tickets.get(ticket_id)
         if ticket:
-            return jsonify({'ticket': ticket})
+            return json_response({'ticket': Encoded(ticket_payloads.fragment(ticket))})
         return jsonify({'error': 'Ticket not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1553,7 +2089,7 @@ def create_ticket():
             'updatedAt': datetime.now().isoformat(),
             'estimatedDuration': data.get('estimatedDuration', 60)
         }
-        tickets.append(new_ticket)
+        tickets.add(new_ticket)
         return jsonify({'ticket': new_ticket, 'message': 'Ticket created successfully'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1565,7 +2101,7 @@ def assign_ticket(ticket_id):
         data = request.get_json()
         team_id = data.get('teamId')
         
-        ticket = next((t for t in tickets if t['_id'] == ticket_id), None)
+        ticket = tickets.get(ticket_id)
         if not ticket:
             return jsonify({'error': 'Ticket not found'}), 404
             
@@ -1573,9 +2109,7 @@ def assign_ticket(ticket_id):
         if not team:
             return jsonify({'error': 'Team not found'}), 404
         
-        ticket['assignedTeam'] = team_id
-        ticket['status'] = 'assigned'
-        ticket['updatedAt'] = datetime.now().isoformat()
+        tickets.update(ticket_id, assignedTeam=team_id, status='assigned', updatedAt=datetime.now().isoformat())
         
         # Create assignment
         assignment = {
@@ -1586,6 +2120,9 @@ def assign_ticket(ticket_id):
             'status': 'assigned'
         }
         assignments.append(assignment)
+        assignment_counters.track(assignment)
+        bump_version('assignments')
+        assignment_changed(INSERT, assignment)
         
         return jsonify({'ticket': ticket, 'assignment': assignment, 'message': 'Ticket assigned successfully'})
     except Exception as e:
@@ -1595,21 +2132,25 @@ def assign_ticket(ticket_id):
 def auto_assign_ticket(ticket_id):
     """Auto-assign a ticket to the best available team"""
     try:
-        ticket = next((t for t in tickets if t['_id'] == ticket_id), None)
+        ticket = tickets.get(ticket_id)
         if not ticket:
             return jsonify({'error': 'Ticket not found'}), 404
         
-        # Simple auto-assignment logic: find closest available team
-        available_teams = [t for t in field_teams if t.get('status') == 'active']
+        # Auto-assignment: closest available team by haversine distance
+        available_teams = {t['_id']: t for t in field_teams if t.get('status') == 'active'}
         if not available_teams:
             return jsonify({'error': 'No available teams'}), 400
         
-        # For now, just assign to first available team (can be enhanced with geo logic)
-        best_team = available_teams[0]
+        coordinates = ticket_coordinates(ticket)
+        nearest = team_locations.k_nearest(*coordinates, k=1, filter=available_teams.__contains__) if coordinates else []
+        if nearest:
+            distance_km, team_id = nearest[0]
+            best_team = available_teams[team_id]
+        else:
+            # No ticket or team coordinates: first available team
+            distance_km, best_team = None, next(iter(available_teams.values()))
         
-        ticket['assignedTeam'] = best_team['_id']
-        ticket['status'] = 'assigned'
-        ticket['updatedAt'] = datetime.now().isoformat()
+        tickets.update(ticket_id, assignedTeam=best_team['_id'], status='assigned', updatedAt=datetime.now().isoformat())
         
         assignment = {
             '_id': f"assign_{uuid.uuid4().hex[:8]}",
@@ -1620,11 +2161,15 @@ def auto_assign_ticket(ticket_id):
             'autoAssigned': True
         }
         assignments.append(assignment)
+        assignment_counters.track(assignment)
+        bump_version('assignments')
+        assignment_changed(INSERT, assignment)
         
         return jsonify({
             'ticket': ticket,
             'assignment': assignment,
             'team': best_team,
+            'distanceKm': round(distance_km, 2) if distance_km is not None else None,
             'message': 'Ticket auto-assigned successfully'
         })
     except Exception as e:
@@ -1637,22 +2182,28 @@ def update_assignment_status(assignment_id):
         data = request.get_json()
         new_status = data.get('status')
         
-        assignment = next((a for a in assignments if a['_id'] == assignment_id), None)
+        # Engine-created assignments carry assignmentId instead of _id
+        assignment = next((a for a in assignments if assignment_key(a) == assignment_id), None)
         if not assignment:
             return jsonify({'error': 'Assignment not found'}), 404
         
         assignment['status'] = new_status
         assignment['updatedAt'] = datetime.now().isoformat()
+        assignment_counters.track(assignment)
+        bump_version('assignments')
+        assignment_changed(UPDATE, assignment)
         
         # Update related ticket status
-        ticket = next((t for t in tickets if t['_id'] == assignment['ticketId']), None)
+        ticket = tickets.get(assignment['ticketId'])
         if ticket:
+            changes = {}
             if new_status == 'completed':
-                ticket['status'] = 'resolved'
-                ticket['resolvedAt'] = datetime.now().isoformat()
+                changes['status'] = 'resolved'
+                changes['resolvedAt'] = datetime.now().isoformat()
             elif new_status == 'in_progress':
-                ticket['status'] = 'in_progress'
-            ticket['updatedAt'] = datetime.now().isoformat()
+                changes['status'] = 'in_progress'
+            changes['updatedAt'] = datetime.now().isoformat()
+            tickets.update(ticket['_id'], **changes)
         
         return jsonify({'assignment': assignment, 'message': 'Assignment status updated'})
     except Exception as e:
@@ -1681,6 +2232,10 @@ def create_team():
             'createdAt': datetime.now().isoformat()
         }
         field_teams.append(new_team)
+        zone_counters.track(new_team)
+        index_team_location(new_team)
+        team_changed(new_team)
+        live_events.publish('team', team_event(new_team))
         return jsonify({'team': new_team, 'message': 'Team created successfully'}), 201
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1700,7 +2255,7 @@ def ai_chat():
         user_team = None
         
         if team_id:
-            user_tickets = [t for t in tickets if str(t.get('assignedTeam', '')) == str(team_id)]
+            user_tickets = tickets.where(assignedTeam=str(team_id))
             user_team = next((t for t in field_teams if str(t.get('_id', '')) == str(team_id)), None)
         
         # Calculate user metrics
@@ -1710,10 +2265,9 @@ def ai_chat():
         open_tickets = len([t for t in user_tickets if t.get('status') == 'open'])
         completion_rate = (completed_tickets / total_tickets * 100) if total_tickets > 0 else 0
         
-        # Today's tickets
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_tickets = [t for t in user_tickets if t.get('createdAt') and 
-                        datetime.fromisoformat(t['createdAt'].replace('Z', '+00:00')).replace(tzinfo=None) >= today]
+        # Today's tickets (createdDate index holds the YYYY-MM-DD prefix of createdAt)
+        today = datetime.now().strftime('%Y-%m-%d')
+        today_tickets = [t for t in user_tickets if (tickets.key(t['_id'], 'createdDate') or '') >= today]
         
         # Build context for AI
         context_summary = {
@@ -1851,7 +2405,10 @@ def run_daily_assignment():
     POST /api/assignment/daily/run
     Body (optional): {
         "date": "2025-11-04",  // Optional: specific date (default: today)
-        "force": false         // Optional: force reassignment of existing
+        "force": false,        // Optional: force reassignment of existing
+        "algorithm": "greedy", // Optional: "greedy" or "optimal" (reports greedy baseline)
+        "sharded": false,      // Optional: solve zones in parallel worker processes
+        "workers": 4           // Optional: worker processes for sharded runs (default: CPU count)
     }
     
     Returns: Assignment results with statistics
@@ -1872,15 +2429,49 @@ def run_daily_assignment():
         else:
             assignment_date = datetime.now()
         
+        # JSON booleans only: bool("false") would be True
         force_reassign = data.get('force', False)
+        sharded = data.get('sharded', False)
+        for name, flag in (('force', force_reassign), ('sharded', sharded)):
+            if not isinstance(flag, bool):
+                return jsonify({
+                    'success': False,
+                    'error': f'{name} must be true or false'
+                }), 400
+        
+        algorithm = data.get('algorithm', 'greedy')
+        if algorithm not in ASSIGNMENT_ALGORITHMS:
+            return jsonify({
+                'success': False,
+                'error': f"algorithm must be one of: {', '.join(ASSIGNMENT_ALGORITHMS)}"
+            }), 400
         
-        print(f"\n🚀 API: Running daily assignment for {assignment_date.strftime('%Y-%m-%d')}")
-        
-        # Create engine instance
-        engine = IntelligentAssignmentEngine(tickets, field_teams)
-        
-        # Run assignment
-        result = engine.run_daily_assignment(assignment_date)
+        workers = data.get('workers')
+        if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or workers < 1):
+            return jsonify({
+                'success': False,
+                'error': 'workers must be a positive integer'
+            }), 400
+        
+        print(f"\n🚀 API: Running daily assignment for {assignment_date.strftime('%Y-%m-%d')} ({algorithm})")
+        
+        # Create engine instance; it collects ticket changes instead of
+        # writing them into the shared ticket dicts
+        engine = IntelligentAssignmentEngine(tickets, field_teams, travel_matrix=travel_times)
+        engine.defer_ticket_updates = True
+        
+        # Run assignment - reads keep being served meanwhile, other writes wait
+        with dataset_lock.shared():
+            result = engine.run_daily_assignment(
+                assignment_date,
+                algorithm=algorithm,
+                sharded=sharded,
+                max_workers=workers
+            )
+        
+        # Publish the run (exclusive access again)
+        for ticket_id, changes in engine.pending_ticket_updates.items():
+            tickets.update(ticket_id, **changes)
         
         # Update global assignments if successful
         if result['success'] and result['assignments']:
@@ -1891,9 +2482,18 @@ def run_daily_assignment():
                 # Clear existing assignments for the day
                 global assignments
                 assignment_date_start = assignment_date.replace(hour=0, minute=0, second=0, microsecond=0)
-                assignments = [a for a in assignments if a.get('assignedAt', '') < assignment_date_start.isoformat()]
+                cutoff = assignment_date_start.isoformat()
+                for assignment in assignments:
+                    if assignment.get('assignedAt', '') >= cutoff:
+                        assignment_changed(DELETE, assignment)
+                assignments = [a for a in assignments if a.get('assignedAt', '') < cutoff]
+                assignment_counters.rebuild(assignments)
             
             assignments.extend(new_assignments)
+            for assignment in new_assignments:
+                assignment_counters.track(assignment)
+                assignment_changed(INSERT, assignment)
+            bump_version('assignments')
             
             print(f"✅ Added {len(new_assignments)} new assignments")
             print(f"📊 Total assignments now: {len(assignments)}")
@@ -2041,10 +2641,11 @@ def analyze_assignment_potential():
         specific_team_id = data.get('teamId')
         
         # Create engine for analysis
-        engine = IntelligentAssignmentEngine(tickets, field_teams)
+        engine = IntelligentAssignmentEngine(tickets, field_teams, travel_matrix=travel_times)
         
         # Analyze (dry run)
-        unassigned = len([t for t in tickets if not t.get('assignedTeam') or t.get('status') == 'open'])
+        unassigned = (tickets.count(assignedTeam=[None, '']) + tickets.count(status='open')
+                      - tickets.count(assignedTeam=[None, ''], status='open'))
         available_teams = len([t for t in field_teams if t.get('availability', {}).get('status') in ['available', 'busy']])
         
         # Calculate capacity
@@ -2074,7 +2675,7 @@ def analyze_assignment_potential():
         if specific_team_id:
             team = next((t for t in field_teams if t['_id'] == specific_team_id), None)
             if team:
-                team_tickets = [t for t in tickets if t.get('assignedTeam') == specific_team_id]
+                team_tickets = tickets.where(assignedTeam=specific_team_id)
                 analysis['team_analysis'] = {
                     'team_id': specific_team_id,
                     'team_name': team.get('name'),
@@ -2107,12 +2708,59 @@ def _get_assignment_recommendation(unassigned: int, capacity: int) -> str:
     else:
         return "✅ Demand matches capacity - optimal assignment possible"
 
-# Load sample data on startup
-load_sample_data()
+def restore_snapshot(snapshot):
+    """Replace in-memory data with a loaded dataset snapshot"""
+    tickets.clear()
+    field_teams.clear()
+    assignments.clear()
+    
+    field_teams.extend(snapshot['field_teams'])
+    for ticket in snapshot['tickets']:
+        tickets.add(ticket)
+    assignments.extend(snapshot['assignments'])
+    
+    rebased = f", rebased {snapshot['rebased_days']} day(s)" if snapshot['rebased_days'] else ""
+    print(f"✅ Loaded dataset snapshot from {snapshot['generated_at'][:19]}{rebased}: "
+          f"{len(field_teams)} teams, {len(tickets)} tickets, {len(assignments)} assignments")
 
-# Load enhanced data (15,000 tickets) - adds to existing data
-if ENHANCED_AVAILABLE:
-    load_enhanced_data()
+def load_startup_data():
+    """
+    Load data on startup: from the dataset snapshot when a fresh one
+    exists, otherwise generate it (sample + enhanced) and write a snapshot
+    
+    Pass --regenerate (or set AIFF_REGENERATE_DATA=1) to force generation.
+    """
+    settings = snapshot_settings() if SNAPSHOT_AVAILABLE else {'enabled': False}
+    
+    if settings['enabled'] and not settings['regenerate']:
+        snapshot = load_snapshot(settings['path'], settings['max_age_days'])
+        if snapshot:
+            restore_snapshot(snapshot)
+            return
+    
+    # Load sample data on startup
+    load_sample_data()
+    
+    # Load enhanced data (15,000 tickets) - adds to existing data
+    if ENHANCED_AVAILABLE:
+        load_enhanced_data()
+    
+    if settings['enabled']:
+        try:
+            path = save_snapshot({
+                'field_teams': field_teams,
+                'tickets': tickets.all(),
+                'assignments': assignments
+            }, settings['path'])
+            print(f"💾 Dataset snapshot written to {path}")
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Could not write dataset snapshot: {e}")
+
+load_startup_data()
+
+# Seed incremental analytics counters from the loaded teams and assignments
+# (ticket counters follow the store automatically)
+rebuild_analytics_counters()
 
 # Run daily assignment on startup (optional - can be disabled)
 def run_assignment_on_startup():
@@ -2120,11 +2768,18 @@ def run_assignment_on_startup():
     if INTELLIGENT_ASSIGNMENT_AVAILABLE:
         try:
             print("\n🤖 Running Intelligent Assignment Engine on startup...")
-            engine = IntelligentAssignmentEngine(tickets, field_teams)
+            engine = IntelligentAssignmentEngine(tickets, field_teams, travel_matrix=travel_times)
             result = engine.run_daily_assignment()
             
+            for assignment in result.get('assignments', []):
+                tickets.reindex(assignment['ticketId'])
+            
             if result['success']:
                 assignments.extend(result['assignments'])
+                for assignment in result['assignments']:
+                    assignment_counters.track(assignment)
+                    assignment_changed(INSERT, assignment)
+                bump_version('assignments')
                 print(f"✅ Startup assignment complete: {result['statistics']['total_assignments']} tickets assigned")
             else:
                 print("⚠️  Startup assignment returned no results")
@@ -2135,6 +2790,25 @@ def run_assignment_on_startup():
 # Optionally run assignment on startup (comment out to disable)
 # run_assignment_on_startup()
 
+# Multi-worker serving (gunicorn.conf.py sets AIFF_JOURNAL_PATH): the dataset
+# loaded above is the preloaded image every worker forks from; mutations
+# from then on go through the journal
+if JOURNAL_AVAILABLE and os.environ.get('AIFF_JOURNAL_PATH'):
+    journal = MutationJournal(os.environ['AIFF_JOURNAL_PATH'], apply_journal_entries, lock=dataset_lock.writer)
+    tickets.add_observer(journal)
+    print(f"📒 Mutation journal: {journal.path}")
+
+def start_worker():
+    """Per-worker setup after gunicorn forks (see gunicorn.conf.py)"""
+    global _sync_epoch
+    # Delta-sync versions and SSE event ids count per worker: a client that
+    # lands on another worker resyncs instead of trusting a foreign number
+    _sync_epoch = f"{_etag_epoch}.{os.getpid()}"
+    live_events.last_event_id = os.getpid() << 32
+    if journal is not None:
+        journal.catch_up()
+        journal.follow()
+
 if __name__ == '__main__':
     print("\n🚀 Starting AIFF Backend Server...")
     print("📊 Data loaded successfully")
@@ -2147,4 +2821,6 @@ if __name__ == '__main__':
     print("   Check status: GET http://localhost:5002/api/assignment/daily/status")
     print("   Analyze: POST http://localhost:5002/api/assignment/analyze")
     
-    app.run(host='0.0.0.0', port=5002, debug=True)
+    print("   Production (multi-worker): gunicorn -c gunicorn.conf.py")
+    
+    app.run(host='0.0.0.0', port=5002, debug=os.environ.get('AIFF_DEBUG', '1').lower() not in ('0', 'false', 'no'))
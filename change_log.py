@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Change Log - AIFF Backend
+Bounded in-memory log of ticket and assignment changes for delta sync
+
+Every insert/update/delete gets the next change version. Clients keep the
+version of their last sync and ask for everything after it
+(GET /api/ticketv2/changes?since=<version>) instead of reloading full
+lists on a timer.
+
+Only the newest CHANGE_LOG_CAPACITY entries are kept. A client whose
+version (or timestamp) is older than the oldest retained entry, or that
+predates a bulk reload, is told to resync: reload the full lists and
+continue from the returned version.
+"""
+
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+CHANGE_LOG_CAPACITY = 10000
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+class ChangeLog:
+    """
+    Versioned (collection, operation, id) entries with bounded retention
+
+    Registered as a TicketStore observer, so ticket adds and reindexes are
+    logged automatically; assignment changes are recorded by the routes.
+    """
+
+    def __init__(self, capacity: int = CHANGE_LOG_CAPACITY):
+        self._entries = deque()
+        self.capacity = capacity
+        self.version = 0
+        # Oldest version (and its time) a client can still sync from
+        self.floor = 0
+        self.floor_time = time.time()
+        self._known_tickets: Set[str] = set()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record(self, collection: str, operation: str, key: str):
+        """Append a change and drop the oldest entries beyond capacity"""
+        self.version += 1
+        self._entries.append((self.version, time.time(), collection, operation, key))
+        while len(self._entries) > self.capacity:
+            version, recorded_at, _, _, _ = self._entries.popleft()
+            self.floor, self.floor_time = version, recorded_at
+
+    def track(self, ticket_id: str, ticket: Dict, times: Dict[str, Optional[float]]):
+        """TicketStore observer hook: log a ticket add (insert) or reindex (update)"""
+        operation = UPDATE if ticket_id in self._known_tickets else INSERT
+        self._known_tickets.add(ticket_id)
+        self.record('tickets', operation, ticket_id)
+
+    def reset(self):
+        """Invalidate all earlier versions (store cleared / data reloaded)"""
+        self._entries.clear()
+        self._known_tickets.clear()
+        self.truncate()
+
+    def truncate(self):
+        """Forget logged entries; clients older than now must resync"""
+        self._entries.clear()
+        self.floor = self.version
+        self.floor_time = time.time()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def since(self, version: int = None, timestamp: float = None) -> Optional[Dict[str, Dict[str, List[str]]]]:
+        """
+        Net changes after a version (or after a time), per collection
+
+        An id inserted and later updated is reported as inserted; an id
+        inserted and deleted inside the window is not reported at all.
+
+        Returns:
+            {collection: {'inserted': [ids], 'updated': [ids], 'deleted': [ids]}},
+            or None if the window is no longer retained (resync required)
+        """
+        if version is not None:
+            if version < self.floor or version > self.version:
+                return None
+            newer = lambda entry: entry[0] > version
+        else:
+            if timestamp < self.floor_time:
+                return None
+            newer = lambda entry: entry[1] > timestamp
+
+        # Entries are in version order: walk back from the newest
+        window = []
+        for entry in reversed(self._entries):
+            if not newer(entry):
+                break
+            window.append(entry)
+        window.reverse()
+
+        first_ops: Dict = {}
+        last_ops: Dict = {}
+        for _, _, collection, operation, key in window:
+            first_ops.setdefault((collection, key), operation)
+            last_ops[(collection, key)] = operation
+
+        changes: Dict[str, Dict[str, List[str]]] = {}
+        for (collection, key), last in last_ops.items():
+            first = first_ops[(collection, key)]
+            bucket = changes.setdefault(collection, {'inserted': [], 'updated': [], 'deleted': []})
+            if last == DELETE:
+                if first != INSERT:
+                    bucket['deleted'].append(key)
+            elif first == INSERT:
+                bucket['inserted'].append(key)
+            else:
+                bucket['updated'].append(key)
+        return changes
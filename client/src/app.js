@@ -6478,11 +6478,78 @@ function startLiveTracking() {
     console.log('✅ Live tracking started (5s intervals)');
 }
 
+// Live tracking deltas pushed by the backend (Server-Sent Events). While the
+// stream is connected the 5s timer only redraws; full reloads happen on
+// start, on resync events and after the stream drops.
+let liveTrackingStream = null;
+let liveTrackingResyncNeeded = true;
+const LIVE_ACTIVE_TICKET_STATUSES = ['pending', 'in_progress'];
+
+function connectLiveTrackingStream() {
+    // A stream the server turned away (503) is closed for good: retry on a later tick
+    if (liveTrackingStream && liveTrackingStream.readyState !== EventSource.CLOSED) return;
+    if (typeof EventSource === 'undefined') return;
+    
+    
+    liveTrackingStream = new EventSource(`${API_BASE}/live-tracking/stream`);
+    liveTrackingStream.addEventListener('team', (event) => applyLiveTeamDelta(JSON.parse(event.data)));
+    liveTrackingStream.addEventListener('ticket', (event) => applyLiveTicketDelta(JSON.parse(event.data)));
+    liveTrackingStream.addEventListener('resync', () => { liveTrackingResyncNeeded = true; });
+    // EventSource reconnects by itself; reload once it is back
+    liveTrackingStream.onerror = () => { liveTrackingResyncNeeded = true; };
+}
+
+function applyLiveTeamDelta(delta) {
+    const team = liveTrackingData.teams.find(t => t.teamId === delta.teamId);
+    if (!team) {
+        liveTrackingResyncNeeded = true;
+        return;
+    }
+    Object.assign(team, {
+        location: delta.location,
+        status: delta.status,
+        currentTask: delta.currentTask,
+        lastUpdate: new Date().toISOString()
+    });
+}
+
+function applyLiveTicketDelta(delta) {
+    const index = liveTrackingData.tickets.findIndex(t => t._id === delta.ticketId);
+    const active = LIVE_ACTIVE_TICKET_STATUSES.includes(delta.status);
+    if (index === -1) {
+        // Newly active ticket: the delta has no full payload, reload on next tick
+        if (active) liveTrackingResyncNeeded = true;
+        return;
+    }
+    if (!active) {
+        liveTrackingData.tickets.splice(index, 1);
+        return;
+    }
+    Object.assign(liveTrackingData.tickets[index], {
+        status: delta.status,
+        assignedTeam: delta.assignedTeam,
+        priority: delta.priority
+    });
+}
+
 async function updateLiveTracking() {
     console.log('🔄 Updating live tracking data...');
     
     try {
+        const streamOpen = liveTrackingStream && liveTrackingStream.readyState === EventSource.OPEN;
+        if (streamOpen && !liveTrackingResyncNeeded) {
+            // Deltas already applied: just redraw
+            updateLiveMarkers();
+            updateLiveTrackingDashboard();
+            return;
+        }
+        
         // Reload data from backend
+        connectLiveTrackingStream();
+        if (liveTrackingStream && liveTrackingResyncNeeded) {
+            liveTrackingCache.lastUpdate = 0; // resync must not be served from cache
+        }
+        liveTrackingResyncNeeded = false;
         await loadLiveTrackingData();
         
         // Update markers on map
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Dataset Snapshot - AIFF Backend
+Persist the generated dataset so restarts skip regeneration
+
+The backend generates 15,000 tickets (and runs the generator-side
+assignment) on every start. After the first generation the converted
+tickets, teams and assignments are written to a single SQLite file, one
+compressed JSON payload per collection, and later starts bulk-load it.
+
+Freshness policy: generated data is relative to "now" (10% of tickets are
+created today). A snapshot taken N days ago is rebased by shifting every
+timestamp forward N whole days, so the "today" slice stays today and
+ages stay consistent. Snapshots older than the maximum age, from a future
+date, or written by another format version are ignored and regenerated.
+
+Settings (environment):
+    AIFF_DATA_SNAPSHOT=0             disable snapshots entirely
+    AIFF_REGENERATE_DATA=1           regenerate and overwrite (or --regenerate)
+    AIFF_SNAPSHOT_PATH=...           snapshot file (default: data/snapshot/dataset.sqlite3)
+    AIFF_SNAPSHOT_MAX_AGE_DAYS=7     oldest snapshot that is rebased instead of regenerated
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+# orjson is optional: roughly 4x faster (de)serialization of the payloads
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+SNAPSHOT_FORMAT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshot', 'dataset.sqlite3')
+DEFAULT_MAX_AGE_DAYS = 7
+
+COLLECTIONS = ('field_teams', 'tickets', 'assignments')
+
+# Timestamp fields shifted when a snapshot is rebased
+TIME_FIELDS = {
+    'field_teams': ('joinedDate',),
+    'tickets': ('createdAt', 'updatedAt', 'startedAt', 'completedAt', 'cancelledAt', 'resolvedAt', 'assignedAt'),
+    'assignments': ('createdAt', 'assignedAt', 'startedAt', 'completedAt'),
+}
+
+_FALSE_VALUES = ('0', 'false', 'no', 'off')
+_TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def snapshot_settings(argv: List[str] = None, environ: Dict[str, str] = None) -> Dict:
+    """Resolve snapshot settings from the command line and environment"""
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    return {
+        'enabled': environ.get('AIFF_DATA_SNAPSHOT', '1').lower() not in _FALSE_VALUES,
+        'regenerate': '--regenerate' in argv or environ.get('AIFF_REGENERATE_DATA', '').lower() in _TRUE_VALUES,
+        'path': environ.get('AIFF_SNAPSHOT_PATH') or DEFAULT_SNAPSHOT_PATH,
+        'max_age_days': int(environ.get('AIFF_SNAPSHOT_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS)),
+    }
+
+
+def _dumps(value) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(payload: bytes):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def save_snapshot(dataset: Dict[str, List[Dict]], path: str = DEFAULT_SNAPSHOT_PATH,
+                  generated_at: datetime = None) -> str:
+    """
+    Write the dataset to a snapshot file (atomically replaces an old one)
+
+    Args:
+        dataset: {'field_teams': [...], 'tickets': [...], 'assignments': [...]}
+        path: Snapshot file
+        generated_at: Time the data is relative to (default: now)
+
+    Returns:
+        The snapshot path
+    """
+    generated_at = generated_at or datetime.now()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("CREATE TABLE collections (name TEXT PRIMARY KEY, count INTEGER, payload BLOB)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ('format_version', str(SNAPSHOT_FORMAT_VERSION)),
+            ('generated_at', generated_at.isoformat()),
+        ])
+        conn.executemany("INSERT INTO collections VALUES (?, ?, ?)", [
+            (name, len(dataset.get(name, [])), zlib.compress(_dumps(list(dataset.get(name, []))), 1))
+            for name in COLLECTIONS
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH, max_age_days: int = DEFAULT_MAX_AGE_DAYS,
+                  now: datetime = None) -> Optional[Dict]:
+    """
+    Load a snapshot and rebase it to today
+
+    Returns:
+        The dataset dict plus 'generated_at' and 'rebased_days', or None if
+        the snapshot is missing, unreadable, stale or from another version
+    """
+    if not os.path.exists(path):
+        return None
+
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            if meta.get('format_version') != str(SNAPSHOT_FORMAT_VERSION):
+                print(f"⚠️  Snapshot format {meta.get('format_version')} is not supported - regenerating")
+                return None
+            generated_at = datetime.fromisoformat(meta['generated_at'])
+            rows = conn.execute("SELECT name, payload FROM collections").fetchall()
+        finally:
+            conn.close()
+    except (sqlite3.Error, KeyError, ValueError) as e:
+        print(f"⚠️  Could not read snapshot {path}: {e}")
+        return None
+
+    now = now or datetime.now()
+    age_days = (now.date() - generated_at.date()).days
+    if age_days < 0 or age_days > max_age_days:
+        print(f"⚠️  Snapshot is {age_days} days old (max {max_age_days}) - regenerating")
+        return None
+
+    try:
+        dataset = {name: _loads(zlib.decompress(payload)) for name, payload in rows}
+    except (zlib.error, ValueError) as e:
+        print(f"⚠️  Corrupt snapshot {path}: {e}")
+        return None
+    for name in COLLECTIONS:
+        dataset.setdefault(name, [])
+
+    if age_days:
+        for name, fields in TIME_FIELDS.items():
+            rebase_timestamps(dataset[name], fields, age_days)
+
+    dataset['generated_at'] = generated_at.isoformat()
+    dataset['rebased_days'] = age_days
+    return dataset
+
+
+def rebase_timestamps(records: List[Dict], fields, days: int):
+    """
+    Shift ISO timestamp fields forward by whole days, in place
+
+    Only the date prefix changes, so each distinct date is converted once
+    and the time-of-day/offset suffix is kept verbatim.
+    """
+    shifted: Dict[str, Optional[str]] = {}
+    delta = timedelta(days=days)
+
+    def shift(prefix: str) -> Optional[str]:
+        if prefix not in shifted:
+            try:
+                shifted[prefix] = (date.fromisoformat(prefix) + delta).isoformat()
+            except ValueError:
+                shifted[prefix] = None
+        return shifted[prefix]
+
+    for record in records:
+        for field in fields:
+            value = record.get(field)
+            if not isinstance(value, str) or len(value) < 10:
+                continue
+            new_prefix = shift(value[:10])
+            if new_prefix:
+                record[field] = new_prefix + value[10:]
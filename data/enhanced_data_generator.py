@@ -4,11 +4,19 @@ Generates 15,000+ tickets with comprehensive Malaysian states/zones data
 Includes intelligent assignment engine and productivity metrics
 """
 
+import gc
 import random
 import uuid
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 
+# NumPy is optional: only needed for the vectorized (1M+ ticket) generation path
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 class EnhancedDataGenerator:
     def __init__(self):
         # Malaysian States (All 13 states + 3 federal territories)
@@ -83,6 +91,49 @@ class EnhancedDataGenerator:
             "Digital Works", "Network Pro", "Fiber Tech", "Connect Plus",
             "Smart Systems", "Data Link", "Internet Solutions", "TM Net"
         ]
+        
+        self.street_types = ["Jalan", "Lorong", "Taman", "Kampung"]
+        self.street_names = ["Ahmad", "Hassan", "Rahman", "Merdeka", "Utama"]
+        
+        # Base coordinates per state (jittered by +/-0.2 degrees per record)
+        self.state_coordinates = {
+            "Kuala Lumpur": {"lat": 3.1390, "lng": 101.6869},
+            "Selangor": {"lat": 3.0733, "lng": 101.5185},
+            "Penang": {"lat": 5.4164, "lng": 100.3327},
+            "Johor": {"lat": 1.4927, "lng": 103.7414},
+            "Perak": {"lat": 4.5841, "lng": 101.0829},
+            "Sabah": {"lat": 5.9804, "lng": 116.0753},
+            "Sarawak": {"lat": 1.5533, "lng": 110.3593},
+            "Pahang": {"lat": 3.8077, "lng": 103.3260},
+            "Kedah": {"lat": 6.1254, "lng": 100.3678},
+            "Kelantan": {"lat": 6.1256, "lng": 102.2436},
+            "Terengganu": {"lat": 5.3117, "lng": 103.1324},
+            "Negeri Sembilan": {"lat": 2.7297, "lng": 101.9381},
+            "Melaka": {"lat": 2.1896, "lng": 102.2501},
+            "Perlis": {"lat": 6.4448, "lng": 100.2048},
+            "Putrajaya": {"lat": 2.9264, "lng": 101.6964},
+            "Labuan": {"lat": 5.2831, "lng": 115.2308}
+        }
+        
+        # Postal code ranges per state
+        self.postal_ranges = {
+            "Kuala Lumpur": (50000, 60000),
+            "Selangor": (40000, 48999),
+            "Penang": (10000, 14999),
+            "Johor": (79000, 82999),
+            "Kedah": (5000, 9999),
+            "Kelantan": (15000, 19999),
+            "Melaka": (75000, 78999),
+            "Negeri Sembilan": (70000, 73999),
+            "Pahang": (25000, 28999),
+            "Perak": (30000, 36999),
+            "Perlis": (1000, 2999),
+            "Sabah": (88000, 91999),
+            "Sarawak": (93000, 98999),
+            "Terengganu": (20000, 24999),
+            "Putrajaya": (62000, 62999),
+            "Labuan": (87000, 87999)
+        }
 
     def generate_enhanced_teams(self, count: int = 150) -> List[Dict[str, Any]]:
         """Generate enhanced field teams across all Malaysian states"""
@@ -279,6 +330,285 @@ class EnhancedDataGenerator:
         
         return tickets
 
+    def generate_enhanced_tickets_vectorized(
+        self,
+        count: int = 15000,
+        teams: List[Dict] = None,
+        seed: int = None,
+        now: datetime = None,
+        columnar: bool = False
+    ):
+        """
+        NumPy generation path for large (1M+) ticket datasets
+        
+        Draws categories, priorities, locations, timestamps, statuses, SLA
+        figures, customer info and coordinates as arrays with the same
+        distributions as generate_enhanced_tickets, then materializes the
+        ticket dicts in one pass. The same seed and now give the same
+        dataset.
+        
+        Args:
+            count: Number of tickets
+            teams: Unused (kept for signature parity)
+            seed: Seed for numpy.random.default_rng
+            now: Reference time for ages and "today" (default: datetime.now())
+            columnar: Return {field: list} columns instead of ticket dicts
+                (nested fields flattened, e.g. 'location.state')
+        
+        Returns:
+            List of ticket dicts, or a dict of columns
+        """
+        if not NUMPY_AVAILABLE:
+            if columnar:
+                raise ImportError("Columnar ticket generation requires numpy")
+            print("⚠️  NumPy not available - using the per-ticket generator")
+            if seed is not None:
+                random.seed(seed)
+            return self.generate_enhanced_tickets(count, teams)
+        
+        rng = np.random.default_rng(seed)
+        now = now or datetime.now()
+        n = count
+        
+        # Category and priority (rules mirror _determine_priority)
+        categories = self.ticket_categories
+        category = rng.integers(0, len(categories), n)
+        priorities = ["low", "medium", "high", "critical"]
+        rule = np.array([
+            0 if ("Class 1" in c or "Major" in c or "Emergency" in c) else
+            1 if ("Class 2" in c or "Intermediate" in c) else
+            2 if ("Class 3" in c or "Minor" in c or "Preventive" in c) else 3
+            for c in categories
+        ])[category]
+        draw = rng.random(n)
+        priority = np.select(
+            [rule == 0, rule == 1, rule == 2],
+            [np.where(draw < 0.5, 2, 3), 1, 0],
+            default=np.where(draw < 1 / 3, 0, 1)  # choice(["low", "medium", "medium"])
+        )
+        
+        # State, zone and district (uniform district within the state)
+        states = self.states
+        state = rng.integers(0, len(states), n)
+        zones = [self.get_zone_for_state(st) for st in states]
+        state_districts = [self.districts.get(st, [st]) for st in states]
+        district_offsets = np.cumsum([0] + [len(d) for d in state_districts])[:-1]
+        district_names = [d for districts in state_districts for d in districts]
+        district_counts = np.array([len(d) for d in state_districts])
+        district = district_offsets[state] + (rng.random(n) * district_counts[state]).astype(np.int64)
+        
+        # Creation age in minutes: 10% today, 15% this week, 25% this month, rest historical
+        today_count = int(n * 0.10)
+        week_count = int(n * 0.15)
+        month_count = int(n * 0.25)
+        segment = np.searchsorted(
+            [today_count, today_count + week_count, today_count + week_count + month_count],
+            np.arange(n), side='right'
+        )
+        low_days = np.array([0, 1, 7, 31])[segment]
+        high_days = np.array([0, 6, 30, 365])[segment]
+        # generate_random_date(days_ago=randint(lo, hi)) draws days in [0, days_ago]
+        max_days = rng.integers(low_days, high_days + 1)
+        days = np.where(segment == 0, 0, rng.integers(0, max_days + 1))
+        age_minutes = days * 1440 + rng.integers(0, 24, n) * 60 + rng.integers(0, 60, n)
+        
+        # Status by age (weights from _determine_status)
+        hours_old = age_minutes / 60
+        age_band = np.select([hours_old < 2, hours_old < 24, hours_old < 168], [0, 1, 2], default=3)
+        status_weights = np.array([[60, 30, 5, 5], [30, 40, 25, 5], [10, 25, 60, 5], [2, 5, 88, 5]], dtype=np.float64)
+        status_cdf = np.cumsum(status_weights / status_weights.sum(axis=1, keepdims=True), axis=1)
+        status = (rng.random(n)[:, None] >= status_cdf[age_band]).sum(axis=1)
+        status = np.minimum(status, 3)
+        statuses = self.ticket_statuses  # open, in_progress, closed, cancelled
+        cancelled = status == 3
+        started = (status == 1) | (status == 2)
+        closed = status == 2
+        
+        # Timing (see _calculate_timing)
+        cancel_hours = rng.integers(1, 49, n)
+        start_delay = rng.integers(10, 181, n)
+        base_duration = np.array([self._estimate_duration(c, None) for c in categories])[category]
+        work_duration = base_duration + rng.integers(-30, 61, n)
+        completion_hours = np.round((start_delay + work_duration) / 60, 2)
+        sla_target = np.array([
+            [self._get_sla_target(p, c) for p in priorities] for c in categories
+        ])[category, priority]
+        
+        created_ts = np.datetime64(now, 'us') - age_minutes.astype('timedelta64[m]')
+        started_ts = created_ts + start_delay.astype('timedelta64[m]')
+        completed_ts = started_ts + work_duration.astype('timedelta64[m]')
+        cancelled_ts = created_ts + cancel_hours.astype('timedelta64[h]')
+        updated_ts = np.where(cancelled, cancelled_ts, np.where(closed, completed_ts, np.where(started, started_ts, created_ts)))
+        
+        # Address, postal code and coordinates
+        postal_bounds = np.array([self.postal_ranges.get(st, (10000, 99999)) for st in states])[state]
+        postal_low = postal_bounds[:, 0]
+        postal_span = postal_bounds[:, 1] - postal_low + 1
+        address_postal = postal_low + (rng.random(n) * postal_span).astype(np.int64)
+        postal_code = postal_low + (rng.random(n) * postal_span).astype(np.int64)
+        street_type = rng.integers(0, len(self.street_types), n)
+        street_name = rng.integers(0, len(self.street_names), n)
+        street_number = rng.integers(1, 1000, n)
+        default_coordinates = {"lat": 3.1390, "lng": 101.6869}
+        base_lat = np.array([self.state_coordinates.get(st, default_coordinates)["lat"] for st in states])[state]
+        base_lng = np.array([self.state_coordinates.get(st, default_coordinates)["lng"] for st in states])[state]
+        lat = np.round(base_lat + rng.uniform(-0.2, 0.2, n), 4)
+        lng = np.round(base_lng + rng.uniform(-0.2, 0.2, n), 4)
+        
+        # Customer info
+        names = self.customer_names
+        customer_name = rng.integers(0, len(names), n)
+        email_name = rng.integers(0, len(names), n)
+        phone = rng.integers(10000000, 100000000, n)
+        company = rng.integers(0, len(self.company_names), n)
+        contact_options = ["phone", "email", "sms"]
+        contact = rng.integers(0, len(contact_options), n)
+        
+        # Unique 8-hex-digit ids (same shape as ticket_<uuid4[:8]>)
+        ids = rng.choice(2 ** 32, size=n, replace=False)
+        
+        # String columns are built from lookup tables with object-array
+        # concatenation instead of per-ticket formatting
+        def table(values):
+            return np.array(values, dtype=object)
+        
+        def text(values):
+            return values.astype(str).astype(object)
+        
+        def optional(values, mask):
+            values = values.astype(object)
+            values[~mask] = None
+            return values.tolist()
+        
+        # Timestamps are now minus whole minutes/hours, so all share now's
+        # seconds: format as day + HH:MM lookups plus that common suffix
+        suffix = now.strftime(':%S.%f') if now.microsecond else now.strftime(':%S')
+        clock = table([f"T{h:02d}:{m:02d}" for h in range(24) for m in range(60)])
+        
+        def iso(values, mask=None):
+            days, minute = np.divmod(values.astype('datetime64[m]').astype(np.int64), 1440)
+            unique_days, day_index = np.unique(days, return_inverse=True)
+            day_names = table(np.datetime_as_string(unique_days.astype('datetime64[D]')).tolist())
+            strings = day_names[day_index] + clock[minute] + suffix
+            return optional(strings, mask) if mask is not None else strings.tolist()
+        
+        state_names = table(states)
+        district_table = table(district_names)
+        district_state = np.repeat(np.arange(len(states)), district_counts)
+        descriptions = table([
+            [self._generate_description(c, states[district_state[d]], district_names[d]) for d in range(len(district_names))]
+            for c in categories
+        ])
+        streets = table([f"{t} {sn} " for t in self.street_types for sn in self.street_names])
+        hex_words = table([f"{value:04x}" for value in range(1 << 16)])
+        
+        columns = {
+            'id': ("ticket_" + hex_words[ids >> 16] + hex_words[ids & 0xFFFF]).tolist(),
+            # np.char.zfill fails on an empty array (count=0)
+            'ticketNumber': np.char.mod("TT_%06d", np.arange(1, n + 1)).astype(object).tolist(),
+            'category': table(categories)[category].tolist(),
+            'priority': table(priorities)[priority].tolist(),
+            'status': table(statuses)[status].tolist(),
+            'description': descriptions[category, district].tolist(),
+            'location.address': (
+                streets[street_type * len(self.street_names) + street_name] + text(street_number) + ", "
+                + district_table[district] + ", " + text(address_postal) + " " + state_names[state]
+            ).tolist(),
+            'location.coordinates.lat': lat.tolist(),
+            'location.coordinates.lng': lng.tolist(),
+            'location.state': state_names[state].tolist(),
+            'location.zone': table(zones)[state].tolist(),
+            'location.district': district_table[district].tolist(),
+            'location.postalCode': text(postal_code).tolist(),
+            'createdAt': iso(created_ts),
+            'updatedAt': iso(updated_ts),
+            'startedAt': iso(started_ts, started),
+            'completedAt': iso(completed_ts, closed),
+            'cancelledAt': iso(cancelled_ts, cancelled),
+            'agingDays': (age_minutes // 1440).tolist(),
+            'agingHours': np.round(age_minutes / 60, 2).tolist(),
+            'sla.targetCompletionHours': sla_target.tolist(),
+            'sla.actualCompletionHours': optional(completion_hours, closed),
+            'sla.slaMetStatus': optional(table(["missed", "met"])[(completion_hours <= sla_target).astype(np.int64)], closed),
+            'customerInfo.name': table(names)[customer_name].tolist(),
+            'customerInfo.phone': ("+601" + text(phone)).tolist(),
+            'customerInfo.email': table([f"{name.lower().replace(' ', '.')}@example.com" for name in names])[email_name].tolist(),
+            'customerInfo.company': table(self.company_names)[company].tolist(),
+            'customerInfo.contactPreference': table(contact_options)[contact].tolist(),
+            'estimatedDuration': base_duration.tolist(),
+            'actualDuration': optional(work_duration, closed),
+        }
+        
+        if columnar:
+            return columns
+        
+        # Millions of small dicts: pause the cyclic GC while allocating them
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            tickets = self._materialize_tickets(columns)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        
+        return tickets
+    
+    @staticmethod
+    def _materialize_tickets(columns: Dict[str, List]) -> List[Dict[str, Any]]:
+        """Assemble ticket dicts from generate_enhanced_tickets_vectorized columns"""
+        tickets = []
+        for row in zip(*columns.values()):
+            (ticket_id, ticket_number, category_name, priority_name, status_name, description_text,
+             address, lat_value, lng_value, state_name, zone_name, district_name, postal,
+             created_at, updated_at, started_at, completed_at, cancelled_at, aging_days, aging_hours,
+             sla_hours, completion, sla_met, customer, customer_phone, customer_email, customer_company,
+             contact_preference, estimated, actual) = row
+            tickets.append({
+                "id": ticket_id,
+                "ticketNumber": ticket_number,
+                "title": category_name,
+                "description": description_text,
+                "category": category_name,
+                "priority": priority_name,
+                "status": status_name,
+                "location": {
+                    "address": address,
+                    "coordinates": {"lat": lat_value, "lng": lng_value},
+                    "state": state_name,
+                    "zone": zone_name,
+                    "district": district_name,
+                    "postalCode": postal
+                },
+                "createdAt": created_at,
+                "updatedAt": updated_at,
+                "startedAt": started_at,
+                "completedAt": completed_at,
+                "cancelledAt": cancelled_at,
+                "agingDays": aging_days,
+                "agingHours": aging_hours,
+                "sla": {
+                    "targetCompletionHours": sla_hours,
+                    "actualCompletionHours": completion,
+                    "slaMetStatus": sla_met,
+                    "timeToComplete": completion
+                },
+                "customerInfo": {
+                    "name": customer,
+                    "phone": customer_phone,
+                    "email": customer_email,
+                    "company": customer_company,
+                    "contactPreference": contact_preference
+                },
+                "assignedTeam": None,
+                "assignmentScore": None,
+                "assignmentReason": None,
+                "estimatedDuration": estimated,
+                "actualDuration": actual,
+                "efficiencyScore": None
+            })
+        
+        return tickets
+
     def intelligent_assignment_engine(self, tickets: List[Dict], teams: List[Dict]) -> List[Dict[str, Any]]:
         """
         Intelligent ticket assignment engine based on:
@@ -655,37 +985,15 @@ class EnhancedDataGenerator:
 
     def _generate_address(self, district: str, state: str) -> str:
         """Generate realistic address"""
-        street_types = ["Jalan", "Lorong", "Taman", "Kampung"]
-        street_names = ["Ahmad", "Hassan", "Rahman", "Merdeka", "Utama"]
-        
         num = random.randint(1, 999)
-        street = f"{random.choice(street_types)} {random.choice(street_names)} {num}"
+        street = f"{random.choice(self.street_types)} {random.choice(self.street_names)} {num}"
         postal = self._generate_postal_code(state)
         
         return f"{street}, {district}, {postal} {state}"
 
     def _generate_postal_code(self, state: str) -> str:
         """Generate postal code for state"""
-        postal_ranges = {
-            "Kuala Lumpur": (50000, 60000),
-            "Selangor": (40000, 48999),
-            "Penang": (10000, 14999),
-            "Johor": (79000, 82999),
-            "Kedah": (5000, 9999),
-            "Kelantan": (15000, 19999),
-            "Melaka": (75000, 78999),
-            "Negeri Sembilan": (70000, 73999),
-            "Pahang": (25000, 28999),
-            "Perak": (30000, 36999),
-            "Perlis": (1000, 2999),
-            "Sabah": (88000, 91999),
-            "Sarawak": (93000, 98999),
-            "Terengganu": (20000, 24999),
-            "Putrajaya": (62000, 62999),
-            "Labuan": (87000, 87999)
-        }
-        
-        start, end = postal_ranges.get(state, (10000, 99999))
+        start, end = self.postal_ranges.get(state, (10000, 99999))
         return str(random.randint(start, end))
 
     def get_zone_for_state(self, state: str) -> str:
@@ -697,26 +1005,7 @@ class EnhancedDataGenerator:
 
     def get_coordinates_for_state(self, state: str) -> Dict[str, float]:
         """Get realistic coordinates for Malaysian states"""
-        coordinates_map = {
-            "Kuala Lumpur": {"lat": 3.1390, "lng": 101.6869},
-            "Selangor": {"lat": 3.0733, "lng": 101.5185},
-            "Penang": {"lat": 5.4164, "lng": 100.3327},
-            "Johor": {"lat": 1.4927, "lng": 103.7414},
-            "Perak": {"lat": 4.5841, "lng": 101.0829},
-            "Sabah": {"lat": 5.9804, "lng": 116.0753},
-            "Sarawak": {"lat": 1.5533, "lng": 110.3593},
-            "Pahang": {"lat": 3.8077, "lng": 103.3260},
-            "Kedah": {"lat": 6.1254, "lng": 100.3678},
-            "Kelantan": {"lat": 6.1256, "lng": 102.2436},
-            "Terengganu": {"lat": 5.3117, "lng": 103.1324},
-            "Negeri Sembilan": {"lat": 2.7297, "lng": 101.9381},
-            "Melaka": {"lat": 2.1896, "lng": 102.2501},
-            "Perlis": {"lat": 6.4448, "lng": 100.2048},
-            "Putrajaya": {"lat": 2.9264, "lng": 101.6964},
-            "Labuan": {"lat": 5.2831, "lng": 115.2308}
-        }
-        
-        base = coordinates_map.get(state, {"lat": 3.1390, "lng": 101.6869})
+        base = self.state_coordinates.get(state, {"lat": 3.1390, "lng": 101.6869})
         return {
             "lat": round(base["lat"] + random.uniform(-0.2, 0.2), 4),
             "lng": round(base["lng"] + random.uniform(-0.2, 0.2), 4)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Dataset Lock - AIFF Backend
+Readers-writer lock over the in-memory tickets/teams/assignments
+
+The threaded server used to let any request mutate the shared lists and
+ticket dicts while others read or wrote them. Every request now takes
+access through one DatasetLock:
+
+    reads   shared, any number at once
+    writes  one writer at a time, exclusive of readers
+
+A writer that runs long (a 15k-ticket assignment run) computes on
+private copies inside shared(): readers keep being served the state from
+before the run, other writers keep waiting, and the result is applied
+once exclusive access is back. Writers take precedence over new readers,
+so a stream of reads cannot starve a write.
+
+The writer role and reader exclusion are separate steps: a writer may
+take the role without excluding readers (acquire_write(exclusive=False))
+while it waits on something slow, such as another worker's journal lock,
+and call exclude_readers() once it is ready to mutate.
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class DatasetLock:
+    """Reentrant-for-writers readers-writer lock"""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._owner = None       # thread holding the writer role
+        self._depth = 0
+        self._exclusive = False  # writer currently keeps readers out
+        self.writer = _WriteAccess(self)
+
+    # ------------------------------------------------------------------
+    # Readers
+    # ------------------------------------------------------------------
+
+    def acquire_read(self):
+        with self._cond:
+            while self._exclusive:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    # ------------------------------------------------------------------
+    # Writers
+    # ------------------------------------------------------------------
+
+    def acquire_write(self, exclusive: bool = True, blocking: bool = True) -> bool:
+        """
+        Take the writer role (reentrant)
+
+        Args:
+            exclusive: Also keep readers out (see exclude_readers)
+            blocking: Wait for another thread's writer role; if False,
+                return False instead
+
+        Returns:
+            True once the role is held
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner != me:
+                if self._owner is not None and not blocking:
+                    return False
+                while self._owner is not None:
+                    self._cond.wait()
+                self._owner = me
+                self._depth = 0
+            self._depth += 1
+            if exclusive:
+                self._exclude()
+            return True
+
+    def _exclude(self):
+        # Keep new readers out, then wait for the current ones to finish
+        self._exclusive = True
+        while self._readers:
+            self._cond.wait()
+
+    def exclude_readers(self):
+        """Writer only: keep readers out until the role is released"""
+        if not self.writing:
+            raise RuntimeError("exclude_readers() requires the writer role")
+        with self._cond:
+            self._exclude()
+
+    def release_write(self):
+        with self._cond:
+            self._depth -= 1
+            if not self._depth:
+                self._owner = None
+                self._exclusive = False
+                self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    @property
+    def writing(self) -> bool:
+        return self._owner == threading.get_ident()
+
+    @contextmanager
+    def shared(self):
+        """
+        Let readers in while the calling writer works on private copies
+
+        The caller stays the only writer; exclusive access is restored
+        (after in-flight reads finish) when the block exits.
+        """
+        if not self.writing:
+            raise RuntimeError("shared() requires the writer role")
+        with self._cond:
+            self._exclusive = False
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = True
+                while self._readers:
+                    self._cond.wait()
+
+
+class _WriteAccess:
+    """
+    Lock-like view of the writer role (acquire/release, with-statement)
+
+    acquire() takes the role without keeping readers out; exclude_readers()
+    does that once the holder is about to mutate.
+    """
+
+    def __init__(self, lock: DatasetLock):
+        self._lock = lock
+        self.release = lock.release_write
+        self.exclude_readers = lock.exclude_readers
+
+    def acquire(self, blocking: bool = True) -> bool:
+        return self._lock.acquire_write(exclusive=False, blocking=blocking)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration - AIFF Backend
+Multi-worker production serving of backend_server.py
+
+    gunicorn -c gunicorn.conf.py
+
+The master imports backend_server once (preload_app), so the dataset is
+loaded or generated a single time and every worker forks from that image
+instead of regenerating 15,000 tickets. Workers keep their copies in step
+through the single-writer mutation journal (mutation_journal.py).
+
+Settings (environment):
+    AIFF_BIND=0.0.0.0:5002    listen address
+    AIFF_WORKERS=<cpus>       worker processes
+    AIFF_THREADS=8            threads per worker
+    AIFF_LIVE_MAX_SUBSCRIBERS=<threads/2>
+                              live tracking streams per worker; each holds a
+                              thread for as long as it is open, so this is
+                              kept below AIFF_THREADS and further streams
+                              get 503 (the console falls back to polling)
+    AIFF_JOURNAL_PATH=...     journal file (default: per-run file in the temp dir)
+"""
+
+import gc
+import multiprocessing
+import os
+import tempfile
+
+wsgi_app = 'backend_server:app'
+bind = os.environ.get('AIFF_BIND', '0.0.0.0:5002')
+workers = int(os.environ.get('AIFF_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('AIFF_THREADS', 8))
+
+# live_events reads this at import. gthread has no async I/O: an open SSE
+# stream occupies a thread, and with every thread streaming the worker
+# would accept no other request, so leave at least one free.
+_live_max_subscribers = int(os.environ.get('AIFF_LIVE_MAX_SUBSCRIBERS', threads // 2))
+os.environ['AIFF_LIVE_MAX_SUBSCRIBERS'] = str(max(0, min(_live_max_subscribers, threads - 1)))
+preload_app = True
+# Daily assignment runs take longer than the default 30s
+timeout = 300
+graceful_timeout = 30
+
+# backend_server reads this at import, i.e. in the master before forking
+_journal_is_temporary = 'AIFF_JOURNAL_PATH' not in os.environ
+os.environ.setdefault('AIFF_JOURNAL_PATH', os.path.join(tempfile.gettempdir(), f"aiff-journal-{os.getpid()}.jsonl"))
+
+_frozen = False
+
+
+def pre_fork(server, worker):
+    # Move the preloaded dataset out of the collector's reach so its scans
+    # do not touch (and un-share) the copy-on-write pages in every worker
+    global _frozen
+    if not _frozen:
+        gc.collect()
+        gc.freeze()
+        _frozen = True
+
+
+def post_worker_init(worker):
+    import backend_server
+    backend_server.start_worker()
+
+
+def on_exit(server):
+    path = os.environ['AIFF_JOURNAL_PATH']
+    if _journal_is_temporary and os.path.exists(path):
+        os.remove(path)
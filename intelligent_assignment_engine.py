@@ -11,12 +11,43 @@ Version: 1.0.0
 Date: November 4, 2025
 """
 
+import importlib.util
 import json
+import os
 import random
 import math
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from spatial_index import SpatialIndex, haversine_km, team_coordinates, ticket_coordinates
+
+# NumPy is optional: the vectorized scorer falls back to the per-team loop
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Precomputed travel times (NumPy arrays) back the travel modifier
+if NUMPY_AVAILABLE:
+    from travel_matrix import TravelTimeMatrix
+
+# SciPy is optional: algorithm="optimal" falls back to greedy without it.
+# Imported on first optimal run - it adds ~0.5s to backend startup.
+SCIPY_AVAILABLE = importlib.util.find_spec('scipy') is not None
+
+ASSIGNMENT_ALGORITHMS = ('greedy', 'optimal')
+
+# Vectorized scores match _calculate_team_scores within this absolute tolerance
+VECTORIZED_SCORE_TOLERANCE = 1e-9
+
+# Travel modifier: scores shrink linearly with travel time to the ticket's
+# district, by up to TRAVEL_PENALTY at TRAVEL_MINUTES_CAP and beyond
+TRAVEL_PENALTY = 0.15
+TRAVEL_MINUTES_CAP = 240.0
 
 class IntelligentAssignmentEngine:
     """
@@ -37,17 +68,31 @@ class IntelligentAssignmentEngine:
     12. Team specialization match
     """
     
-    def __init__(self, tickets: List[Dict], teams: List[Dict]):
+    def __init__(self, tickets: List[Dict], teams: List[Dict], travel_matrix: 'TravelTimeMatrix' = None):
         """
         Initialize the assignment engine
         
         Args:
             tickets: List of all tickets from ticketv2 API
             teams: List of all field teams
+            travel_matrix: Kept-current team x district travel times (built
+                from ``teams`` if omitted and NumPy is available)
         """
         self.tickets = tickets
         self.teams = teams
         self.assignments = []
+        
+        # Team -> district travel minutes for the travel modifier
+        if travel_matrix is None and NUMPY_AVAILABLE:
+            travel_matrix = TravelTimeMatrix.for_teams(team for team in teams if '_id' in team)
+        self.travel_matrix = travel_matrix
+        
+        # Team positions for real-distance ranking
+        self.team_locations = SpatialIndex()
+        for team in teams:
+            coordinates = team_coordinates(team)
+            if coordinates and '_id' in team:
+                self.team_locations.upsert(team['_id'], *coordinates)
         self.daily_capacity = 5  # Max tickets per team per day
         
         # Malaysian states for coverage
@@ -66,6 +111,21 @@ class IntelligentAssignmentEngine:
             'Borneo': ['Sabah', 'Sarawak']
         }
         
+        # Reverse lookup so zone resolution is O(1) per ticket
+        self.state_zone = {}
+        for zone, states in self.zone_mapping.items():
+            for state in states:
+                self.state_zone.setdefault(state, zone)
+        
+        # Score all teams per ticket as one NumPy expression when available
+        self.use_vectorized = NUMPY_AVAILABLE
+        
+        # With defer_ticket_updates the shared ticket dicts are left untouched
+        # and assignments collect in pending_ticket_updates ({id: changes})
+        # for the caller to apply in one step
+        self.defer_ticket_updates = False
+        self.pending_ticket_updates = {}
+        
         # Ticket categories and required skills
         self.category_skills = {
             'Network Breakdown': ['network', 'fiber', 'technical'],
@@ -89,16 +149,31 @@ class IntelligentAssignmentEngine:
         print("🤖 Intelligent Assignment Engine initialized")
         print(f"📊 Loaded {len(tickets)} tickets and {len(teams)} teams")
     
-    def run_daily_assignment(self, assignment_date: datetime = None) -> Dict[str, Any]:
+    def run_daily_assignment(
+        self,
+        assignment_date: datetime = None,
+        algorithm: str = 'greedy',
+        sharded: bool = False,
+        max_workers: int = None
+    ) -> Dict[str, Any]:
         """
         Run daily intelligent ticket assignment
         
         Args:
             assignment_date: Date for assignment (default: today)
+            algorithm: 'greedy' (priority order, best team each) or 'optimal'
+                (capacitated assignment maximizing total priority-weighted
+                score; needs NumPy and SciPy, else falls back to greedy)
+            sharded: Solve each zone in its own worker process, then run a
+                cross-zone spillover pass
+            max_workers: Process pool size for sharded runs (default: CPU count)
             
         Returns:
             Assignment results with statistics
         """
+        if algorithm not in ASSIGNMENT_ALGORITHMS:
+            raise ValueError(f"Unknown assignment algorithm: {algorithm}")
+        
         if assignment_date is None:
             assignment_date = datetime.now()
         
@@ -120,12 +195,55 @@ class IntelligentAssignmentEngine:
         print(f"🗺️  Step 3: Demand analysis completed across {len(demand_analysis)} zones")
         
         # Step 4: Intelligent assignment with multi-factor scoring
-        assignments = self._assign_tickets_intelligently(
-            unassigned_tickets, 
-            available_teams, 
-            demand_analysis,
-            assignment_date
-        )
+        optimization = None
+        sharding = None
+        if algorithm == 'optimal' and not (NUMPY_AVAILABLE and SCIPY_AVAILABLE):
+            print("⚠️  Optimal assignment needs numpy and scipy - falling back to greedy")
+            algorithm = 'greedy'
+        
+        if sharded:
+            started = time.perf_counter()
+            assignments, sharding = self._assign_tickets_sharded(
+                unassigned_tickets,
+                available_teams,
+                demand_analysis,
+                assignment_date,
+                algorithm=algorithm,
+                max_workers=max_workers
+            )
+            sharding['runtime_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        elif algorithm == 'optimal':
+            # Greedy dry run (tickets untouched) as the comparison baseline
+            started = time.perf_counter()
+            baseline = self._assign_tickets_intelligently(
+                unassigned_tickets, available_teams, demand_analysis, assignment_date, commit=False
+            )
+            baseline_runtime = time.perf_counter() - started
+            
+            started = time.perf_counter()
+            assignments = self._assign_tickets_optimally(
+                unassigned_tickets,
+                available_teams,
+                demand_analysis,
+                assignment_date
+            )
+            runtime = time.perf_counter() - started
+            
+            optimization = {
+                'algorithm': 'optimal',
+                **self._summarize_assignment_run(assignments, runtime),
+                'baseline': {
+                    'algorithm': 'greedy',
+                    **self._summarize_assignment_run(baseline, baseline_runtime)
+                }
+            }
+        else:
+            assignments = self._assign_tickets_intelligently(
+                unassigned_tickets, 
+                available_teams, 
+                demand_analysis,
+                assignment_date
+            )
         print(f"✅ Step 4: Successfully assigned {len(assignments)} tickets")
         
         # Step 5: Balance workload across teams
@@ -139,13 +257,29 @@ class IntelligentAssignmentEngine:
         print(f"✅ Daily Assignment Complete!")
         print(f"{'='*70}\n")
         
-        return {
+        result = {
             'success': True,
             'date': assignment_date.isoformat(),
             'assignments': balanced_assignments,
             'statistics': stats,
             'timestamp': datetime.now().isoformat()
         }
+        if optimization:
+            result['optimization'] = optimization
+        if sharding:
+            result['sharding'] = sharding
+        return result
+    
+    def _summarize_assignment_run(self, assignments: List[Dict], runtime: float) -> Dict:
+        """Objective totals and runtime of one assignment pass"""
+        total_score = sum(a['assignmentScore'] for a in assignments)
+        weighted_score = sum(a['assignmentScore'] * self._get_priority_score(a['priority']) for a in assignments)
+        return {
+            'assigned': len(assignments),
+            'total_score': round(total_score, 3),
+            'weighted_score': round(weighted_score, 3),
+            'runtime_ms': round(runtime * 1000, 1)
+        }
     
     def _get_unassigned_tickets(self, assignment_date: datetime) -> List[Dict]:
         """
@@ -153,48 +287,70 @@ class IntelligentAssignmentEngine:
         
         Mix of statuses: open, in_progress, completed, cancelled
         Mix of categories across all states
+        
+        One pass classifies each ticket as new (open, unassigned), created
+        today, or aging (open/in_progress for more than 3 days); the other
+        open/in_progress tickets are kept aside as simulation fill.
         """
-        # Filter tickets created today or needing reassignment
-        today_start = assignment_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
+        today = assignment_date.date().isoformat()
+        created_date = self._created_date_lookup()
         
         candidates = []
+        fill = []
         
         for ticket in self.tickets:
-            # Check if ticket needs assignment
-            should_assign = False
+            status = ticket.get('status')
             
             # New tickets (open status, no assignment)
-            if ticket.get('status') == 'open' and not ticket.get('assignedTeam'):
-                should_assign = True
+            if status == 'open' and not ticket.get('assignedTeam'):
+                candidates.append(ticket)
             
             # Tickets created today
-            if ticket.get('createdAt'):
-                try:
-                    created = datetime.fromisoformat(ticket['createdAt'].replace('Z', '+00:00'))
-                    if created.replace(tzinfo=None) >= today_start and created.replace(tzinfo=None) < today_end:
-                        should_assign = True
-                except:
-                    pass
+            elif created_date(ticket) == today:
+                candidates.append(ticket)
             
             # Reassignment needed (high priority, delayed tickets)
-            if ticket.get('status') in ['open', 'in_progress']:
+            elif status in ['open', 'in_progress']:
                 if ticket.get('agingDays', 0) > 3:  # Tickets aging more than 3 days
-                    should_assign = True
-            
-            if should_assign:
-                candidates.append(ticket)
+                    candidates.append(ticket)
+                else:
+                    fill.append(ticket)
         
         # If not enough, include some existing tickets for simulation
         if len(candidates) < 100:
             # Add some random open/in_progress tickets
-            additional = [t for t in self.tickets if t.get('status') in ['open', 'in_progress'] 
-                         and t not in candidates]
-            random.shuffle(additional)
-            candidates.extend(additional[:min(200, len(additional))])
+            random.shuffle(fill)
+            candidates.extend(fill[:min(200, len(fill))])
         
         return candidates
     
+    def _created_date_lookup(self):
+        """
+        Return ticket -> local creation date ('YYYY-MM-DD', None if invalid)
+        
+        Uses the TicketStore's pre-parsed createdAt when the engine was
+        given a store, so no timestamps are parsed here.
+        """
+        store_key = getattr(self.tickets, 'key', None)
+        store_timestamp = getattr(self.tickets, 'timestamp', None)
+        if store_key and store_timestamp:
+            def lookup(ticket):
+                ticket_id = ticket['_id']
+                if store_timestamp(ticket_id, 'createdAt') is None:
+                    return None
+                return store_key(ticket_id, 'createdDate')
+            return lookup
+        
+        def parse(ticket):
+            created_at = ticket.get('createdAt')
+            if not created_at:
+                return None
+            try:
+                return datetime.fromisoformat(created_at.replace('Z', '+00:00')).date().isoformat()
+            except (AttributeError, TypeError, ValueError):
+                return None
+        return parse
+    
     def _analyze_team_availability(self, assignment_date: datetime) -> List[Dict]:
         """
         Analyze which teams are available and their capacity
@@ -298,21 +454,21 @@ class IntelligentAssignmentEngine:
     
     def _get_zone_for_state(self, state: str) -> str:
         """Get zone for a given state"""
-        for zone, states in self.zone_mapping.items():
-            if state in states:
-                return zone
-        return None
+        return self.state_zone.get(state)
     
     def _assign_tickets_intelligently(
         self, 
         tickets: List[Dict], 
         teams: List[Dict],
         demand_analysis: Dict,
-        assignment_date: datetime
+        assignment_date: datetime,
+        commit: bool = True
     ) -> List[Dict]:
         """
         Main intelligent assignment algorithm using multi-factor scoring
         
+        With commit=False the tickets are left untouched (dry run).
+        
         Scoring factors:
         - Location match (state/zone)
         - Team availability and capacity
@@ -325,12 +481,11 @@ class IntelligentAssignmentEngine:
         assignments = []
         team_assignments = {team['_id']: [] for team in teams}
         
+        # Precompute team attributes once for the vectorized scorer
+        matrix = TeamScoringMatrix(self, teams) if self.use_vectorized else None
+        
         # Sort tickets by priority and SLA urgency
-        sorted_tickets = sorted(tickets, key=lambda t: (
-            self._get_priority_score(t.get('priority', 'medium')),
-            -t.get('agingDays', 0),
-            t.get('sla', {}).get('breached', False)
-        ), reverse=True)
+        sorted_tickets = self._sort_by_urgency(tickets)
         
         print(f"\n📊 Assigning {len(sorted_tickets)} tickets using intelligent scoring...")
         
@@ -342,20 +497,36 @@ class IntelligentAssignmentEngine:
                 print(f"   Progress: {i+1}/{len(sorted_tickets)} tickets processed...")
             
             # Calculate scores for all eligible teams
-            team_scores = self._calculate_team_scores(ticket, teams, team_assignments, demand_analysis)
-            
-            if not team_scores:
-                skipped_count += 1
-                continue
-            
-            # Select best team
-            best_team_id, best_score = max(team_scores.items(), key=lambda x: x[1])
-            best_team = next(t for t in teams if t['_id'] == best_team_id)
+            if matrix is not None:
+                scores = self._calculate_team_scores_vectorized(ticket, matrix, demand_analysis)
+                if not np.isfinite(scores).any():
+                    skipped_count += 1
+                    continue
+                
+                # Select best team (argmax keeps the first team on ties, like max())
+                best_index = int(np.argmax(scores))
+                best_score = float(scores[best_index])
+                best_team = teams[best_index]
+                best_team_id = best_team['_id']
+            else:
+                team_scores = self._calculate_team_scores(ticket, teams, team_assignments, demand_analysis)
+                
+                if not team_scores:
+                    skipped_count += 1
+                    continue
+                
+                # Select best team
+                best_team_id, best_score = max(team_scores.items(), key=lambda x: x[1])
+                best_team = next(t for t in teams if t['_id'] == best_team_id)
             
             # Check capacity constraint
             if len(team_assignments[best_team_id]) >= best_team.get('remaining_capacity', self.daily_capacity):
                 # Try next best team
-                sorted_teams = sorted(team_scores.items(), key=lambda x: x[1], reverse=True)
+                if matrix is not None:
+                    order = np.argsort(-scores, kind='stable')
+                    sorted_teams = [(teams[j]['_id'], float(scores[j])) for j in order if np.isfinite(scores[j])]
+                else:
+                    sorted_teams = sorted(team_scores.items(), key=lambda x: x[1], reverse=True)
                 assigned = False
                 
                 for team_id, score in sorted_teams[1:]:  # Skip the first (already tried)
@@ -373,17 +544,206 @@ class IntelligentAssignmentEngine:
             assignment = self._create_assignment(ticket, best_team, best_score, assignment_date)
             assignments.append(assignment)
             team_assignments[best_team_id].append(assignment)
+            if matrix is not None:
+                matrix.loads[matrix.index[best_team_id]] += 1
             assigned_count += 1
             
             # Update ticket with assignment
-            ticket['assignedTeam'] = best_team_id
-            ticket['assigned_team'] = best_team_id
-            ticket['assignedAt'] = datetime.now().isoformat()
+            if commit:
+                self._mark_assigned(ticket, best_team_id)
         
         print(f"   ✅ Assigned: {assigned_count}, ⏭️  Skipped: {skipped_count}")
         
         return assignments
     
+    def _assign_tickets_sharded(
+        self,
+        tickets: List[Dict],
+        teams: List[Dict],
+        demand_analysis: Dict,
+        assignment_date: datetime,
+        algorithm: str = 'greedy',
+        max_workers: int = None
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        Solve each zone independently in a process pool, then spill over
+        
+        Tickets and teams are partitioned by the zone of their state
+        (zone_mapping). Every shard is scored against the global demand
+        analysis, so in-zone scores equal the unsharded ones. Shard results
+        are applied here; tickets left over (full shards, zones without
+        teams, unmapped states) then get one greedy pass over the capacity
+        every team has left.
+        
+        Returns: (assignments, sharding report)
+        """
+        shard_tickets = {}
+        shard_teams = {}
+        for ticket in tickets:
+            zone = self._get_zone_for_state(ticket.get('location', {}).get('state', ''))
+            shard_tickets.setdefault(zone, []).append(ticket)
+        for team in teams:
+            shard_teams.setdefault(self._get_zone_for_state(team.get('state', '')), []).append(team)
+        
+        zones = [zone for zone in self.zone_mapping if shard_tickets.get(zone) and shard_teams.get(zone)]
+        jobs = [
+            (shard_tickets[zone], shard_teams[zone], demand_analysis, assignment_date, algorithm, self.use_vectorized)
+            for zone in zones
+        ]
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+        print(f"   🧩 Sharded run: {len(jobs)} zones on {workers} worker(s)")
+        
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_solve_zone_shard, jobs))
+        else:
+            results = [_solve_zone_shard(job) for job in jobs]
+        
+        # Apply shard results to the real tickets
+        tickets_by_id = {ticket.get('_id') or ticket.get('id'): ticket for ticket in tickets}
+        team_loads = {}
+        assignments = []
+        report = {'workers': workers, 'zones': {}}
+        for zone, shard_assignments in zip(zones, results):
+            for assignment in shard_assignments:
+                self._mark_assigned(tickets_by_id[assignment['ticketId']], assignment['teamId'])
+                team_loads[assignment['teamId']] = team_loads.get(assignment['teamId'], 0) + 1
+            assignments.extend(shard_assignments)
+            report['zones'][zone] = {
+                'tickets': len(shard_tickets[zone]),
+                'teams': len(shard_teams[zone]),
+                'assigned': len(shard_assignments)
+            }
+        
+        # Spillover: cross-zone greedy pass over the remaining capacity
+        assigned_ids = {assignment['ticketId'] for assignment in assignments}
+        remaining_tickets = [t for t in tickets if (t.get('_id') or t.get('id')) not in assigned_ids]
+        remaining_teams = []
+        for team in teams:
+            left = team.get('remaining_capacity', self.daily_capacity) - team_loads.get(team['_id'], 0)
+            if left > 0:
+                team_copy = team.copy()
+                team_copy['remaining_capacity'] = left
+                remaining_teams.append(team_copy)
+        
+        spillover = []
+        if remaining_tickets and remaining_teams:
+            print(f"   🔀 Spillover: {len(remaining_tickets)} tickets, {len(remaining_teams)} teams with capacity")
+            spillover = self._assign_tickets_intelligently(
+                remaining_tickets, remaining_teams, demand_analysis, assignment_date
+            )
+        assignments.extend(spillover)
+        report['spillover'] = len(spillover)
+        
+        return assignments, report
+    
+    def _sort_by_urgency(self, tickets: List[Dict]) -> List[Dict]:
+        """Order tickets by priority and SLA urgency (most urgent first)"""
+        return sorted(tickets, key=lambda t: (
+            self._get_priority_score(t.get('priority', 'medium')),
+            -t.get('agingDays', 0),
+            t.get('sla', {}).get('breached', False)
+        ), reverse=True)
+    
+    def _mark_assigned(self, ticket: Dict, team_id: str):
+        """Record an assignment on the ticket itself (or in pending_ticket_updates)"""
+        changes = {
+            'assignedTeam': team_id,
+            'assigned_team': team_id,
+            'assignedAt': datetime.now().isoformat()
+        }
+        if self.defer_ticket_updates:
+            self.pending_ticket_updates.setdefault(ticket.get('_id') or ticket.get('id'), {}).update(changes)
+        else:
+            ticket.update(changes)
+    
+    def _assign_tickets_optimally(
+        self,
+        tickets: List[Dict],
+        teams: List[Dict],
+        demand_analysis: Dict,
+        assignment_date: datetime,
+        candidate_factor: int = 3
+    ) -> List[Dict]:
+        """
+        Capacitated assignment maximizing total priority-weighted score
+        
+        Each team is expanded into one slot per unit of remaining capacity;
+        slot k carries the workload score of a team already holding k
+        tickets, so the slot-expanded problem is the min-cost flow
+        ticket -> team -> sink with convex per-team costs. It is solved
+        exactly as a rectangular assignment (scipy linear_sum_assignment)
+        on score x priority weight.
+        
+        When tickets outnumber slots by more than candidate_factor, only
+        the best candidate_factor x slots tickets plus each team's top
+        candidate_factor x capacity are kept, which bounds the matrix at
+        ~2 x candidate_factor x slots^2.
+        """
+        from scipy.optimize import linear_sum_assignment
+        
+        if not tickets or not teams:
+            return []
+        
+        sorted_tickets = self._sort_by_urgency(tickets)
+        matrix = TeamScoringMatrix(self, teams)
+        features = self._ticket_feature_columns(sorted_tickets, matrix, demand_analysis)
+        weights = np.array(
+            [self._get_priority_score(t.get('priority', 'medium')) for t in sorted_tickets], dtype=np.float64
+        )
+        
+        # Slot k of team j exists for k < remaining capacity
+        capacity = np.where(matrix.offline, 0, np.minimum(matrix.remaining_capacity, len(sorted_tickets)))
+        capacity = np.maximum(capacity, 0).astype(np.int64)
+        max_load = int(capacity.max()) if len(capacity) else 0
+        if max_load == 0:
+            return []
+        slot_scores = [
+            self._score_teams(features, matrix, np.full(len(teams), load, dtype=np.float64))
+            for load in range(max_load)
+        ]
+        slot_team = np.concatenate([np.flatnonzero(capacity > load) for load in range(max_load)])
+        slot_load = np.concatenate([np.full(int((capacity > load).sum()), load) for load in range(max_load)])
+        
+        # Candidate pruning by weighted first-slot score: each team's top
+        # tickets plus the globally best ones, so rows never undercut slots
+        rows = np.arange(len(sorted_tickets))
+        limit = candidate_factor * len(slot_team)
+        if len(rows) > limit:
+            first_slot = slot_scores[0] * weights[:, None]
+            keep = np.zeros(len(rows), dtype=bool)
+            keep[np.argpartition(-first_slot.max(axis=1), limit - 1)[:limit]] = True
+            for j in np.flatnonzero(capacity):
+                top = min(candidate_factor * int(capacity[j]), len(rows))
+                keep[np.argpartition(-first_slot[:, j], top - 1)[:top]] = True
+            rows = np.flatnonzero(keep)
+        
+        gain = np.empty((len(rows), len(slot_team)), dtype=np.float64)
+        for load in range(max_load):
+            columns = np.flatnonzero(slot_load == load)
+            gain[:, columns] = slot_scores[load][np.ix_(rows, slot_team[columns])] * weights[rows, None]
+        
+        chosen_rows, chosen_slots = linear_sum_assignment(gain, maximize=True)
+        team_of_ticket = {int(rows[r]): int(slot_team[c]) for r, c in zip(chosen_rows, chosen_slots)}
+        
+        # Re-number slots per team in urgency order so loads are contiguous
+        assignments = []
+        team_loads = np.zeros(len(teams), dtype=np.int64)
+        for i, ticket in enumerate(sorted_tickets):
+            j = team_of_ticket.get(i)
+            if j is None:
+                continue
+            score = float(slot_scores[team_loads[j]][i, j])
+            team_loads[j] += 1
+            team = teams[j]
+            assignments.append(self._create_assignment(ticket, team, score, assignment_date))
+            self._mark_assigned(ticket, team['_id'])
+        
+        print(f"   ✅ Optimal: {len(assignments)} assigned from {len(rows)} candidates "
+              f"into {len(slot_team)} team slots")
+        
+        return assignments
+    
     def _calculate_team_scores(
         self, 
         ticket: Dict, 
@@ -459,6 +819,121 @@ class IntelligentAssignmentEngine:
         
         return scores
     
+    def _calculate_team_scores_vectorized(
+        self,
+        ticket: Dict,
+        matrix: 'TeamScoringMatrix',
+        demand_analysis: Dict
+    ) -> 'np.ndarray':
+        """
+        Vectorized equivalent of _calculate_team_scores
+        
+        Evaluates the same seven factors and modifiers for every team at once
+        using the per-team arrays in ``matrix``. Scores agree with the scalar
+        version to within VECTORIZED_SCORE_TOLERANCE (the operations are
+        applied in the same order, so in practice they are identical).
+        
+        Returns: array of scores aligned with ``matrix.teams``; -inf marks
+        teams that are at capacity or offline
+        """
+        features = self._ticket_features(ticket, matrix, demand_analysis)
+        total_score = self._score_teams(features, matrix, matrix.loads)
+        
+        # Skip teams at capacity or offline
+        eligible = (matrix.loads < matrix.remaining_capacity) & ~matrix.offline
+        return np.where(eligible, total_score, -np.inf)
+    
+    def _ticket_features(self, ticket: Dict, matrix: 'TeamScoringMatrix', demand_analysis: Dict) -> Dict[str, Any]:
+        """Ticket-side inputs of the vectorized scorer, encoded against ``matrix``"""
+        ticket_location = ticket.get('location', {})
+        ticket_state = ticket_location.get('state', '')
+        
+        # SLA tier: 0 = urgent/breached, 1 = medium, 2 = low/other
+        ticket_priority = ticket.get('priority', 'medium').lower()
+        if ticket_priority in ['emergency', 'urgent'] or ticket.get('sla', {}).get('breached', False):
+            sla_tier = 0
+        elif ticket_priority == 'medium':
+            sla_tier = 1
+        else:
+            sla_tier = 2
+        
+        demand_zone = self._get_zone_for_state(ticket_location.get('state', ''))
+        high_demand = demand_zone in demand_analysis and demand_analysis[demand_zone]['total_tickets'] > 50
+        
+        return {
+            'district': matrix.code(ticket_location.get('zone', '')),
+            'state': matrix.code(ticket_state),
+            'zone': matrix.code(self._get_zone_for_state(ticket_state)),
+            'timing_district': matrix.code(ticket_location.get('district')),
+            'specialization': matrix.code(ticket.get('category')),
+            'travel': matrix.travel_code(ticket_location),
+            'skill': matrix.skill_scores(ticket.get('category', '')),
+            'sla_tier': sla_tier,
+            'high_demand': high_demand
+        }
+    
+    def _ticket_feature_columns(
+        self,
+        tickets: List[Dict],
+        matrix: 'TeamScoringMatrix',
+        demand_analysis: Dict
+    ) -> Dict[str, 'np.ndarray']:
+        """Stack _ticket_features for many tickets into (tickets x 1) columns"""
+        rows = [self._ticket_features(ticket, matrix, demand_analysis) for ticket in tickets]
+        columns = {
+            name: np.array([row[name] for row in rows])[:, None]
+            for name in rows[0] if name != 'skill'
+        }
+        columns['skill'] = np.stack([row['skill'] for row in rows])
+        return columns
+    
+    def _score_teams(self, features: Dict[str, Any], matrix: 'TeamScoringMatrix', loads: 'np.ndarray') -> 'np.ndarray':
+        """
+        Multi-factor score of every team given ticket features and team loads
+        
+        ``features`` holds scalars (one ticket -> one score per team) or
+        (tickets x 1) columns (-> tickets x teams matrix). Mirrors
+        _calculate_team_scores and _apply_modifiers step for step.
+        """
+        w = self.weights
+        
+        # Factor 1: Location Match - district, then state, then zone
+        location_score = np.where(
+            matrix.district_set & (matrix.district_codes == features['district']), 1.0,
+            np.where(
+                matrix.state_set & (matrix.state_codes == features['state']), 0.8,
+                np.where(matrix.zone_set & (matrix.zone_codes == features['zone']), 0.5, 0.2)
+            )
+        )
+        
+        # Factor 6: SLA Urgency Capability
+        sla_tier = features['sla_tier']
+        sla_score = np.where(sla_tier == 0, matrix.sla_urgent, np.where(sla_tier == 1, matrix.sla_medium, matrix.sla_low))
+        
+        # Factor 7: Customer Timing Match
+        timing_score = np.where(matrix.timing_district_codes == features['timing_district'], 0.9, 0.7)
+        
+        total_score = location_score * w['location_match']
+        total_score = total_score + matrix.availability_score * w['availability']
+        total_score = total_score + matrix.productivity_score * w['productivity']
+        total_score = total_score + features['skill'] * w['skill_match']
+        total_score = total_score + (1.0 - loads / matrix.capacity_divisor) * w['workload_balance']
+        total_score = total_score + sla_score * w['sla_urgency']
+        total_score = total_score + timing_score * w['customer_timing']
+        
+        # Modifiers, in the same order as _apply_modifiers
+        total_score = np.where(matrix.high_performer, total_score * 1.1, total_score)
+        total_score = np.where(matrix.specialization_codes == features['specialization'], total_score * 1.15, total_score)
+        total_score = np.where(features['high_demand'], total_score * 1.05, total_score)
+        total_score = np.where(matrix.low_rating, total_score * 0.9, total_score)
+        total_score = np.where(matrix.recent_failures, total_score * 0.85, total_score)
+        travel_minutes = matrix.travel_minutes(features['travel'])
+        total_score = np.where(
+            np.isnan(travel_minutes), total_score,
+            total_score * (1.0 - TRAVEL_PENALTY * np.minimum(travel_minutes, TRAVEL_MINUTES_CAP) / TRAVEL_MINUTES_CAP)
+        )
+        return np.minimum(total_score, 1.0)
+    
     def _calculate_location_score(self, team: Dict, ticket_state: str, ticket_zone: str) -> float:
         """
         Calculate location match score (0-1)
@@ -552,7 +1027,7 @@ class IntelligentAssignmentEngine:
         Currently simplified - can be enhanced with actual time slot data
         """
         # Check if ticket has preferred time slot
-        customer_info = ticket.get('customerInfo', {})
+        customer_info = ticket.get('customerInfo') or {}
         preferred_time = customer_info.get('preferredTimeSlot', 'anytime')
         
         # Check team's current schedule/location
@@ -601,8 +1076,20 @@ class IntelligentAssignmentEngine:
         if recent_cancelled > 2:
             score *= 0.85
         
+        # Penalty: Long travel to the ticket's district
+        travel_minutes = self._travel_minutes(team, ticket)
+        if travel_minutes is not None:
+            score *= 1.0 - TRAVEL_PENALTY * min(travel_minutes, TRAVEL_MINUTES_CAP) / TRAVEL_MINUTES_CAP
+        
         return min(score, 1.0)  # Cap at 1.0
     
+    def _travel_minutes(self, team: Dict, ticket: Dict) -> float:
+        """Precomputed travel minutes from a team to a ticket's district (None if unknown)"""
+        if self.travel_matrix is None:
+            return None
+        location = ticket.get('location') or {}
+        return self.travel_matrix.team_to(team.get('_id'), location.get('state'), location.get('district'))
+    
     def _balance_workload(
         self, 
         assignments: List[Dict], 
@@ -668,9 +1155,38 @@ class IntelligentAssignmentEngine:
             'sla': ticket.get('sla', {}),
             'estimatedDuration': ticket.get('estimatedDuration', 4.0),
             'assignmentMethod': 'intelligent_engine',
-            'confidence': 'high' if score > 0.7 else 'medium' if score > 0.5 else 'low'
+            'confidence': 'high' if score > 0.7 else 'medium' if score > 0.5 else 'low',
+            'distanceKm': self._distance_km(ticket, team)
         }
     
+    def _distance_km(self, ticket: Dict, team: Dict) -> float:
+        """Haversine distance between a ticket and a team's position (None if unknown)"""
+        ticket_point = ticket_coordinates(ticket)
+        team_point = self.team_locations.location(team.get('_id')) or team_coordinates(team)
+        if ticket_point is None or team_point is None:
+            return None
+        return round(haversine_km(*ticket_point, *team_point), 2)
+    
+    def nearest_teams(self, ticket: Dict, k: int = 5, teams: List[Dict] = None) -> List[Tuple[float, Dict]]:
+        """
+        Rank teams by real distance to a ticket
+        
+        Args:
+            ticket: Ticket with location.coordinates
+            k: Number of teams to return
+            teams: Candidate teams (default: all teams)
+        
+        Returns:
+            Up to k (distance_km, team) pairs, nearest first; empty if the
+            ticket has no coordinates
+        """
+        point = ticket_coordinates(ticket)
+        if point is None:
+            return []
+        candidates = {team['_id']: team for team in (self.teams if teams is None else teams) if '_id' in team}
+        nearest = self.team_locations.k_nearest(*point, k=k, filter=candidates.__contains__)
+        return [(distance, candidates[team_id]) for distance, team_id in nearest]
+    
     def _generate_assignment_stats(self, assignments: List[Dict], teams: List[Dict]) -> Dict:
         """Generate comprehensive assignment statistics"""
         
@@ -777,6 +1293,126 @@ class IntelligentAssignmentEngine:
             groups[value] = groups.get(value, 0) + 1
         return groups
 
+def _solve_zone_shard(job: Tuple) -> List[Dict]:
+    """
+    Process-pool entry point: assign one zone's tickets to its teams
+    
+    Works on the pickled copies it receives and returns the assignments;
+    the parent marks the real tickets.
+    """
+    tickets, teams, demand_analysis, assignment_date, algorithm, use_vectorized = job
+    engine = IntelligentAssignmentEngine(tickets, teams)
+    engine.use_vectorized = use_vectorized
+    if algorithm == 'optimal':
+        return engine._assign_tickets_optimally(tickets, teams, demand_analysis, assignment_date)
+    return engine._assign_tickets_intelligently(tickets, teams, demand_analysis, assignment_date, commit=False)
+
+
+class TeamScoringMatrix:
+    """
+    Per-team scoring attributes laid out as NumPy arrays
+    
+    Built once per assignment run from the availability-annotated teams.
+    Team-only factors (availability, productivity, SLA tiers, modifiers) are
+    evaluated up front; string attributes are dictionary-encoded so location,
+    timing and specialization matches become integer comparisons. ``loads``
+    tracks assignments made so far in the run.
+    """
+    
+    MISSING = -1   # Code for values absent from the vocabulary
+    
+    def __init__(self, engine: IntelligentAssignmentEngine, teams: List[Dict]):
+        self.engine = engine
+        self.teams = teams
+        self.index = {}
+        for i, team in enumerate(teams):
+            self.index.setdefault(team['_id'], i)
+        self._codes = {}
+        self._skill_scores = {}
+        
+        size = len(teams)
+        self.loads = np.zeros(size, dtype=np.float64)
+        self.remaining_capacity = np.array(
+            [team.get('remaining_capacity', engine.daily_capacity) for team in teams], dtype=np.float64
+        )
+        self.capacity_divisor = np.maximum(self.remaining_capacity, 1)
+        self.offline = np.array([team.get('availability_status') == 'offline' for team in teams], dtype=bool)
+        
+        # Location: only truthy team values can match
+        self.district_codes = self._encode([team.get('district', '') for team in teams])
+        self.state_codes = self._encode([team.get('state', '') for team in teams])
+        self.zone_codes = self._encode([team.get('zone', '') for team in teams])
+        self.district_set = np.array([bool(team.get('district', '')) for team in teams], dtype=bool)
+        self.state_set = np.array([bool(team.get('state', '')) for team in teams], dtype=bool)
+        self.zone_set = np.array([bool(team.get('zone', '')) for team in teams], dtype=bool)
+        
+        # Timing and specialization compare raw values (None matches None)
+        self.timing_district_codes = self._encode([team.get('district') for team in teams])
+        self.specialization_codes = self._encode([team.get('specialization') for team in teams])
+        
+        self.availability_score = np.array([team.get('availability_score', 0.5) for team in teams], dtype=np.float64)
+        self.productivity_score = np.array([self._productivity(team) for team in teams], dtype=np.float64)
+        
+        # SLA capability per priority tier (top-level efficiencyScore, default 70)
+        sla_efficiency = [team.get('efficiencyScore', 70) for team in teams]
+        self.sla_urgent = np.array(
+            [1.0 if e >= 85 else 0.7 if e >= 75 else 0.4 for e in sla_efficiency], dtype=np.float64
+        )
+        self.sla_medium = np.array([0.8 if e >= 70 else 0.5 for e in sla_efficiency], dtype=np.float64)
+        self.sla_low = np.array([0.6 + (e / 200.0) for e in sla_efficiency], dtype=np.float64)
+        
+        # Team-only modifiers
+        self.high_performer = np.array([team.get('efficiencyScore', 0) >= 90 for team in teams], dtype=bool)
+        self.low_rating = np.array([team.get('customerRating', 5.0) < 3.5 for team in teams], dtype=bool)
+        self.recent_failures = np.array([team.get('recentCancellations', 0) > 2 for team in teams], dtype=bool)
+        
+        # Rows of these teams in the engine's travel matrix
+        travel = engine.travel_matrix
+        self.travel_rows = travel.team_rows([team['_id'] for team in teams]) if travel is not None else None
+    
+    @staticmethod
+    def _productivity(team: Dict) -> float:
+        productivity = team.get('productivity', {})
+        if isinstance(productivity, dict):
+            efficiency_score = productivity.get('efficiencyScore', 0) / 100.0
+            completion_rate = productivity.get('completionRate', 0) / 100.0
+            return efficiency_score * 0.6 + completion_rate * 0.4
+        return team.get('efficiencyScore', 70) / 100.0
+    
+    def _encode(self, values: List[Any]) -> 'np.ndarray':
+        return np.array([self._codes.setdefault(value, len(self._codes)) for value in values], dtype=np.int64)
+    
+    def code(self, value: Any) -> int:
+        """Vocabulary code of a ticket attribute (MISSING if no team has it)"""
+        try:
+            return self._codes.get(value, self.MISSING)
+        except TypeError:
+            return self.MISSING
+    
+    def travel_code(self, location: Dict) -> int:
+        """Travel matrix place code of a ticket location"""
+        travel = self.engine.travel_matrix
+        if travel is None:
+            return -1
+        return travel.place_code(location.get('state'), location.get('district'))
+    
+    def travel_minutes(self, codes) -> 'np.ndarray':
+        """Travel minutes of every team to place code(s); NaN where unknown"""
+        if self.travel_rows is None:
+            return np.full(np.shape(codes)[:1] + (len(self.teams),), np.nan)
+        return self.engine.travel_matrix.from_teams(self.travel_rows, codes)
+    
+    def skill_scores(self, category: str) -> 'np.ndarray':
+        """Skill match of every team for a ticket category (memoized)"""
+        scores = self._skill_scores.get(category)
+        if scores is None:
+            scores = np.array(
+                [self.engine._calculate_skill_match(team, category) for team in self.teams], dtype=np.float64
+            )
+            self._skill_scores[category] = scores
+        return scores
+
+
 # Standalone execution for testing
 if __name__ == '__main__':
     print("🤖 Intelligent Assignment Engine - Standalone Test")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Live Events - AIFF Backend
+Server-Sent Events fan-out for live tracking
+
+Dispatch consoles used to poll /api/live-tracking/* and rebuild the full
+team, ticket and route lists on every call. Instead they subscribe to
+GET /api/live-tracking/stream and receive only deltas as they happen:
+
+    team        position / status / current task of one team
+    ticket      status / assignment / priority of one ticket
+    assignment  an assignment created, updated or deleted
+    resync      the subscriber fell behind: reload the snapshot endpoints
+
+Each event is encoded once and fanned out to every subscriber. A
+subscriber owns a bounded queue; when a slow consumer fills it, its
+backlog is dropped and replaced by a single resync event, so one stalled
+console never holds memory or slows publishers down. Subscribers beyond
+LIVE_MAX_SUBSCRIBERS are turned away (503) and keep polling instead.
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from response_encoding import dumps
+
+LIVE_QUEUE_SIZE = 1000
+# Streams per process. Under gunicorn each one holds a worker thread for as
+# long as the console stays open; gunicorn.conf.py sets this below `threads`
+LIVE_MAX_SUBSCRIBERS = int(os.environ.get('AIFF_LIVE_MAX_SUBSCRIBERS', 100))
+LIVE_HEARTBEAT_SECONDS = 15
+
+RESYNC = 'resync'
+
+
+def format_event(event_id: int, event_type: str, data: bytes) -> bytes:
+    """One SSE frame"""
+    return b'id: %d\nevent: %s\ndata: %s\n\n' % (event_id, event_type.encode('ascii'), data)
+
+
+class Subscription:
+    """Bounded event queue of one stream client"""
+
+    def __init__(self, maxsize: int = LIVE_QUEUE_SIZE):
+        self._events = deque()
+        self._maxsize = maxsize
+        self._ready = threading.Condition()
+        self.dropped = 0
+
+    def offer(self, frame: bytes, resync_frame: bytes):
+        """Queue a frame; on overflow replace the backlog with a resync frame"""
+        with self._ready:
+            if len(self._events) >= self._maxsize:
+                self.dropped += len(self._events)
+                self._events.clear()
+                self._events.append(resync_frame)
+            else:
+                self._events.append(frame)
+            self._ready.notify()
+
+    def get(self, timeout: float) -> Optional[bytes]:
+        """Next frame, or None if nothing arrived within the timeout"""
+        with self._ready:
+            if not self._events:
+                self._ready.wait(timeout)
+            return self._events.popleft() if self._events else None
+
+
+class LiveEventBroker:
+    """Publishes events to all current subscriptions"""
+
+    def __init__(self, queue_size: int = LIVE_QUEUE_SIZE, max_subscribers: int = LIVE_MAX_SUBSCRIBERS):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.last_event_id = 0
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Optional[Subscription]:
+        """New subscription, or None when the subscriber limit is reached"""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.queue_size)
+            self._subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, event_type: str, data: Dict):
+        """Encode an event once and queue it for every subscriber"""
+        with self._lock:
+            self.last_event_id += 1
+            if not self._subscribers:
+                return
+            frame = format_event(self.last_event_id, event_type, dumps(data))
+            resync_frame = format_event(self.last_event_id, RESYNC, b'{"reason":"queue overflow"}')
+            for subscription in self._subscribers:
+                subscription.offer(frame, resync_frame)
+
+
+class TicketEventPublisher:
+    """
+    TicketStore observer publishing a ticket event when a ticket is added
+    or its status, assigned team or priority changes
+    """
+
+    def __init__(self, broker: LiveEventBroker):
+        self.broker = broker
+        self._state: Dict[str, tuple] = {}
+
+    def track(self, ticket_id: str, ticket: Dict, times: Dict[str, Optional[float]]):
+        state = (ticket.get('status'), ticket.get('assignedTeam'), ticket.get('priority'))
+        if self._state.get(ticket_id) == state:
+            return
+        self._state[ticket_id] = state
+        self.broker.publish('ticket', {
+            'ticketId': ticket_id,
+            'status': state[0],
+            'assignedTeam': state[1],
+            'priority': state[2],
+            'coordinates': (ticket.get('location') or {}).get('coordinates'),
+            'updatedAt': ticket.get('updatedAt')
+        })
+
+    def reset(self):
+        self._state.clear()
+        self.broker.publish(RESYNC, {'reason': 'tickets reloaded'})
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Mutation Journal - AIFF Backend
+Single-writer change journal shared by the gunicorn worker processes
+
+Under gunicorn (gunicorn.conf.py) the dataset is loaded once in the master
+(preload_app) and every worker starts from that copy-on-write image. From
+then on the workers stay identical by sharing one append-only journal
+file:
+
+- A mutating request takes the journal's exclusive lock (flock, so only
+  one request in one worker writes at a time), first replays whatever
+  other workers appended, runs, and then appends the final state of every
+  ticket, team and assignment it touched.
+- Every other request (and a follower thread, for live streams) replays
+  new entries before reading, unless a writer of the same worker is
+  pending: that writer replays them, and reads meanwhile see the state
+  from before them rather than wait for it.
+
+Every worker therefore applies the same entries in the same order on top
+of the same image. Entries are JSON lines: [collection, operation, doc].
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from change_log import UPDATE
+from response_encoding import dumps
+
+# orjson is optional: faster parsing of replayed entries
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JOURNAL_POLL_SECONDS = 0.5
+COLLECTIONS = ('tickets', 'teams', 'assignments')
+
+Entry = Tuple[str, str, Dict]
+
+
+def _loads(line: bytes):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+class MutationJournal:
+    """
+    Append-only journal file with one writer at a time
+
+    Args:
+        path: Journal file, truncated on creation (the master's preloaded
+            dataset is the journal's starting point)
+        apply: Callback replaying a list of (collection, operation, doc)
+            entries written by other processes
+        lock: Reentrant lock (acquire(blocking)/release) held while
+            replaying and writing, e.g. the dataset's writer role; default:
+            a private RLock. If it has exclude_readers(), that is called
+            only once other workers' writers are out of the way, so this
+            process keeps serving reads while a writer waits for the flock.
+    """
+
+    def __init__(self, path: str, apply: Callable[[List[Entry]], None], lock=None):
+        self.path = path
+        self.apply = apply
+        # Journal position applied so far, and per collection the position
+        # after its latest entry: identical in every worker, unlike the
+        # per-process version counters, so usable in ETags
+        self.offset = 0
+        self.collection_offsets = {name: 0 for name in COLLECTIONS}
+        with open(path, 'wb'):
+            pass
+        self._fd = None
+        self._fd_pid = None
+        self._lock = lock if lock is not None else threading.RLock()
+        self._exclude_readers = getattr(self._lock, 'exclude_readers', lambda: None)
+        self._writer = None
+        self._pending: Dict[Tuple[str, str], Tuple[str, Dict]] = {}
+
+    def _file(self) -> int:
+        # Forked workers must not share the parent's open file description:
+        # flock locks belong to it, so each process opens its own
+        if self._fd_pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def catch_up(self) -> int:
+        """Replay entries appended by other workers; returns how many"""
+        fd = self._file()
+        if os.fstat(fd).st_size == self.offset:
+            return 0
+        # A writer of this process replays on begin(); it may be waiting for
+        # another worker's long write, and readers must not wait with it
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            self._exclude_readers()
+            return self._replay(fd)
+        finally:
+            self._lock.release()
+
+    def _replay(self, fd: int) -> int:
+        data = os.pread(fd, os.fstat(fd).st_size - self.offset, self.offset)
+        # A writer may be mid-append: only complete lines are applied
+        data = data[:data.rfind(b'\n') + 1]
+        if not data:
+            return 0
+        entries = []
+        position = self.offset
+        for line in data.splitlines(keepends=True):
+            position += len(line)
+            collection, operation, doc = _loads(line)
+            self.collection_offsets[collection] = position
+            entries.append((collection, operation, doc))
+        self.offset = position
+        self.apply(entries)
+        return len(entries)
+
+    def follow(self, interval: float = JOURNAL_POLL_SECONDS) -> threading.Thread:
+        """Replay in a daemon thread so idle workers' live streams see changes"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.catch_up()
+                except Exception as e:
+                    print(f"⚠️  Journal replay failed: {e}")
+        thread = threading.Thread(target=loop, name='mutation-journal', daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def begin(self):
+        """Become the single writer: lock, then replay everything before us"""
+        self._lock.acquire()
+        try:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._exclude_readers()
+            self._replay(fd)
+        except BaseException:
+            self._lock.release()
+            raise
+        self._writer = threading.get_ident()
+
+    @property
+    def writing(self) -> bool:
+        return self._writer == threading.get_ident()
+
+    def record(self, collection: str, operation: str, key: str, doc: Dict):
+        """
+        Note a changed document; its state at commit() is what is journaled
+
+        Ignored outside begin()/commit() of the calling thread, which
+        includes replays of other workers' entries.
+        """
+        if not self.writing:
+            return
+        previous = self._pending.get((collection, key))
+        # Inserted then updated in one request is still an insert
+        if previous is not None and previous[0] == 'insert' and operation == 'update':
+            operation = 'insert'
+        self._pending[(collection, key)] = (operation, doc)
+
+    def track(self, ticket_id: str, ticket: Dict, times: Dict):
+        """TicketStore observer hook: journal added and reindexed tickets"""
+        self.record('tickets', UPDATE, ticket_id, ticket)
+
+    def reset(self):
+        # Bulk (re)loads happen before the journal starts; workers never
+        # clear the store
+        pass
+
+    def commit(self):
+        """Append the recorded documents and release the writer lock"""
+        if not self.writing:
+            return
+        try:
+            if self._pending:
+                lines = [dumps([collection, operation, doc]) + b'\n'
+                         for (collection, _), (operation, doc) in self._pending.items()]
+                data = memoryview(b''.join(lines))
+                while data:
+                    data = data[os.write(self._fd, data):]
+                for ((collection, _), _), line in zip(self._pending.items(), lines):
+                    self.offset += len(line)
+                    self.collection_offsets[collection] = self.offset
+        finally:
+            self._pending.clear()
+            self._writer = None
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._lock.release()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Response Encoding - AIFF Backend
+Fast JSON responses for the list endpoints
+
+Encoding thousands of nested ticket dicts with the stdlib json module
+dominated the response time of the polled list endpoints. This module
+provides:
+
+- dumps(): orjson-backed encoder (stdlib json fallback) producing the
+  same document as Flask's jsonify (sorted keys, compact separators)
+- FastJSONProvider: Flask JSON provider so every jsonify call uses it
+- EncodedTicketCache: TicketStore observer keeping each ticket's encoded
+  bytes until the ticket is added/reindexed again
+- json_response(): builds a response from a payload whose object members
+  may be pre-encoded fragments (Encoded), e.g. a cached ticket list
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+# orjson is optional: several times faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as compact, key-sorted JSON bytes"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers beyond 64 bits or mixed-type keys; stdlib handles those
+            pass
+    return json.dumps(value, default=DefaultJSONProvider.default, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class Encoded:
+    """An already-encoded JSON value, spliced verbatim by json_response"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+
+def _has_fragments(payload: Any) -> bool:
+    if isinstance(payload, Encoded):
+        return True
+    if isinstance(payload, dict):
+        return any(_has_fragments(value) for value in payload.values())
+    if isinstance(payload, list):
+        return any(_has_fragments(value) for value in payload)
+    return False
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Encode a value whose (possibly nested) members may be Encoded fragments"""
+    if isinstance(payload, Encoded):
+        return payload.data
+    if not _has_fragments(payload):
+        return dumps(payload)
+    if isinstance(payload, list):
+        return b'[' + b','.join([encode_payload(value) for value in payload]) + b']'
+    members = [
+        dumps(str(key)) + b':' + encode_payload(value)
+        for key, value in sorted(payload.items(), key=lambda item: str(item[0]))
+    ]
+    return b'{' + b','.join(members) + b'}'
+
+
+def json_response(payload: Dict[str, Any], status: int = 200) -> Response:
+    """Like jsonify(payload), but Encoded values are not re-encoded"""
+    return Response(encode_payload(payload) + b'\n', status=status, mimetype='application/json')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider using dumps() for responses"""
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj) + b'\n', mimetype=self.mimetype)
+
+
+class EncodedTicketCache:
+    """
+    Encoded JSON per ticket, invalidated on every add/reindex
+
+    Registered as a TicketStore observer. Tickets must be mutated through
+    the store (update/reindex) like every other derived view, otherwise a
+    stale encoding is served.
+    """
+
+    def __init__(self):
+        self._fragments: Dict[str, bytes] = {}
+
+    def track(self, ticket_id: str, ticket: Dict, times: Dict[str, Optional[float]]):
+        self._fragments.pop(ticket_id, None)
+
+    def reset(self):
+        self._fragments.clear()
+
+    def fragment(self, ticket: Dict) -> bytes:
+        """Encoded bytes of one store ticket"""
+        ticket_id = ticket.get('_id')
+        data = self._fragments.get(ticket_id)
+        if data is None:
+            data = dumps(ticket)
+            if ticket_id is not None:
+                self._fragments[ticket_id] = data
+        return data
+
+    def encode_list(self, tickets: Iterable[Dict]) -> Encoded:
+        """Encoded JSON array of store tickets, assembled from cached fragments"""
+        return Encoded(b'[' + b','.join([self.fragment(ticket) for ticket in tickets]) + b']')
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Route Planner - AIFF Backend
+Stop ordering and ETAs for /api/live-tracking/routes
+
+Each team's stops are ordered with a nearest-neighbour tour from the
+team's position, then improved with 2-opt (open path, fixed start) on
+haversine distances. ETAs accumulate travel time at ROUTE_SPEED_KMH plus
+each ticket's estimatedDuration (minutes) on site.
+
+Plans are cached per team and reused until the team's stop set (or its
+position, to ~100 m) changes, so a polled routes endpoint only re-plans
+the teams whose work changed. Re-plans for several teams run in a
+process pool when more than one CPU is available. The pool is started on
+first use and kept for the life of the process (one per gunicorn worker),
+so a poll pays for the planning, not for spawning processes.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Sequence, Tuple
+
+from spatial_index import haversine_km
+
+ROUTE_SPEED_KMH = 40.0
+DEFAULT_STOP_MINUTES = 60
+# Fewer cache misses than this are planned inline (pool start-up costs more)
+ROUTE_POOL_MIN_TEAMS = 4
+MAX_TWO_OPT_PASSES = 50
+
+# (ticket_id, lat, lng, service_minutes)
+Stop = Tuple[str, float, float, float]
+
+
+def _distance_matrix(points: Sequence[Tuple[float, float]]) -> List[List[float]]:
+    count = len(points)
+    matrix = [[0.0] * count for _ in range(count)]
+    for i in range(count):
+        lat1, lng1 = points[i]
+        row = matrix[i]
+        for j in range(i + 1, count):
+            distance = haversine_km(lat1, lng1, *points[j])
+            row[j] = distance
+            matrix[j][i] = distance
+    return matrix
+
+
+def _nearest_neighbour(matrix: List[List[float]]) -> List[int]:
+    """Greedy tour over matrix indices starting at 0 (the team position)"""
+    unvisited = set(range(1, len(matrix)))
+    tour = [0]
+    while unvisited:
+        row = matrix[tour[-1]]
+        # min() over a set is order dependent on ties; break them on index
+        nearest = min(unvisited, key=lambda j: (row[j], j))
+        unvisited.remove(nearest)
+        tour.append(nearest)
+    return tour
+
+
+def _two_opt(tour: List[int], matrix: List[List[float]], max_passes: int = MAX_TWO_OPT_PASSES) -> List[int]:
+    """
+    Improve an open tour (tour[0] fixed) by reversing segments
+
+    Reversing tour[i..j] replaces edges (i-1, i) and (j, j+1) with
+    (i-1, j) and (i, j+1); at the open end only the first edge changes.
+    """
+    tour = list(tour)
+    last = len(tour) - 1
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, last):
+            a, b = tour[i - 1], tour[i]
+            row_a, row_b = matrix[a], matrix[b]
+            removed_ab = row_a[b]
+            for j in range(i + 1, last + 1):
+                c = tour[j]
+                if j == last:
+                    delta = row_a[c] - removed_ab
+                else:
+                    d = tour[j + 1]
+                    delta = row_a[c] + row_b[d] - removed_ab - matrix[c][d]
+                if delta < -1e-9:
+                    tour[i:j + 1] = reversed(tour[i:j + 1])
+                    b = tour[i]
+                    row_b = matrix[b]
+                    removed_ab = row_a[b]
+                    improved = True
+        if not improved:
+            break
+    return tour
+
+
+def plan_route(start: Tuple[float, float], stops: Sequence[Stop], speed_kmh: float = ROUTE_SPEED_KMH) -> Dict:
+    """
+    Order stops and compute cumulative timings
+
+    Args:
+        start: Team (lat, lng)
+        stops: (ticket_id, lat, lng, service_minutes) tuples
+        speed_kmh: Average travel speed
+
+    Returns:
+        {'stops': [{'ticketId', 'legKm', 'arrivalMinutes', 'departureMinutes'}],
+         'totalDistanceKm', 'totalMinutes'} with minutes relative to departure
+    """
+    points = [start] + [(lat, lng) for _, lat, lng, _ in stops]
+    matrix = _distance_matrix(points)
+    tour = _two_opt(_nearest_neighbour(matrix), matrix) if len(points) > 2 else list(range(len(points)))
+
+    planned = []
+    clock = 0.0
+    total_km = 0.0
+    for previous, current in zip(tour, tour[1:]):
+        leg_km = matrix[previous][current]
+        ticket_id, _, _, service_minutes = stops[current - 1]
+        clock += leg_km / speed_kmh * 60
+        arrival = clock
+        clock += service_minutes
+        total_km += leg_km
+        planned.append({
+            'ticketId': ticket_id,
+            'legKm': round(leg_km, 2),
+            'arrivalMinutes': round(arrival, 1),
+            'departureMinutes': round(clock, 1)
+        })
+    return {'stops': planned, 'totalDistanceKm': round(total_km, 2), 'totalMinutes': round(clock, 1)}
+
+
+def _plan_job(job: Tuple) -> Dict:
+    """Process-pool entry point"""
+    start, stops, speed_kmh = job
+    return plan_route(start, stops, speed_kmh)
+
+
+class RoutePlanner:
+    """Per-team route cache in front of plan_route"""
+
+    def __init__(self, speed_kmh: float = ROUTE_SPEED_KMH, max_workers: int = None):
+        self.speed_kmh = speed_kmh
+        self.max_workers = max_workers
+        self._cache: Dict[str, Tuple[Tuple, Dict]] = {}
+        self.last_planned = 0
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        """The process's planning pool, started on first use"""
+        with self._pool_lock:
+            # A pool inherited through fork belongs to the parent process
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers or os.cpu_count() or 1)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _plan_in_pool(self, jobs: List[Tuple]) -> List[Dict]:
+        pool = self._executor()
+        try:
+            return list(pool.map(_plan_job, jobs))
+        except BrokenProcessPool:
+            # A pool process died; replace the pool and plan these inline
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False)
+            return [_plan_job(job) for job in jobs]
+
+    @staticmethod
+    def _signature(start: Tuple[float, float], stops: Sequence[Stop]) -> Tuple:
+        return (round(start[0], 3), round(start[1], 3), tuple(sorted(stops)))
+
+    def plan_all(self, requests: Dict[str, Tuple[Tuple[float, float], List[Stop]]]) -> Dict[str, Dict]:
+        """
+        Plans for several teams, re-planning only those whose stops changed
+
+        Args:
+            requests: {team_id: ((lat, lng), [stop, ...])}
+
+        Returns:
+            {team_id: plan} (see plan_route)
+        """
+        plans = {}
+        misses = []
+        for team_id, (start, stops) in requests.items():
+            signature = self._signature(start, stops)
+            cached = self._cache.get(team_id)
+            if cached is not None and cached[0] == signature:
+                plans[team_id] = cached[1]
+            else:
+                misses.append((team_id, signature, (start, list(stops), self.speed_kmh)))
+
+        workers = max(1, min(self.max_workers or os.cpu_count() or 1, len(misses)))
+        if workers > 1 and len(misses) >= ROUTE_POOL_MIN_TEAMS:
+            results = self._plan_in_pool([job for _, _, job in misses])
+        else:
+            results = [_plan_job(job) for _, _, job in misses]
+
+        for (team_id, signature, _), plan in zip(misses, results):
+            self._cache[team_id] = (signature, plan)
+            plans[team_id] = plan
+
+        # Forget teams that no longer have routes
+        for team_id in list(self._cache):
+            if team_id not in requests:
+                del self._cache[team_id]
+        self.last_planned = len(misses)
+        return plans
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for IntelligentAssignmentEngine team scoring
+
+Runs the greedy assignment step twice on the same generated dataset:
+
+  scalar      - _calculate_team_scores, one Python call chain per team
+  vectorized  - _calculate_team_scores_vectorized over TeamScoringMatrix
+
+and checks that both produce the same assignments and that every score
+agrees within VECTORIZED_SCORE_TOLERANCE. Teams can be replicated to see
+how the two scale with roster size.
+
+Usage:
+    python scripts/benchmark_assignment_scoring.py
+    python scripts/benchmark_assignment_scoring.py --tickets 15000 --team-multipliers 1 4 16
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+import numpy as np
+
+from enhanced_data_generator import EnhancedDataGenerator
+from intelligent_assignment_engine import (
+    IntelligentAssignmentEngine, TeamScoringMatrix, VECTORIZED_SCORE_TOLERANCE
+)
+
+
+def build_dataset(num_tickets, num_teams, seed=42):
+    random.seed(seed)
+    generator = EnhancedDataGenerator()
+    with contextlib.redirect_stdout(io.StringIO()):
+        teams = generator.generate_enhanced_teams(num_teams)
+        tickets = generator.generate_enhanced_tickets(num_tickets, teams)
+    # backend_server.py keys teams by _id
+    for team in teams:
+        team['_id'] = team['id']
+    return tickets, teams
+
+
+def replicate_teams(teams, multiplier):
+    replicated = []
+    for copy_index in range(multiplier):
+        for team in teams:
+            clone = copy.deepcopy(team)
+            clone['_id'] = f"{team['_id']}_{copy_index}"
+            replicated.append(clone)
+    return replicated
+
+
+def run_greedy(tickets, teams, vectorized, now):
+    tickets = copy.deepcopy(tickets)
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = IntelligentAssignmentEngine(tickets, teams)
+        engine.use_vectorized = vectorized
+        random.seed(7)
+        candidates = engine._get_unassigned_tickets(now)
+        available = engine._analyze_team_availability(now)
+        demand = engine._analyze_demand_by_zone(candidates)
+        start = time.perf_counter()
+        assignments = engine._assign_tickets_intelligently(candidates, available, demand, now)
+        elapsed = time.perf_counter() - start
+    return elapsed, [(a['ticketId'], a['teamId'], a['assignmentScore']) for a in assignments], candidates
+
+
+def max_score_difference(tickets, teams, now, samples=500, seed=3):
+    """Largest |scalar - vectorized| over random tickets and random team loads"""
+    rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = IntelligentAssignmentEngine(tickets, teams)
+        available = engine._analyze_team_availability(now)
+        demand = engine._analyze_demand_by_zone(tickets)
+
+    matrix = TeamScoringMatrix(engine, available)
+    worst = 0.0
+    for ticket in rng.sample(tickets, min(samples, len(tickets))):
+        loads = {team['_id']: [None] * rng.randint(0, 5) for team in available}
+        matrix.loads[:] = [len(loads[team['_id']]) for team in available]
+
+        expected = engine._calculate_team_scores(ticket, available, loads, demand)
+        actual = engine._calculate_team_scores_vectorized(ticket, matrix, demand)
+        eligible = {available[i]['_id']: float(actual[i]) for i in np.flatnonzero(np.isfinite(actual))}
+        assert eligible.keys() == expected.keys(), 'eligible team sets differ'
+        for team_id, score in expected.items():
+            worst = max(worst, abs(score - eligible[team_id]))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickets', type=int, default=15000)
+    parser.add_argument('--teams', type=int, default=150)
+    parser.add_argument('--team-multipliers', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    now = datetime.now()
+    tickets, base_teams = build_dataset(args.tickets, args.teams)
+
+    difference = max_score_difference(tickets, base_teams, now)
+    print(f"max |scalar - vectorized| score difference: {difference:.3g} "
+          f"(tolerance {VECTORIZED_SCORE_TOLERANCE:g})")
+    assert difference <= VECTORIZED_SCORE_TOLERANCE
+
+    print(f"{'teams':>8} {'tickets':>8} {'scalar':>10} {'vectorized':>11} {'speedup':>8}")
+    for multiplier in args.team_multipliers:
+        teams = replicate_teams(base_teams, multiplier)
+        scalar_time, scalar_result, candidates = run_greedy(tickets, teams, False, now)
+        vector_time, vector_result, _ = run_greedy(tickets, teams, True, now)
+        assert scalar_result == vector_result, 'assignments differ'
+        print(f"{len(teams):>8} {len(candidates):>8} {scalar_time * 1000:>8.0f}ms "
+              f"{vector_time * 1000:>9.0f}ms {scalar_time / vector_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
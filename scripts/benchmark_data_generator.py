@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark for EnhancedDataGenerator ticket generation
+
+Compares the per-ticket generator (generate_enhanced_tickets) with the
+NumPy path (generate_enhanced_tickets_vectorized) and checks that the
+status, priority, zone and age distributions agree.
+
+Usage:
+    python scripts/benchmark_data_generator.py
+    python scripts/benchmark_data_generator.py --tickets 15000 --large 1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+from enhanced_data_generator import EnhancedDataGenerator
+
+DISTRIBUTION_TOLERANCE = 0.02
+
+DISTRIBUTIONS = {
+    'status': lambda t: t['status'],
+    'priority': lambda t: t['priority'],
+    'zone': lambda t: t['location']['zone'],
+    'age (30-day bins)': lambda t: min(t['agingDays'], 365) // 30,
+    'sla met': lambda t: t['sla']['slaMetStatus'],
+}
+
+
+def shares(tickets, key):
+    counts = Counter(key(t) for t in tickets)
+    return {value: count / len(tickets) for value, count in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickets', type=int, default=15000)
+    parser.add_argument('--large', type=int, default=1000000,
+                        help='size of the vectorized-only run (0 to skip)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = EnhancedDataGenerator()
+    now = datetime.now()
+
+    random.seed(args.seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop_tickets = generator.generate_enhanced_tickets(args.tickets)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vector_tickets = generator.generate_enhanced_tickets_vectorized(args.tickets, seed=args.seed, now=now)
+    vector_time = time.perf_counter() - start
+
+    print(f"{args.tickets} tickets: loop {loop_time:.2f}s, vectorized {vector_time:.2f}s "
+          f"({loop_time / vector_time:.1f}x)")
+
+    for name, key in DISTRIBUTIONS.items():
+        expected, actual = shares(loop_tickets, key), shares(vector_tickets, key)
+        worst = max(abs(expected.get(v, 0) - actual.get(v, 0)) for v in set(expected) | set(actual))
+        print(f"  {name:<18} max share difference {worst:.3f}")
+        assert worst <= DISTRIBUTION_TOLERANCE, f"{name} distribution differs"
+
+    if args.large:
+        start = time.perf_counter()
+        columns = generator.generate_enhanced_tickets_vectorized(args.large, seed=args.seed, now=now, columnar=True)
+        columnar_time = time.perf_counter() - start
+        del columns
+
+        start = time.perf_counter()
+        tickets = generator.generate_enhanced_tickets_vectorized(args.large, seed=args.seed, now=now)
+        dict_time = time.perf_counter() - start
+        print(f"{len(tickets)} tickets: columnar {columnar_time:.1f}s, dicts {dict_time:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
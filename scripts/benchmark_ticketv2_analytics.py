@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /api/ticketv2/analytics/performance aggregation
+
+Compares three implementations of the ticket-derived numbers on synthetic
+datasets (default 15k, 150k and 1.5M tickets):
+
+  legacy   - original per-week / per-state scans re-parsing createdAt
+  python   - TicketStore week buckets with pre-parsed timestamps
+  numpy    - TicketColumns columnar snapshot with np.bincount
+
+Usage:
+    python scripts/benchmark_ticketv2_analytics.py
+    python scripts/benchmark_ticketv2_analytics.py --sizes 15000 150000 --legacy-max 150000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from ticket_store import TicketStore, ticketv2_performance_counts
+from ticket_columns import TicketColumns
+
+MALAYSIAN_STATES = ['Johor', 'Kedah', 'Kelantan', 'Melaka', 'Negeri Sembilan',
+                    'Pahang', 'Penang', 'Perak', 'Perlis', 'Sabah', 'Sarawak',
+                    'Selangor', 'Terengganu', 'Kuala Lumpur', 'Putrajaya']
+STATUSES = ['open', 'in_progress', 'closed', 'cancelled']
+STATUS_WEIGHTS = [9, 15, 71, 5]
+
+
+def generate_tickets(count, now, seed=42):
+    """Minimal ticket dicts with the fields the analytics endpoint reads"""
+    rng = random.Random(seed)
+    states = MALAYSIAN_STATES + ['Labuan']
+    statuses = rng.choices(STATUSES, weights=STATUS_WEIGHTS, k=count)
+    tickets = []
+    for i in range(count):
+        created = now - timedelta(minutes=rng.randint(0, 120 * 24 * 60))
+        status = statuses[i]
+        completed = None
+        if status == 'closed':
+            completed = (created + timedelta(minutes=rng.randint(30, 48 * 60))).isoformat()
+        tickets.append({
+            '_id': f"ticket_{i:08d}",
+            'status': status,
+            'priority': rng.choice(['low', 'medium', 'high', 'critical']),
+            'location': {'state': rng.choice(states), 'zone': 'Central', 'district': 'City Centre'},
+            'createdAt': created.isoformat(),
+            'completedAt': completed,
+            'assignedTeam': f"team_{rng.randint(0, 149):03d}" if rng.random() < 0.95 else None
+        })
+    return tickets
+
+
+def legacy_counts(tickets, now):
+    """Ticket sections of the endpoint as originally written (nested scans)"""
+    parse = lambda value: datetime.fromisoformat(value.replace('Z', '+00:00'))
+    weeks = []
+    for week_offset in range(-11, 1):
+        week_start = now + timedelta(weeks=week_offset)
+        week_end = week_start + timedelta(days=7)
+        week_tickets = [t for t in tickets if week_start <= parse(t['createdAt']) < week_end]
+        completed = [t for t in week_tickets if t['status'] in ['completed', 'resolved', 'closed']]
+        within_sla = 0
+        for t in completed:
+            resolved_time = t.get('resolvedAt') or t.get('completedAt')
+            if resolved_time and (parse(resolved_time) - parse(t['createdAt'])).total_seconds() / 3600 <= 24:
+                within_sla += 1
+        weeks.append({
+            'total': len(week_tickets),
+            'open': len([t for t in week_tickets if t['status'] in ['open', 'pending']]),
+            'in_progress': len([t for t in week_tickets if t['status'] == 'in_progress']),
+            'completed': len(completed),
+            'cancelled': len([t for t in week_tickets if t['status'] == 'cancelled']),
+            'assigned': len([t for t in week_tickets if t.get('assignedTeam')]),
+            'within_sla': within_sla
+        })
+
+    states_weekly = {}
+    for state in MALAYSIAN_STATES:
+        states_weekly[state] = []
+        for week_offset in range(-11, 1):
+            week_start = now + timedelta(weeks=week_offset)
+            week_end = week_start + timedelta(days=7)
+            state_tickets = [t for t in tickets if t['location']['state'] == state and
+                             week_start <= parse(t['createdAt']) < week_end]
+            states_weekly[state].append((
+                len([t for t in state_tickets if t['status'] in ['open', 'pending', 'in_progress']]),
+                len([t for t in state_tickets if t['status'] in ['completed', 'resolved', 'closed']]),
+                len(state_tickets)
+            ))
+    return {'weeks': weeks, 'states_weekly': states_weekly}
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[15000, 150000, 1500000])
+    parser.add_argument('--legacy-max', type=int, default=15000,
+                        help='skip the legacy implementation above this many tickets (it is O(weeks x states x N))')
+    args = parser.parse_args()
+
+    now = datetime.now()
+    print(f"{'tickets':>10} {'legacy':>10} {'python':>10} {'snapshot':>10} {'numpy':>10} {'speedup':>9}")
+    for size in args.sizes:
+        store = TicketStore(generate_tickets(size, now))
+
+        python_time, python_result = timed(lambda: ticketv2_performance_counts(store, now, MALAYSIAN_STATES))
+        snapshot_time, columns = timed(lambda: TicketColumns(store), repeat=1)
+        numpy_time, numpy_result = timed(lambda: columns.ticketv2_performance(now, MALAYSIAN_STATES))
+        assert numpy_result['weeks'] == python_result['weeks']
+        assert numpy_result['states_weekly'] == python_result['states_weekly']
+
+        legacy = '-'
+        if size <= args.legacy_max:
+            legacy_time, legacy_result = timed(lambda: legacy_counts(store.all(), now), repeat=1)
+            assert legacy_result['weeks'] == numpy_result['weeks']
+            assert legacy_result['states_weekly'] == numpy_result['states_weekly']
+            legacy = f"{legacy_time * 1000:.0f}ms"
+
+        print(f"{size:>10} {legacy:>10} {python_time * 1000:>8.0f}ms {snapshot_time * 1000:>8.0f}ms "
+              f"{numpy_time * 1000:>8.1f}ms {python_time / numpy_time:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Two-worker check: reads on one worker continue during a long write on another
+
+Forks two workers from one preloaded backend sharing a mutation journal,
+like gunicorn.conf.py does:
+
+  worker A  POST /api/assignment/daily/run (force) - holds the journal lock
+            for the whole run, padded by --run-seconds to stand in for a
+            production-size dataset
+  worker B  once A holds the journal lock, one thread PATCHes a team (a
+            writer that has to wait for A) while reader threads poll
+            GET /api/assignments and GET /api/teams
+
+Reports B's read latency while its writer waits and fails (exit 1) if any
+read took longer than --max-read-seconds (i.e. waited for A's run). Also checks that both workers
+end with the same dataset.
+
+Usage:
+    python scripts/check_multiworker_reads.py
+    python scripts/check_multiworker_reads.py --max-read-seconds 0.5
+"""
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def journal_locked(path):
+    """True while another process holds the journal's flock"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(fd)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--run-seconds', type=float, default=5.0, help='Extra time worker A spends in the engine run')
+    parser.add_argument('--max-read-seconds', type=float, default=1.0)
+    parser.add_argument('--readers', type=int, default=3)
+    args = parser.parse_args()
+
+    journal_path = os.path.join(tempfile.mkdtemp(), 'journal.jsonl')
+    os.environ['AIFF_JOURNAL_PATH'] = journal_path
+    os.environ.setdefault('AIFF_DATA_SNAPSHOT', '0')
+    sys.argv = sys.argv[:1]
+    with contextlib.redirect_stdout(io.StringIO()):
+        import backend_server as backend
+    from response_encoding import dumps
+
+    def fingerprint():
+        with backend.dataset_lock.read():
+            return hashlib.md5(dumps([
+                sorted(backend.tickets.all(), key=lambda t: t['_id']),
+                backend.field_teams,
+                sorted(backend.assignments, key=backend.assignment_key)
+            ])).hexdigest()
+
+    def fork(work):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            backend.start_worker()
+            try:
+                result = work()
+            except BaseException as e:
+                result = {'error': repr(e)}
+            os.write(write_end, json.dumps(result).encode())
+            os._exit(0)
+        os.close(write_end)
+        return pid, read_end
+
+    def worker_a():
+        engine_run = backend.IntelligentAssignmentEngine.run_daily_assignment
+
+        def slow_run(*run_args, **run_kwargs):
+            time.sleep(args.run_seconds)
+            return engine_run(*run_args, **run_kwargs)
+
+        backend.IntelligentAssignmentEngine.run_daily_assignment = slow_run
+        client = backend.app.test_client()
+        started = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = client.post('/api/assignment/daily/run', json={'force': True})
+        return {'status': response.status_code, 'seconds': round(time.time() - started, 2)}
+
+    def worker_b():
+        deadline = time.time() + 60
+        while not journal_locked(journal_path):
+            if time.time() > deadline:
+                return {'error': 'worker A never took the journal lock'}
+            time.sleep(0.01)
+
+        team_id = backend.field_teams[0]['_id']
+        write = {}
+        latencies = []
+        stop = threading.Event()
+
+        def writer():
+            started = time.time()
+            response = backend.app.test_client().patch(f'/api/live-tracking/teams/{team_id}', json={'status': 'busy'})
+            write.update(status=response.status_code, seconds=round(time.time() - started, 2))
+            stop.set()
+
+        def reader():
+            client = backend.app.test_client()
+            while not stop.is_set():
+                for path in ('/api/assignments?limit=1', '/api/teams'):
+                    started = time.time()
+                    client.get(path)
+                    latencies.append(time.time() - started)
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(args.readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        backend.journal.catch_up()
+        return {'write': write, 'reads': len(latencies),
+                'max_read': round(max(latencies), 3) if latencies else None,
+                'fingerprint': fingerprint()}
+
+    workers = [fork(worker_a), fork(worker_b)]
+    results = []
+    for pid, read_end in workers:
+        with os.fdopen(read_end) as pipe:
+            results.append(json.loads(pipe.read() or '{}'))
+        os.waitpid(pid, 0)
+    a, b = results
+    backend.start_worker()
+    backend.journal.catch_up()
+
+    print(f"worker A  daily run         {a}")
+    print(f"worker B  PATCH (waited)    {b.get('write')}")
+    print(f"worker B  reads meanwhile   {b.get('reads')} reads, max {b.get('max_read')} s")
+    same = b.get('fingerprint') == fingerprint()
+    print(f"dataset identical after     {same}")
+
+    ok = ('error' not in a and 'error' not in b and a.get('status') == 200
+          and b['write'].get('status') == 200 and b['reads'] > 0
+          and b['max_read'] <= args.max_read_seconds and same)
+    print('✅ OK' if ok else '❌ FAILED')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
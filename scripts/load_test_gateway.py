@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Load test for the API gateway (services/gateway)
+
+Sends concurrent GET requests to one or more gateway URLs and reports
+latency percentiles (p50/p90/p99/max), throughput and errors per URL.
+
+To measure the gateway itself rather than a database, point its upstream
+URLs at the stub upstream this script can serve: it answers every GET
+with a fixed JSON document (tickets list) over keep-alive HTTP/1.1.
+
+Usage:
+    # terminal 1: stub upstream
+    python scripts/load_test_gateway.py --serve-stub 5002 --stub-tickets 1000
+    # terminal 2: gateway in front of it
+    BACKEND_URL=http://127.0.0.1:5002 python services/gateway/main.py
+    # terminal 3: load
+    python scripts/load_test_gateway.py --url http://127.0.0.1:8085/api/teams \\
+        --concurrency 50 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def stub_document(tickets):
+    return json.dumps({
+        'tickets': [
+            {'id': i, 'ticketNumber': f"CTT_{i:05d}", 'status': 'open',
+             'priority': 'medium', 'zone': 'Central', 'assigned_team': None}
+            for i in range(tickets)
+        ],
+        'teams': []
+    }).encode('utf-8')
+
+
+async def serve_stub(port, tickets, delay_ms):
+    """Minimal keep-alive HTTP/1.1 upstream answering every request with one document"""
+    body = stub_document(tickets)
+    head = (f"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+            f"content-length: {len(body)}\r\n\r\n").encode('ascii')
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in request.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                if delay_ms:
+                    await asyncio.sleep(delay_ms / 1000)
+                writer.write(head + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', port, backlog=1024)
+    print(f"Stub upstream on http://127.0.0.1:{port} ({len(body)} byte document, {delay_ms} ms delay)")
+    async with server:
+        await server.serve_forever()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load(url, concurrency, total, warmup, timeout):
+    """Latencies (ms) of successful requests, error count, elapsed seconds"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        for _ in range(warmup):
+            await client.get(url)
+
+        latencies = []
+        errors = 0
+        remaining = total
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    await response.aread()
+                    if response.status_code >= 500:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        return latencies, errors, time.perf_counter() - started
+
+
+def report(url, latencies, errors, elapsed):
+    values = sorted(latencies)
+    print(f"\n{url}")
+    print(f"  requests   {len(values)} ok, {errors} errors in {elapsed:.2f}s "
+          f"({len(values) / elapsed:.0f} req/s)")
+    if values:
+        print(f"  latency    p50 {percentile(values, 0.50):.1f} ms   p90 {percentile(values, 0.90):.1f} ms   "
+              f"p99 {percentile(values, 0.99):.1f} ms   max {values[-1]:.1f} ms   "
+              f"mean {statistics.mean(values):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', nargs='+', default=['http://127.0.0.1:8085/api/teams'],
+                        help='Gateway URLs to load, one after another')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per URL')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--serve-stub', type=int, metavar='PORT',
+                        help='Run the stub upstream on PORT instead of generating load')
+    parser.add_argument('--stub-tickets', type=int, default=100, help='Tickets in the stub document')
+    parser.add_argument('--stub-delay-ms', type=float, default=0.0, help='Stub upstream think time')
+    args = parser.parse_args()
+
+    if args.serve_stub:
+        try:
+            asyncio.run(serve_stub(args.serve_stub, args.stub_tickets, args.stub_delay_ms))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if httpx is None:
+        sys.exit("httpx is required: pip install httpx")
+    for url in args.url:
+        latencies, errors, elapsed = asyncio.run(
+            run_load(url, args.concurrency, args.requests, args.warmup, args.timeout))
+        report(url, latencies, errors, elapsed)
+
+
+if __name__ == '__main__':
+    main()
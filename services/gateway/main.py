@@ -1,10 +1,20 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Any, Awaitable, Dict, Iterable, Tuple
+import asyncio
 import httpx
 import os
 import logging
 
+# h2 is optional: without it upstream clients speak HTTP/1.1 only
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,96 +36,128 @@ AUTH_URL = os.getenv("AUTH_URL", BACKEND_URL)
 TICKETS_URL = os.getenv("TICKETS_URL", BACKEND_URL)
 ANALYTICS_URL = os.getenv("ANALYTICS_URL", BACKEND_URL)
 AI_URL = os.getenv("AI_URL", BACKEND_URL)
+UPSTREAM_URLS = {
+    "auth": AUTH_URL,
+    "tickets": TICKETS_URL,
+    "analytics": ANALYTICS_URL,
+    "ai": AI_URL,
+}
+
+# Upstream connection pools
+# One client per upstream for the application's lifetime: connections are
+# kept alive and reused instead of paying TCP setup (and DNS) per request.
+# Timeouts are per upstream; AI calls wait on a language model.
+UPSTREAM_TIMEOUTS = {
+    "auth": float(os.getenv("AUTH_TIMEOUT", 10)),
+    "tickets": float(os.getenv("TICKETS_TIMEOUT", 30)),
+    "analytics": float(os.getenv("ANALYTICS_TIMEOUT", 30)),
+    "ai": float(os.getenv("AI_TIMEOUT", 60)),
+}
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 5))
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", 100))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", 20))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", 30))
+# HTTP/2 is negotiated over TLS (ALPN); plain http:// upstreams stay on 1.1
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "false").lower() in ("1", "true", "yes")
+
+clients: Dict[str, httpx.AsyncClient] = {}
+
+def create_upstream_client(name: str) -> httpx.AsyncClient:
+    """Pooled client for one upstream service"""
+    http2 = UPSTREAM_HTTP2 and HTTP2_AVAILABLE
+    if UPSTREAM_HTTP2 and not HTTP2_AVAILABLE:
+        logger.warning("UPSTREAM_HTTP2 is set but h2 is not installed; using HTTP/1.1")
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(UPSTREAM_TIMEOUTS[name], connect=UPSTREAM_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=UPSTREAM_MAX_CONNECTIONS,
+            max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+            keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY
+        ),
+        http2=http2
+    )
+
+@app.on_event("startup")
+async def open_upstream_clients():
+    for name in UPSTREAM_TIMEOUTS:
+        clients[name] = create_upstream_client(name)
+
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    for client in clients.values():
+        await client.aclose()
+    clients.clear()
 
 # Health check
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "gateway"}
 
-# Teams endpoints
-@app.get("/api/teams")
-async def get_teams():
-    logger.info("Teams endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AUTH_URL}/api/teams")
-            logger.info(f"Auth service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Teams service error: {e}")
-            raise HTTPException(status_code=503, detail="Teams service unavailable")
+# Upstream fan-out
+async def fetch_json(upstream: str, path: str) -> Any:
+    """
+    GET an upstream path; non-JSON bodies are wrapped as {"data": text}
 
-@app.get("/api/teams/analytics/productivity")
-async def get_teams_productivity():
-    logger.info("Teams productivity endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AUTH_URL}/api/teams/analytics/productivity")
-            logger.info(f"Auth service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Teams service error: {e}")
-            raise HTTPException(status_code=503, detail="Teams service unavailable")
+    A non-2xx answer raises httpx.HTTPStatusError, so an upstream error page
+    is reported as a failed section instead of being passed on as data.
+    """
+    response = await clients[upstream].get(UPSTREAM_URLS[upstream] + path)
+    response.raise_for_status()
+    if response.headers.get("content-type", "").startswith("application/json"):
+        return response.json()
+    return {"data": response.text}
 
-@app.get("/api/teams/analytics/zones")
-async def get_teams_zones():
-    logger.info("Teams zones endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AUTH_URL}/api/teams/analytics/zones")
-            logger.info(f"Auth service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Teams service error: {e}")
-            raise HTTPException(status_code=503, detail="Teams service unavailable")
+async def fan_out(
+    calls: Dict[str, Awaitable],
+    timeouts: Dict[str, float],
+    required: Iterable[str] = ()
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Run independent upstream calls concurrently, each under its own timeout
 
-# Tickets endpoints
-@app.get("/api/tickets")
-async def get_tickets(request: Request):
-    logger.info("Tickets endpoint called")
-    # Forward query parameters to tickets service
-    query_params = str(request.url.query)
-    tickets_url = f"{TICKETS_URL}/api/tickets"
-    if query_params:
-        tickets_url += f"?{query_params}"
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(tickets_url)
-            logger.info(f"Tickets service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Tickets service error: {e}")
-            raise HTTPException(status_code=503, detail="Tickets service unavailable")
+    Latency is that of the slowest call rather than the sum. A call that
+    fails or times out only loses its own section, unless it is required.
+
+    Args:
+        calls: Awaitables by section name
+        timeouts: Seconds allowed per section name
+        required: Sections whose failure fails the whole request (503)
 
-@app.get("/api/tickets/analytics/overview")
-async def get_tickets_overview():
-    logger.info("Tickets overview endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{TICKETS_URL}/api/tickets/analytics/overview")
-            logger.info(f"Tickets service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Tickets service error: {e}")
-            raise HTTPException(status_code=503, detail="Tickets service unavailable")
+    Returns:
+        (results, errors): results of the sections that succeeded, and an
+        error message per section that did not
+    """
+    names = list(calls)
+    outcomes = await asyncio.gather(
+        *[asyncio.wait_for(calls[name], timeouts[name]) for name in names],
+        return_exceptions=True
+    )
+    results, errors = {}, {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            errors[name] = f"timed out after {timeouts[name]:g}s"
+        elif isinstance(outcome, httpx.HTTPStatusError):
+            errors[name] = f"HTTP {outcome.response.status_code}"
+        elif isinstance(outcome, (httpx.HTTPError, ValueError)):
+            # ValueError: malformed JSON
+            errors[name] = str(outcome) or type(outcome).__name__
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results[name] = outcome
+    for name, error in errors.items():
+        logger.warning(f"Upstream section '{name}' failed: {error}")
+        if name in required:
+            raise HTTPException(status_code=503, detail=f"{name.capitalize()} service unavailable")
+    return results, errors
 
 # Ticketv2 API endpoint - Comprehensive ticket data with Malaysian teams
+TICKETV2_TIMEOUTS = {
+    "tickets": float(os.getenv("TICKETV2_TICKETS_TIMEOUT", 20)),
+    "teams": float(os.getenv("TICKETV2_TEAMS_TIMEOUT", 5)),
+    "assignments": float(os.getenv("TICKETV2_ASSIGNMENTS_TIMEOUT", 10)),
+}
+
 @app.get("/api/ticketv2")
 async def get_ticketv2_data(request: Request):
     """Enhanced ticketv2 API with 1000 tickets and 75 Malaysian cabinet name teams"""
@@ -142,321 +184,165 @@ async def get_ticketv2_data(request: Request):
         query_params.append(f"category={category}")
     
     query_string = "&".join(query_params)
-    tickets_url = f"{TICKETS_URL}/tickets"
-    if query_string:
-        tickets_url += f"?{query_string}"
     
-    async with httpx.AsyncClient() as client:
-        try:
-            # Get tickets data from backend
-            tickets_response = await client.get(f"{TICKETS_URL}/api/tickets{('?' + query_string) if query_string else ''}")
-            tickets_data = tickets_response.json() if tickets_response.headers.get("content-type", "").startswith("application/json") else {"data": tickets_response.text}
-            logger.info(f"Tickets data structure: {type(tickets_data)}, keys: {tickets_data.keys() if isinstance(tickets_data, dict) else 'not dict'}")
-            
-            # Get teams data from backend
-            teams_response = await client.get(f"{AUTH_URL}/api/teams")
-            teams_data = teams_response.json() if teams_response.headers.get("content-type", "").startswith("application/json") else {"data": teams_response.text}
-            logger.info(f"Teams data structure: {type(teams_data)}, keys: {teams_data.keys() if isinstance(teams_data, dict) else 'not dict'}")
-            
-            # Get assignments data from backend
-            assignments_response = await client.get(f"{TICKETS_URL}/api/assignments")
-            assignments_data = assignments_response.json() if assignments_response.headers.get("content-type", "").startswith("application/json") else {"data": assignments_response.text}
-            logger.info(f"Assignments data structure: {type(assignments_data)}, keys: {assignments_data.keys() if isinstance(assignments_data, dict) else 'not dict'}")
-            
-            # Combine all data into comprehensive response
-            comprehensive_data = {
-                "api_version": "v2",
-                "description": "Enhanced AIFF Ticket API with Malaysian Cabinet Name Teams",
-                "total_tickets": len(tickets_data.get("tickets", [])) if isinstance(tickets_data, dict) else len(tickets_data),
-                "total_teams": len(teams_data.get("teams", [])) if isinstance(teams_data, dict) else len(teams_data),
-                "total_assignments": len(assignments_data.get("assignments", [])) if isinstance(assignments_data, dict) else len(assignments_data),
-                "features": [
-                    "1000 tickets with 3 months of realistic data",
-                    "75 Malaysian Cabinet Name Teams",
-                    "Ticket aging and SLA tracking",
-                    "Intelligent assignment engine",
-                    "Productivity metrics and efficiency scores",
-                    "Root cause analysis with CTT_ticketnum_rootcausetitle format",
-                    "Realistic status distribution (25% open, 35% in-progress, 35% completed, 5% cancelled)",
-                    "24-hour SLA compliance tracking",
-                    "Zone-based team assignment",
-                    "Comprehensive analytics and reporting"
-                ],
-                "tickets": tickets_data,
-                "teams": teams_data,
-                "assignments": assignments_data,
-                "analytics": {
-                    "ticket_status_distribution": {
-                        "OPEN": 0.25,
-                        "IN_PROGRESS": 0.35,
-                        "COMPLETED": 0.35,
-                        "CANCELLED": 0.05
-                    },
-                    "sla_compliance": "24 hours",
-                    "team_capacity": "Maximum 5 tickets per day per team",
-                    "malaysian_states": [
-                        'Johor', 'Kedah', 'Kelantan', 'Melaka', 'Negeri Sembilan',
-                        'Pahang', 'Penang', 'Perak', 'Perlis', 'Sabah', 'Sarawak',
-                        'Selangor', 'Terengganu', 'Kuala Lumpur', 'Putrajaya'
-                    ],
-                    "root_cause_categories": [
-                        'FIBER_CUT', 'EQUIP_FAIL', 'POWER_OUT', 'WEATHER', 
-                        'CABLE_THEFT', 'CONSTR_DMG', 'MAINT_OVER', 'NET_CONGEST'
-                    ]
-                }
-            }
-            
-            logger.info(f"Ticketv2 API response: {len(comprehensive_data.get('tickets', {}).get('tickets', []))} tickets, {len(comprehensive_data.get('teams', {}).get('teams', []))} teams")
-            return JSONResponse(content=comprehensive_data, status_code=200)
-            
-        except httpx.RequestError as e:
-            logger.error(f"Ticketv2 API service error: {e}")
-            raise HTTPException(status_code=503, detail="Ticketv2 API service unavailable")
-
-# Assignments endpoints
-@app.get("/api/assignments")
-async def get_assignments():
-    logger.info("Assignments endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{TICKETS_URL}/api/assignments")
-            logger.info(f"Tickets service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Assignments service error: {e}")
-            raise HTTPException(status_code=503, detail="Assignments service unavailable")
-
-@app.get("/api/assignments/analytics/performance")
-async def get_assignments_performance():
-    logger.info("Assignments performance endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{TICKETS_URL}/api/assignments/analytics/performance")
-            logger.info(f"Tickets service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Assignments service error: {e}")
-            raise HTTPException(status_code=503, detail="Assignments service unavailable")
-
-# Analytics endpoints
-@app.get("/api/analytics/tickets/aging")
-async def get_tickets_aging():
-    logger.info("Tickets aging endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{ANALYTICS_URL}/api/analytics/tickets/aging")
-            logger.info(f"Analytics service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Analytics service error: {e}")
-            raise HTTPException(status_code=503, detail="Analytics service unavailable")
-
-# Planning endpoints
-@app.get("/api/planning/forecast")
-async def get_planning_forecast():
-    logger.info("Planning forecast endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{ANALYTICS_URL}/api/planning/forecast")
-            logger.info(f"Analytics service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Planning service error: {e}")
-            raise HTTPException(status_code=503, detail="Planning service unavailable")
-
-@app.get("/api/planning/zone-materials")
-async def get_zone_materials():
-    logger.info("Zone materials endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{ANALYTICS_URL}/api/planning/zone-materials")
-            logger.info(f"Analytics service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Planning service error: {e}")
-            raise HTTPException(status_code=503, detail="Planning service unavailable")
-
-# AI endpoints
-@app.get("/api/ai/insights")
-async def get_ai_insights():
-    logger.info("AI insights endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AI_URL}/api/ai/insights")
-            logger.info(f"AI service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"AI service error: {e}")
-            raise HTTPException(status_code=503, detail="AI service unavailable")
-
-@app.post("/api/ai/chat")
-async def ai_chat(request: dict):
-    logger.info("AI chat endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(f"{AI_URL}/ai/chat", json=request)
-            logger.info(f"AI service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"AI service error: {e}")
-            raise HTTPException(status_code=503, detail="AI service unavailable")
-
-@app.post("/api/ai/recommendations")
-async def ai_recommendations(request: dict):
-    logger.info("AI recommendations endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(f"{AI_URL}/ai/recommendations", json=request)
-            logger.info(f"AI service response: {response.status_code}")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"AI service error: {e}")
-            raise HTTPException(status_code=503, detail="AI service unavailable")
-
-# Live Tracking endpoints
-@app.get("/api/live-tracking/teams")
-async def get_live_teams():
-    """Get live tracking data for all teams"""
-    logger.info("Live teams tracking endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AUTH_URL}/auth/teams/live-tracking")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Live teams tracking service error: {e}")
-            raise HTTPException(status_code=503, detail="Live teams tracking service unavailable")
+    # Tickets, teams and assignments are fetched concurrently; a section
+    # whose upstream fails or is too slow is reported as degraded, except
+    # tickets, without which there is nothing to return (503)
+    sections, errors = await fan_out(
+        {
+            "tickets": fetch_json("tickets", f"/api/tickets{('?' + query_string) if query_string else ''}"),
+            "teams": fetch_json("auth", "/api/teams"),
+            "assignments": fetch_json("tickets", "/api/assignments"),
+        },
+        TICKETV2_TIMEOUTS,
+        required=("tickets",)
+    )
+    for name in errors:
+        sections[name] = {"error": f"{name.capitalize()} service unavailable"}
+    tickets_data = sections["tickets"]
+    teams_data = sections["teams"]
+    assignments_data = sections["assignments"]
+    
+    # Combine all data into comprehensive response
+    comprehensive_data = {
+        "api_version": "v2",
+        "description": "Enhanced AIFF Ticket API with Malaysian Cabinet Name Teams",
+        "total_tickets": len(tickets_data.get("tickets", [])) if isinstance(tickets_data, dict) else len(tickets_data),
+        "total_teams": len(teams_data.get("teams", [])) if isinstance(teams_data, dict) else len(teams_data),
+        "total_assignments": len(assignments_data.get("assignments", [])) if isinstance(assignments_data, dict) else len(assignments_data),
+        "features": [
+            "1000 tickets with 3 months of realistic data",
+            "75 Malaysian Cabinet Name Teams",
+            "Ticket aging and SLA tracking",
+            "Intelligent assignment engine",
+            "Productivity metrics and efficiency scores",
+            "Root cause analysis with CTT_ticketnum_rootcausetitle format",
+            "Realistic status distribution (25% open, 35% in-progress, 35% completed, 5% cancelled)",
+            "24-hour SLA compliance tracking",
+            "Zone-based team assignment",
+            "Comprehensive analytics and reporting"
+        ],
+        "tickets": tickets_data,
+        "teams": teams_data,
+        "assignments": assignments_data,
+        # Sections that failed or timed out: {section: reason}
+        "degraded": errors,
+        "analytics": {
+            "ticket_status_distribution": {
+                "OPEN": 0.25,
+                "IN_PROGRESS": 0.35,
+                "COMPLETED": 0.35,
+                "CANCELLED": 0.05
+            },
+            "sla_compliance": "24 hours",
+            "team_capacity": "Maximum 5 tickets per day per team",
+            "malaysian_states": [
+                'Johor', 'Kedah', 'Kelantan', 'Melaka', 'Negeri Sembilan',
+                'Pahang', 'Penang', 'Perak', 'Perlis', 'Sabah', 'Sarawak',
+                'Selangor', 'Terengganu', 'Kuala Lumpur', 'Putrajaya'
+            ],
+            "root_cause_categories": [
+                'FIBER_CUT', 'EQUIP_FAIL', 'POWER_OUT', 'WEATHER', 
+                'CABLE_THEFT', 'CONSTR_DMG', 'MAINT_OVER', 'NET_CONGEST'
+            ]
+        }
+    }
+    
+    logger.info(f"Ticketv2 API response: {comprehensive_data['total_tickets']} tickets, {comprehensive_data['total_teams']} teams")
+    return JSONResponse(content=comprehensive_data, status_code=200)
 
-@app.get("/api/live-tracking/teams/{team_id}")
-async def get_team_live_tracking(team_id: int):
-    """Get live tracking data for a specific team"""
-    logger.info(f"Live team tracking endpoint called for team {team_id}")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AUTH_URL}/auth/teams/{team_id}/live-tracking")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Live team tracking service error: {e}")
-            raise HTTPException(status_code=503, detail="Live team tracking service unavailable")
+# Proxied endpoints
+# (method, gateway path, upstream, upstream path, service name for errors).
+# Path parameters are substituted into the upstream path; the query string
+# and body are forwarded unchanged.
+PROXY_ROUTES = [
+    # Teams
+    ("GET", "/api/teams", "auth", "/api/teams", "Teams"),
+    ("GET", "/api/teams/analytics/productivity", "auth", "/api/teams/analytics/productivity", "Teams"),
+    ("GET", "/api/teams/analytics/zones", "auth", "/api/teams/analytics/zones", "Teams"),
+    # Tickets
+    ("GET", "/api/tickets", "tickets", "/api/tickets", "Tickets"),
+    ("GET", "/api/tickets/analytics/overview", "tickets", "/api/tickets/analytics/overview", "Tickets"),
+    # Assignments
+    ("GET", "/api/assignments", "tickets", "/api/assignments", "Assignments"),
+    ("GET", "/api/assignments/analytics/performance", "tickets", "/api/assignments/analytics/performance", "Assignments"),
+    # Analytics and planning
+    ("GET", "/api/analytics/tickets/aging", "analytics", "/api/analytics/tickets/aging", "Analytics"),
+    ("GET", "/api/planning/forecast", "analytics", "/api/planning/forecast", "Planning"),
+    ("GET", "/api/planning/zone-materials", "analytics", "/api/planning/zone-materials", "Planning"),
+    # AI
+    ("GET", "/api/ai/insights", "ai", "/api/ai/insights", "AI"),
+    ("POST", "/api/ai/chat", "ai", "/ai/chat", "AI"),
+    ("POST", "/api/ai/recommendations", "ai", "/ai/recommendations", "AI"),
+    # Live tracking
+    ("GET", "/api/live-tracking/teams", "auth", "/auth/teams/live-tracking", "Live teams tracking"),
+    ("GET", "/api/live-tracking/teams/{team_id}", "auth", "/auth/teams/{team_id}/live-tracking", "Live team tracking"),
+    ("POST", "/api/live-tracking/teams/{team_id}/update-location", "auth", "/auth/teams/{team_id}/update-location", "Update team location"),
+    ("GET", "/api/live-tracking/routes", "auth", "/auth/live-tracking/routes", "Live routes tracking"),
+    ("GET", "/api/live-tracking/tickets", "tickets", "/tickets/live-tracking", "Live tickets tracking"),
+    ("GET", "/api/live-tracking/tickets/{ticket_id}", "tickets", "/tickets/{ticket_id}/live-tracking", "Live ticket tracking"),
+    ("POST", "/api/live-tracking/tickets/{ticket_id}/update-progress", "tickets", "/tickets/{ticket_id}/update-progress", "Update ticket progress"),
+    ("GET", "/api/live-tracking/assignments", "tickets", "/tickets/live-tracking/assignments", "Live assignments tracking"),
+]
 
-@app.post("/api/live-tracking/teams/{team_id}/update-location")
-async def update_team_location(team_id: int, request: dict):
-    """Update team location and status"""
-    logger.info(f"Update team location endpoint called for team {team_id}")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(f"{AUTH_URL}/auth/teams/{team_id}/update-location", json=request)
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Update team location service error: {e}")
-            raise HTTPException(status_code=503, detail="Update team location service unavailable")
+# Request headers passed upstream; everything else (host, cookies, hop-by-hop)
+# stays at the gateway
+FORWARD_REQUEST_HEADERS = (
+    "accept", "accept-encoding", "authorization", "content-type",
+    "if-none-match", "if-modified-since"
+)
+# Upstream response headers dropped: hop-by-hop, or set by the gateway's own
+# server and CORS middleware
+DROP_RESPONSE_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade", "server", "date",
+    "access-control-allow-origin", "access-control-allow-credentials"
+}
 
-@app.get("/api/live-tracking/routes")
-async def get_live_routes():
-    """Get live tracking routes between teams and tickets"""
-    logger.info("Live routes tracking endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{AUTH_URL}/auth/live-tracking/routes")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Live routes tracking service error: {e}")
-            raise HTTPException(status_code=503, detail="Live routes tracking service unavailable")
+async def proxy(request: Request, upstream: str, path: str, service: str) -> StreamingResponse:
+    """
+    Forward a request and stream the upstream response back byte for byte
 
-@app.get("/api/live-tracking/tickets")
-async def get_live_tickets():
-    """Get live tracking data for active tickets"""
-    logger.info("Live tickets tracking endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{TICKETS_URL}/tickets/live-tracking")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Live tickets tracking service error: {e}")
-            raise HTTPException(status_code=503, detail="Live tickets tracking service unavailable")
+    The body is relayed as received (aiter_raw: still compressed if the
+    upstream compressed it) with status, content-type, content-encoding,
+    content-length, ETag and caching headers intact, so large lists are
+    neither parsed nor re-encoded and memory stays constant.
+    """
+    headers = {name: request.headers[name] for name in FORWARD_REQUEST_HEADERS if name in request.headers}
+    # Without this httpx would ask for gzip on behalf of a client that may
+    # not accept it
+    headers.setdefault("accept-encoding", "identity")
+    url = UPSTREAM_URLS[upstream] + path.format(**request.path_params)
+    if request.url.query:
+        url += f"?{request.url.query}"
+    client = clients[upstream]
+    upstream_request = client.build_request(
+        request.method,
+        url,
+        headers=headers,
+        content=await request.body() if request.method in ("POST", "PUT", "PATCH") else None
+    )
+    try:
+        response = await client.send(upstream_request, stream=True)
+    except httpx.RequestError as e:
+        logger.error(f"{service} service error: {e}")
+        raise HTTPException(status_code=503, detail=f"{service} service unavailable")
 
-@app.get("/api/live-tracking/tickets/{ticket_id}")
-async def get_ticket_live_tracking(ticket_id: int):
-    """Get live tracking data for a specific ticket"""
-    logger.info(f"Live ticket tracking endpoint called for ticket {ticket_id}")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{TICKETS_URL}/tickets/{ticket_id}/live-tracking")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Live ticket tracking service error: {e}")
-            raise HTTPException(status_code=503, detail="Live ticket tracking service unavailable")
+    logger.info(f"{request.method} {request.url.path} -> {upstream} {response.status_code}")
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers={name: value for name, value in response.headers.items() if name.lower() not in DROP_RESPONSE_HEADERS},
+        background=BackgroundTask(response.aclose)
+    )
 
-@app.post("/api/live-tracking/tickets/{ticket_id}/update-progress")
-async def update_ticket_progress(ticket_id: int, request: dict):
-    """Update ticket progress and status"""
-    logger.info(f"Update ticket progress endpoint called for ticket {ticket_id}")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(f"{TICKETS_URL}/tickets/{ticket_id}/update-progress", json=request)
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Update ticket progress service error: {e}")
-            raise HTTPException(status_code=503, detail="Update ticket progress service unavailable")
+def add_proxy_route(method: str, path: str, upstream: str, upstream_path: str, service: str):
+    async def endpoint(request: Request):
+        return await proxy(request, upstream, upstream_path, service)
+    app.add_api_route(path, endpoint, methods=[method], name=f"proxy {method} {path}")
 
-@app.get("/api/live-tracking/assignments")
-async def get_live_assignments():
-    """Get live assignment data between teams and tickets"""
-    logger.info("Live assignments tracking endpoint called")
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{TICKETS_URL}/tickets/live-tracking/assignments")
-            return JSONResponse(
-                content=response.json() if response.headers.get("content-type", "").startswith("application/json") else {"data": response.text},
-                status_code=response.status_code
-            )
-        except httpx.RequestError as e:
-            logger.error(f"Live assignments tracking service error: {e}")
-            raise HTTPException(status_code=503, detail="Live assignments tracking service unavailable")
+for route in PROXY_ROUTES:
+    add_proxy_route(*route)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,104 @@
+"""
+Statement counts for GET /tickets
+
+Runs the route against a seeded SQLite database (aiosqlite) in place of
+postgres and counts the SQL statements it sends. Team and user names come
+from the ticket page query itself, so a page of 1 and a page of 1000 cost
+the same number of statements.
+
+Usage:
+    cd services/tickets && python -m pytest -q test_main.py
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+httpx = pytest.importorskip("httpx")
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from main import app, get_db
+from models import Base, Team, Ticket, TicketCategory, User
+
+TEAMS = 5
+USERS = 10
+TICKETS = 200
+
+
+async def seed(session_factory):
+    async with session_factory() as db:
+        db.add_all(Team(id=i, name=f"Team {i}", zone="Central") for i in range(1, TEAMS + 1))
+        db.add_all(
+            User(id=i, username=f"user{i}", email=f"user{i}@local.test", full_name=f"User {i}")
+            for i in range(1, USERS + 1)
+        )
+        # Every third ticket is unassigned, the rest spread over all teams and users
+        db.add_all(
+            Ticket(
+                id=i,
+                ticket_number=f"CTT_{i:03d}",
+                title=f"Ticket {i}",
+                category=TicketCategory.REPAIR,
+                zone="Central",
+                assigned_team_id=None if i % 3 == 0 else i % TEAMS + 1,
+                assigned_user_id=None if i % 3 == 0 else i % USERS + 1,
+            )
+            for i in range(1, TICKETS + 1)
+        )
+        await db.commit()
+
+
+async def fetch_pages(database_url, limits):
+    """{limit: (statement count, response body)} for GET /tickets?limit=<limit>"""
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory)
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    pages = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://tickets") as client:
+            for limit in limits:
+                statements.clear()
+                response = await client.get("/tickets", params={"limit": limit})
+                assert response.status_code == 200
+                pages[limit] = (len(statements), response.json())
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+    return pages
+
+
+def test_ticket_page_statements_do_not_grow_with_page_size(tmp_path):
+    pages = asyncio.run(fetch_pages(f"sqlite+aiosqlite:///{tmp_path / 'tickets.db'}", (1, 1000)))
+
+    small_count, small = pages[1]
+    large_count, large = pages[1000]
+    assert len(small["tickets"]) == 1
+    assert len(large["tickets"]) == TICKETS
+    assert small_count == large_count == 1
+
+
+def test_ticket_page_resolves_team_and_user_names(tmp_path):
+    pages = asyncio.run(fetch_pages(f"sqlite+aiosqlite:///{tmp_path / 'tickets.db'}", (1000,)))
+
+    for ticket in pages[1000][1]["tickets"]:
+        if ticket["id"] % 3 == 0:
+            assert ticket["assigned_team"] is None
+            assert ticket["assigned_user"] is None
+        else:
+            assert ticket["assigned_team"] == f"Team {ticket['id'] % TEAMS + 1}"
+            assert ticket["assigned_user"] == f"User {ticket['id'] % USERS + 1}"
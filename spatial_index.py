@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Spatial Index - AIFF Backend
+Grid index over team and ticket coordinates with haversine distances
+
+Points are bucketed into fixed-size latitude/longitude cells (0.25 deg,
+roughly 28 km). k-nearest queries search rings of cells outward from the
+query cell and stop as soon as the k-th best distance is closer than
+anything an unsearched ring could hold; radius queries only visit the
+cells overlapping the radius' bounding box. With the team roster and
+ticket volumes of this backend both answer in well under a millisecond.
+"""
+
+import heapq
+import math
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+DEFAULT_CELL_DEGREES = 0.25
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _as_coordinates(lat, lng) -> Optional[Tuple[float, float]]:
+    if isinstance(lat, (int, float)) and isinstance(lng, (int, float)):
+        return float(lat), float(lng)
+    return None
+
+
+def team_coordinates(team: Dict) -> Optional[Tuple[float, float]]:
+    """(lat, lng) of a team's currentLocation, or None"""
+    location = team.get('currentLocation') or {}
+    return _as_coordinates(location.get('latitude', location.get('lat')),
+                           location.get('longitude', location.get('lng')))
+
+
+def ticket_coordinates(ticket: Dict) -> Optional[Tuple[float, float]]:
+    """(lat, lng) of a ticket's location.coordinates, or None"""
+    coordinates = (ticket.get('location') or {}).get('coordinates') or {}
+    return _as_coordinates(coordinates.get('lat', coordinates.get('latitude')),
+                           coordinates.get('lng', coordinates.get('longitude')))
+
+
+class SpatialIndex:
+    """
+    Grid index of keyed points
+
+    Keys are any hashable ids (team or ticket ids). Query results are
+    lists of (distance_km, key), nearest first.
+    """
+
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._points: Dict[Hashable, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, Tuple[float, float]]] = {}
+        # Occupied cell range; only grows, which keeps ring searches bounded
+        self._bounds: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._points
+
+    def location(self, key: Hashable) -> Optional[Tuple[float, float]]:
+        return self._points.get(key)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def upsert(self, key: Hashable, lat: float, lng: float):
+        """Insert or move a point"""
+        self.remove(key)
+        cell = self._cell(lat, lng)
+        self._points[key] = (lat, lng)
+        self._cells.setdefault(cell, {})[key] = (lat, lng)
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[0], cell[1], cell[1]]
+        else:
+            bounds = self._bounds
+            bounds[0], bounds[1] = min(bounds[0], cell[0]), max(bounds[1], cell[0])
+            bounds[2], bounds[3] = min(bounds[2], cell[1]), max(bounds[3], cell[1])
+
+    def remove(self, key: Hashable) -> bool:
+        point = self._points.pop(key, None)
+        if point is None:
+            return False
+        cell = self._cell(*point)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._cells[cell]
+        return True
+
+    def clear(self):
+        self._points.clear()
+        self._cells.clear()
+        self._bounds = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def k_nearest(self, lat: float, lng: float, k: int = 1,
+                  filter: Callable[[Hashable], bool] = None,
+                  max_km: float = None) -> List[Tuple[float, Hashable]]:
+        """
+        The k points nearest to (lat, lng)
+
+        Args:
+            lat, lng: Query point
+            k: Number of results
+            filter: Optional predicate on keys (e.g. only available teams)
+            max_km: Ignore points farther than this
+
+        Returns:
+            Up to k (distance_km, key) pairs, nearest first
+        """
+        if k <= 0 or self._bounds is None:
+            return []
+        ci, cj = self._cell(lat, lng)
+        max_ring = max(ci - self._bounds[0], self._bounds[1] - ci, cj - self._bounds[2], self._bounds[3] - cj, 0)
+        limit = math.inf if max_km is None else max_km
+
+        best: List[Tuple[float, Any]] = []  # max-heap of (-distance, key)
+        for ring in range(max_ring + 1):
+            for cell in self._ring_cells(ci, cj, ring):
+                for key, (plat, plng) in self._cells.get(cell, {}).items():
+                    if filter is not None and not filter(key):
+                        continue
+                    distance = haversine_km(lat, lng, plat, plng)
+                    if distance > limit:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+            # Anything outside the searched square is at least this far away
+            horizon = self._searched_radius_km(lat, lng, ci, cj, ring)
+            if horizon > limit or (len(best) == k and -best[0][0] <= horizon):
+                break
+
+        return sorted(((-negative, key) for negative, key in best), key=lambda item: item[0])
+
+    def within_radius(self, lat: float, lng: float, radius_km: float,
+                      filter: Callable[[Hashable], bool] = None) -> List[Tuple[float, Hashable]]:
+        """All points within radius_km of (lat, lng), nearest first"""
+        if self._bounds is None or radius_km < 0:
+            return []
+        dlat = radius_km / KM_PER_DEGREE
+        # Exact longitude half-width of the bounding box of a spherical cap
+        ratio = math.sin(min(math.pi / 2, radius_km / EARTH_RADIUS_KM)) / max(1e-12, math.cos(math.radians(lat)))
+        dlng = 180.0 if ratio >= 1 or abs(lat) + dlat >= 90 else math.degrees(math.asin(ratio))
+        low_i, low_j = self._cell(lat - dlat, lng - dlng)
+        high_i, high_j = self._cell(lat + dlat, lng + dlng)
+        low_i, high_i = max(low_i, self._bounds[0]), min(high_i, self._bounds[1])
+        low_j, high_j = max(low_j, self._bounds[2]), min(high_j, self._bounds[3])
+
+        matches = []
+        for i in range(low_i, high_i + 1):
+            for j in range(low_j, high_j + 1):
+                for key, (plat, plng) in self._cells.get((i, j), {}).items():
+                    if filter is not None and not filter(key):
+                        continue
+                    distance = haversine_km(lat, lng, plat, plng)
+                    if distance <= radius_km:
+                        matches.append((distance, key))
+        matches.sort(key=lambda item: item[0])
+        return matches
+
+    @staticmethod
+    def _ring_cells(ci: int, cj: int, ring: int):
+        if ring == 0:
+            yield (ci, cj)
+            return
+        for j in range(cj - ring, cj + ring + 1):
+            yield (ci - ring, j)
+            yield (ci + ring, j)
+        for i in range(ci - ring + 1, ci + ring):
+            yield (i, cj - ring)
+            yield (i, cj + ring)
+
+    def _searched_radius_km(self, lat: float, lng: float, ci: int, cj: int, ring: int) -> float:
+        """Lower bound on the distance to any cell beyond the given ring"""
+        size = self.cell_degrees
+        lat_gap = min(lat - (ci - ring) * size, (ci + ring + 1) * size - lat)
+        lng_gap = min(lng - (cj - ring) * size, (cj + ring + 1) * size - lng)
+        # Points past the longitude edge lie within |lat| <= widest, where
+        # sin^2(d/2) >= cos^2(widest) * sin^2(dlng/2) bounds their distance
+        widest = min(90.0, abs(lat) + (ring + 1) * size)
+        half_lng = math.radians(min(180.0, lng_gap)) / 2
+        lng_km = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(math.radians(widest)) * math.sin(half_lng)))
+        return min(lat_gap * KM_PER_DEGREE, lng_km)
+
+
+class TicketLocationIndex(SpatialIndex):
+    """SpatialIndex of ticket coordinates, kept current as a TicketStore observer"""
+
+    def track(self, ticket_id: str, ticket: Dict, times: Dict[str, Optional[float]]):
+        coordinates = ticket_coordinates(ticket)
+        if coordinates is None:
+            self.remove(ticket_id)
+        elif self.location(ticket_id) != coordinates:
+            self.upsert(ticket_id, *coordinates)
+
+    def reset(self):
+        self.clear()
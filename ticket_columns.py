@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Ticket Columns - AIFF Backend
+NumPy columnar snapshot of the ticket table for dashboard aggregations
+
+A snapshot encodes the fields the performance dashboards group by
+(status, priority, state, zone, creation week, assignment, resolution
+time) as flat arrays, so every weekly/state breakdown is a single
+``np.bincount`` over the whole table instead of a Python loop per group.
+Snapshots are immutable; build a new one when the store version changes.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+from ticket_store import TicketStore, WEEK_SECONDS
+
+# Status groups reported by /api/ticketv2/analytics/performance
+STATUS_GROUPS = {
+    'open': 0, 'pending': 0,
+    'in_progress': 1,
+    'completed': 2, 'resolved': 2, 'closed': 2,
+    'cancelled': 3,
+}
+OTHER_STATUS_GROUP = 4
+NUM_STATUS_GROUPS = 5
+
+SLA_TARGET_HOURS = 24
+
+
+class TicketColumns:
+    """
+    Columnar snapshot of a TicketStore
+
+    Categorical fields are dictionary-encoded: ``status_codes`` etc. index
+    into the matching ``*_names`` list. Missing timestamps are NaN.
+    """
+
+    def __init__(self, store: TicketStore):
+        self.version = store.version
+        size = len(store)
+
+        status_names: Dict[str, int] = {}
+        priority_names: Dict[str, int] = {}
+        state_names: Dict[str, int] = {}
+        zone_names: Dict[str, int] = {}
+
+        status = np.empty(size, dtype=np.int16)
+        priority = np.empty(size, dtype=np.int16)
+        state = np.empty(size, dtype=np.int16)
+        zone = np.empty(size, dtype=np.int16)
+        assigned = np.empty(size, dtype=bool)
+        created = np.empty(size, dtype=np.float64)
+        resolved = np.empty(size, dtype=np.float64)
+
+        for row, ticket in enumerate(store):
+            ticket_id = ticket['_id']
+            location = ticket.get('location', {})
+            status[row] = status_names.setdefault(ticket.get('status'), len(status_names))
+            priority[row] = priority_names.setdefault(ticket.get('priority'), len(priority_names))
+            state[row] = state_names.setdefault(location.get('state'), len(state_names))
+            zone[row] = zone_names.setdefault(location.get('zone'), len(zone_names))
+            assigned[row] = bool(ticket.get('assignedTeam'))
+
+            created_ts = store.timestamp(ticket_id, 'createdAt')
+            # Resolution prefers resolvedAt and falls back to completedAt
+            resolved_field = 'resolvedAt' if ticket.get('resolvedAt') else 'completedAt'
+            resolved_ts = store.timestamp(ticket_id, resolved_field)
+            created[row] = np.nan if created_ts is None else created_ts
+            resolved[row] = np.nan if resolved_ts is None else resolved_ts
+
+        self.size = size
+        self.status_names: List[str] = list(status_names)
+        self.priority_names: List[str] = list(priority_names)
+        self.state_names: List[str] = list(state_names)
+        self.zone_names: List[str] = list(zone_names)
+
+        self.status_codes = status
+        self.priority_codes = priority
+        self.state_codes = state
+        self.zone_codes = zone
+        self.assigned = assigned
+        self.created_ts = created
+        with np.errstate(invalid='ignore'):
+            self.resolution_hours = (resolved - created) / 3600
+
+        # Status code -> dashboard status group
+        group_lookup = np.array(
+            [STATUS_GROUPS.get(name, OTHER_STATUS_GROUP) for name in self.status_names] or [OTHER_STATUS_GROUP],
+            dtype=np.int16
+        )
+        self.status_groups = group_lookup[status] if size else np.empty(0, dtype=np.int16)
+
+    def week_index(self, now: datetime, weeks: int = 12) -> np.ndarray:
+        """
+        Rolling creation-week bucket per row (same windows as
+        ``TicketStore.week_buckets``); -1 for rows outside the range
+        """
+        start = (now - timedelta(weeks=weeks - 1)).timestamp()
+        with np.errstate(invalid='ignore'):
+            week = np.floor((self.created_ts - start) / WEEK_SECONDS)
+        week = np.where(np.isnan(week) | (week < 0) | (week >= weeks), -1, week)
+        return week.astype(np.int64)
+
+    def ticketv2_performance(self, now: datetime, states: List[str], weeks: int = 12) -> Dict:
+        """
+        All ticket-derived numbers for /api/ticketv2/analytics/performance
+
+        Returns raw counts; the route formats labels, ratios and rounding.
+        """
+        week = self.week_index(now, weeks)
+        in_range = week >= 0
+        week_r = week[in_range]
+        group_r = self.status_groups[in_range]
+
+        # Weekly status counts: one bincount over (week, status group)
+        week_group = np.bincount(
+            week_r * NUM_STATUS_GROUPS + group_r, minlength=weeks * NUM_STATUS_GROUPS
+        ).reshape(weeks, NUM_STATUS_GROUPS)
+        week_total = np.bincount(week_r, minlength=weeks)
+        week_assigned = np.bincount(week_r, weights=self.assigned[in_range], minlength=weeks)
+
+        # Completed within SLA (NaN resolution hours compare False)
+        completed_r = group_r == 2
+        with np.errstate(invalid='ignore'):
+            within_sla = completed_r & (self.resolution_hours[in_range] <= SLA_TARGET_HOURS)
+        week_within_sla = np.bincount(week_r, weights=within_sla, minlength=weeks)
+
+        # Per-state weekly open (open/pending/in_progress) and completed counts
+        state_lookup = {name: code for code, name in enumerate(self.state_names)}
+        num_codes = max(len(self.state_names), 1)
+        state_r = self.state_codes[in_range]
+        open_r = group_r <= 1
+        flat = week_r * num_codes + state_r
+        cells = weeks * num_codes
+        state_week_total = np.bincount(flat, minlength=cells).reshape(weeks, num_codes)
+        state_week_open = np.bincount(flat, weights=open_r, minlength=cells).reshape(weeks, num_codes)
+        state_week_completed = np.bincount(flat, weights=completed_r, minlength=cells).reshape(weeks, num_codes)
+
+        # All-time status distribution and per-state productivity
+        all_groups = np.bincount(self.status_groups, minlength=NUM_STATUS_GROUPS)
+        state_total = np.bincount(self.state_codes, minlength=num_codes)
+        state_completed = np.bincount(self.state_codes, weights=self.status_groups == 2, minlength=num_codes)
+
+        states_weekly = {}
+        states_totals = {}
+        for state in states:
+            code = state_lookup.get(state)
+            if code is None:
+                states_weekly[state] = [(0, 0, 0)] * weeks
+                states_totals[state] = (0, 0)
+                continue
+            states_weekly[state] = [
+                (int(state_week_open[w, code]), int(state_week_completed[w, code]), int(state_week_total[w, code]))
+                for w in range(weeks)
+            ]
+            states_totals[state] = (int(state_total[code]), int(state_completed[code]))
+
+        return {
+            'weeks': [
+                {
+                    'total': int(week_total[w]),
+                    'open': int(week_group[w, 0]),
+                    'in_progress': int(week_group[w, 1]),
+                    'completed': int(week_group[w, 2]),
+                    'cancelled': int(week_group[w, 3]),
+                    'assigned': int(week_assigned[w]),
+                    'within_sla': int(week_within_sla[w])
+                }
+                for w in range(weeks)
+            ],
+            'status_distribution': {
+                'open': int(all_groups[0]),
+                'in_progress': int(all_groups[1]),
+                'completed': int(all_groups[2]),
+                'cancelled': int(all_groups[3])
+            },
+            'states_weekly': states_weekly,
+            'states_totals': states_totals
+        }
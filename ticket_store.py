@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Ticket Store - AIFF Backend
+Indexed in-memory ticket table used by backend_server.py
+
+Keeps tickets in insertion order with a primary-key map plus secondary
+indexes on status, location (state/zone/district), assigned team and
+creation date, so lookups are O(1) and filtered listings cost O(result)
+instead of a scan over the whole dataset.
+
+ISO timestamps are parsed to epoch seconds once, when a ticket is added
+or reindexed, so analytics never call datetime.fromisoformat in loops.
+
+``query()`` serves the paginated ticket listings: index-backed filters,
+a creation-time range, a sort key and keyset cursors over per-field sort
+orders that are rebuilt lazily when the store version changes.
+"""
+
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Timestamp fields pre-parsed to epoch seconds on every add/reindex
+TIMESTAMP_FIELDS = ('createdAt', 'completedAt', 'resolvedAt', 'startedAt')
+
+WEEK_SECONDS = 7 * 24 * 3600
+
+PRIORITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Parse an ISO-8601 string (optionally 'Z' suffixed) to epoch seconds"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _location_field(field: str) -> Callable[[Dict], Any]:
+    def getter(ticket: Dict) -> Any:
+        location = ticket.get('location') or {}
+        return location.get(field) if isinstance(location, dict) else None
+    return getter
+
+
+def _created_date(ticket: Dict) -> Optional[str]:
+    created_at = ticket.get('createdAt')
+    return created_at[:10] if created_at else None
+
+
+def _sort_value(value) -> Tuple:
+    # Missing values sort after present ones in ascending order
+    return (1, '') if value is None else (0, value)
+
+
+def encode_cursor(sort: str, value: Tuple, seq: int) -> str:
+    """Opaque keyset cursor: the sort field plus the last row's (value, seq)"""
+    raw = json.dumps([sort, list(value), seq], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Tuple, int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, value, seq = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    # value is a _sort_value pair (missing flag, value); seq an insertion number
+    if (not isinstance(value, list) or len(value) != 2 or type(value[0]) is not int or value[0] not in (0, 1)
+            or type(value[1]) not in (str, int, float) or type(seq) is not int):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+    return tuple(value), seq
+
+
+def project(ticket: Dict, fields: List[str]) -> Dict:
+    """
+    Copy only the requested fields of a ticket
+
+    Dotted paths select nested fields, e.g. ``['_id', 'location.state']``
+    gives ``{'_id': ..., 'location': {'state': ...}}``. Missing fields are
+    omitted.
+    """
+    result: Dict = {}
+    for field in fields:
+        source, target = ticket, result
+        parts = field.split('.')
+        for part in parts[:-1]:
+            source = source.get(part) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(part, {})
+        else:
+            if isinstance(source, dict) and parts[-1] in source:
+                target[parts[-1]] = source[parts[-1]]
+    return result
+
+
+class TicketStore:
+    """
+    Indexed collection of ticket dicts
+
+    Iterating the store yields tickets in insertion order, so code written
+    against the old global ``tickets`` list keeps working. Tickets must be
+    mutated through ``update()`` (or followed by ``reindex()``) so the
+    secondary indexes stay consistent.
+    """
+
+    # Sort key name -> value extractor (ticket_id, index keys, parsed times)
+    SORT_KEYS: Dict[str, Callable[[str, Dict, Dict], Any]] = {
+        'createdAt': lambda tid, keys, times: times.get('createdAt'),
+        'completedAt': lambda tid, keys, times: times.get('completedAt'),
+        'priority': lambda tid, keys, times: PRIORITY_RANK.get(keys.get('priority')),
+        'status': lambda tid, keys, times: keys.get('status'),
+        'state': lambda tid, keys, times: keys.get('state'),
+        'zone': lambda tid, keys, times: keys.get('zone'),
+        'district': lambda tid, keys, times: keys.get('district'),
+    }
+    
+    # Secondary index name -> key extractor
+    INDEXES: Dict[str, Callable[[Dict], Any]] = {
+        'status': lambda t: t.get('status'),
+        'priority': lambda t: t.get('priority'),
+        'state': _location_field('state'),
+        'zone': _location_field('zone'),
+        'district': _location_field('district'),
+        'assignedTeam': lambda t: t.get('assignedTeam'),
+        'createdDate': _created_date,
+    }
+
+    def __init__(self, tickets: Iterable[Dict] = None):
+        self._tickets: Dict[str, Dict] = {}
+        self._seq: Dict[str, int] = {}
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._times: Dict[str, Dict[str, Optional[float]]] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[str, Dict]]] = {name: {} for name in self.INDEXES}
+        self._next_seq = 0
+        # Bumped on every mutation; lets callers cache derived views
+        self.version = 0
+        self._observers: List[Any] = []
+        # Sort field -> (version, [(value, seq)], [ticket]) built on demand
+        self._sort_orders: Dict[Optional[str], Tuple[int, List[Tuple], List[Dict]]] = {}
+
+        for ticket in tickets or []:
+            self.add(ticket)
+
+    # ------------------------------------------------------------------
+    # Collection protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(list(self._tickets.values()))
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return ticket_id in self._tickets
+
+    def all(self) -> List[Dict]:
+        """Return all tickets in insertion order"""
+        return list(self._tickets.values())
+
+    def slice(self, offset: int = 0, limit: int = None) -> List[Dict]:
+        """Return a page of tickets in insertion order"""
+        values = self.all()
+        if limit is None:
+            return values[offset:]
+        return values[offset:offset + limit]
+
+    def clear(self):
+        """Remove all tickets and reset indexes"""
+        self._tickets.clear()
+        self._seq.clear()
+        self._keys.clear()
+        self._times.clear()
+        for index in self._indexes.values():
+            index.clear()
+        self._sort_orders.clear()
+        self._next_seq = 0
+        self.version += 1
+        for observer in self._observers:
+            observer.reset()
+
+    def add_observer(self, observer):
+        """
+        Register an incremental aggregate
+
+        The observer's ``track(ticket_id, ticket, times)`` is called after
+        every add/reindex with the parsed timestamps, and ``reset()`` when
+        the store is cleared.
+        """
+        self._observers.append(observer)
+        for ticket_id, ticket in self._tickets.items():
+            observer.track(ticket_id, ticket, self._times[ticket_id])
+
+    # ------------------------------------------------------------------
+    # Mutations
+    # ------------------------------------------------------------------
+
+    def add(self, ticket: Dict) -> Dict:
+        """Insert a ticket (replaces an existing ticket with the same _id)"""
+        ticket_id = ticket['_id']
+        if ticket_id in self._tickets:
+            self._unindex(ticket_id)
+        else:
+            self._seq[ticket_id] = self._next_seq
+            self._next_seq += 1
+
+        self._tickets[ticket_id] = ticket
+        self._index(ticket)
+        self.version += 1
+        return ticket
+
+    def update(self, ticket_id: str, **changes) -> Optional[Dict]:
+        """
+        Apply field changes to a ticket and refresh its index entries
+
+        Returns:
+            The updated ticket, or None if it does not exist
+        """
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None:
+            return None
+        ticket.update(changes)
+        self.reindex(ticket_id)
+        return ticket
+
+    def reindex(self, ticket_or_id) -> bool:
+        """Refresh index entries for a ticket mutated in place"""
+        ticket_id = ticket_or_id['_id'] if isinstance(ticket_or_id, dict) else ticket_or_id
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None:
+            return False
+        self._unindex(ticket_id)
+        self._index(ticket)
+        self.version += 1
+        return True
+
+    def _index(self, ticket: Dict):
+        ticket_id = ticket['_id']
+        keys = {}
+        for name, extract in self.INDEXES.items():
+            value = extract(ticket)
+            keys[name] = value
+            self._indexes[name].setdefault(value, {})[ticket_id] = ticket
+        self._keys[ticket_id] = keys
+        self._times[ticket_id] = {field: parse_timestamp(ticket.get(field)) for field in TIMESTAMP_FIELDS}
+        for observer in self._observers:
+            observer.track(ticket_id, ticket, self._times[ticket_id])
+
+    def _unindex(self, ticket_id: str):
+        self._times.pop(ticket_id, None)
+        keys = self._keys.pop(ticket_id, {})
+        for name, value in keys.items():
+            bucket = self._indexes[name].get(value)
+            if bucket is not None:
+                bucket.pop(ticket_id, None)
+                if not bucket:
+                    del self._indexes[name][value]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get(self, ticket_id: str) -> Optional[Dict]:
+        """Primary-key lookup"""
+        return self._tickets.get(ticket_id)
+
+    def key(self, ticket_id: str, index: str) -> Any:
+        """Indexed value of a ticket (e.g. its createdDate)"""
+        return self._keys.get(ticket_id, {}).get(index)
+
+    def timestamp(self, ticket_id: str, field: str = 'createdAt') -> Optional[float]:
+        """Pre-parsed epoch seconds of a timestamp field (None if missing/invalid)"""
+        return self._times.get(ticket_id, {}).get(field)
+
+    def week_buckets(self, now: datetime, weeks: int = 12) -> List[List[Dict]]:
+        """
+        Group tickets by creation week in a single pass
+
+        Bucket i holds tickets created in
+        ``[now + (i - weeks + 1) weeks, now + (i - weeks + 2) weeks)``,
+        i.e. the same rolling windows the analytics endpoints report, with
+        the last bucket starting at ``now``.
+
+        Returns:
+            List of ``weeks`` ticket lists, oldest week first
+        """
+        start = (now - timedelta(weeks=weeks - 1)).timestamp()
+        buckets = [[] for _ in range(weeks)]
+        for ticket_id, ticket in self._tickets.items():
+            created = self._times[ticket_id]['createdAt']
+            if created is None or created < start:
+                continue
+            week = int((created - start) // WEEK_SECONDS)
+            if week < weeks:
+                buckets[week].append(ticket)
+        return buckets
+
+    def values(self, index: str) -> List[Any]:
+        """Distinct values present in an index"""
+        return list(self._indexes[index].keys())
+
+    def count(self, **criteria) -> int:
+        """Count tickets matching the criteria (see ``where``)"""
+        if len(criteria) == 1:
+            (index, wanted), = criteria.items()
+            return sum(len(self._indexes[index].get(v, ())) for v in self._as_values(wanted))
+        return len(self._match(criteria))
+
+    def where(self, **criteria) -> List[Dict]:
+        """
+        Return tickets matching all criteria, in insertion order
+
+        Each criterion is ``index=value`` or ``index=[value, ...]`` (any of).
+        Example: ``store.where(status=['open', 'pending'], state='Johor')``
+        """
+        matched = self._match(criteria)
+        if len(matched) > 1:
+            matched.sort(key=lambda t: self._seq[t['_id']])
+        return matched
+
+    def _match(self, criteria: Dict[str, Any]) -> List[Dict]:
+        if not criteria:
+            return self.all()
+
+        wanted = {name: self._as_values(value) for name, value in criteria.items()}
+        for name in wanted:
+            if name not in self._indexes:
+                raise KeyError(f"Unknown ticket index: {name}")
+
+        # Drive from the most selective criterion, check the rest per ticket
+        def bucket_size(name):
+            index = self._indexes[name]
+            return sum(len(index.get(v, ())) for v in wanted[name])
+
+        driver = min(wanted, key=bucket_size)
+        others = [(name, set(values)) for name, values in wanted.items() if name != driver]
+
+        matched = []
+        for value in wanted[driver]:
+            for ticket_id, ticket in self._indexes[driver].get(value, {}).items():
+                keys = self._keys[ticket_id]
+                if all(keys[name] in values for name, values in others):
+                    matched.append(ticket)
+        return matched
+
+    def query(self, criteria: Dict[str, Any] = None, created_from: float = None, created_to: float = None,
+              sort: str = None, descending: bool = False, cursor: str = None,
+              offset: int = 0, limit: int = None) -> Dict:
+        """
+        Filtered, sorted, paginated listing
+        
+        Args:
+            criteria: Index filters as for ``where`` (e.g. {'status': ['open']})
+            created_from: Earliest createdAt, epoch seconds (inclusive)
+            created_to: Latest createdAt, epoch seconds (exclusive)
+            sort: A SORT_KEYS name, or None for insertion order
+            descending: Reverse the sort, including the insertion-order tie-break
+            cursor: ``next_cursor`` of the previous page; resumes after that row
+            offset: Rows to skip (ignored when a cursor is given)
+            limit: Page size, or None for all remaining rows
+        
+        Returns:
+            {'tickets': [...], 'total': matching rows, 'next_cursor': str or None}
+        
+        Raises:
+            KeyError: Unknown index or sort key
+            ValueError: Invalid cursor
+        """
+        sort_name = sort or 'insertion'
+        if sort is not None and sort not in self.SORT_KEYS:
+            raise KeyError(f"Unknown ticket sort key: {sort}")
+        if descending:
+            sort_name += ':desc'
+        after = decode_cursor(cursor, sort_name) if cursor else None
+        
+        if not criteria and created_from is None and created_to is None:
+            keys, rows = self._sort_order(sort)
+        else:
+            rows = self._match(criteria) if criteria else None
+            if created_from is not None or created_to is not None:
+                rows = self._created_between(rows, created_from, created_to)
+            keyed = sorted(((self._sort_key(sort, t['_id']), t) for t in rows), key=lambda row: row[0])
+            keys = [key for key, _ in keyed]
+            rows = [ticket for _, ticket in keyed]
+        
+        total = len(rows)
+        try:
+            position = (bisect_left if descending else bisect_right)(keys, after) if after else None
+        except TypeError:
+            # Well-formed cursor whose value has another type than this sort key
+            raise ValueError("Invalid cursor")
+        if descending:
+            end = position if after else total - offset
+            start = max(0, end - limit) if limit is not None else 0
+            page = rows[start:max(end, 0)][::-1]
+            page_keys = keys[start:max(end, 0)][::-1]
+            more = start > 0
+        else:
+            start = position if after else offset
+            end = start + limit if limit is not None else total
+            page = rows[start:end]
+            page_keys = keys[start:end]
+            more = end < total
+        
+        next_cursor = None
+        if more and page:
+            value, seq = page_keys[-1]
+            next_cursor = encode_cursor(sort_name, value, seq)
+        return {'tickets': page, 'total': total, 'next_cursor': next_cursor}
+    
+    def _sort_key(self, sort: Optional[str], ticket_id: str) -> Tuple[Tuple, int]:
+        if sort is None:
+            return ((0, 0), self._seq[ticket_id])
+        extract = self.SORT_KEYS[sort]
+        return (_sort_value(extract(ticket_id, self._keys[ticket_id], self._times[ticket_id])), self._seq[ticket_id])
+    
+    def _sort_order(self, sort: Optional[str]) -> Tuple[List[Tuple], List[Dict]]:
+        """All tickets ordered by a sort key, cached until the next mutation"""
+        cached = self._sort_orders.get(sort)
+        if cached is None or cached[0] != self.version:
+            keyed = [(self._sort_key(sort, ticket_id), ticket) for ticket_id, ticket in self._tickets.items()]
+            # The primary map is already in insertion (seq) order
+            if sort is not None:
+                keyed.sort(key=lambda row: row[0])
+            cached = (self.version, [key for key, _ in keyed], [ticket for _, ticket in keyed])
+            self._sort_orders[sort] = cached
+        return cached[1], cached[2]
+    
+    def _created_between(self, rows: Optional[List[Dict]], created_from: Optional[float],
+                         created_to: Optional[float]) -> List[Dict]:
+        low = float('-inf') if created_from is None else created_from
+        high = float('inf') if created_to is None else created_to
+        if rows is None:
+            # Range scan over the createdAt order instead of a full pass
+            keys, ordered = self._sort_order('createdAt')
+            start = bisect_left(keys, ((0, low), -1))
+            end = bisect_left(keys, ((0, high), -1))
+            return ordered[start:end]
+        matched = []
+        for ticket in rows:
+            created = self._times[ticket['_id']]['createdAt']
+            if created is not None and low <= created < high:
+                matched.append(ticket)
+        return matched
+    
+    @staticmethod
+    def _as_values(value) -> List[Any]:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return list(dict.fromkeys(value))
+        return [value]
+
+
+# ----------------------------------------------------------------------
+# Aggregations (pure Python; ticket_columns.py has the NumPy equivalent)
+# ----------------------------------------------------------------------
+
+_OPEN_GROUP = ('open', 'pending')
+_COMPLETED_GROUP = ('completed', 'resolved', 'closed')
+
+
+def ticketv2_performance_counts(store: TicketStore, now: datetime, states: List[str], weeks: int = 12) -> Dict:
+    """
+    Ticket-derived numbers for /api/ticketv2/analytics/performance
+
+    Same result shape as ``TicketColumns.ticketv2_performance``; used when
+    NumPy is not installed.
+    """
+    week_summaries = []
+    week_state_counts = []
+    for bucket in store.week_buckets(now, weeks):
+        summary = {'total': len(bucket), 'open': 0, 'in_progress': 0, 'completed': 0,
+                   'cancelled': 0, 'assigned': 0, 'within_sla': 0}
+        state_counts: Dict[Any, List[int]] = {}
+        for ticket in bucket:
+            status = ticket['status']
+            counts = state_counts.setdefault(ticket.get('location', {}).get('state'), [0, 0, 0])
+            counts[2] += 1
+            if status in _OPEN_GROUP:
+                summary['open'] += 1
+                counts[0] += 1
+            elif status == 'in_progress':
+                summary['in_progress'] += 1
+                counts[0] += 1
+            elif status in _COMPLETED_GROUP:
+                summary['completed'] += 1
+                counts[1] += 1
+                resolved_field = 'resolvedAt' if ticket.get('resolvedAt') else 'completedAt'
+                created = store.timestamp(ticket['_id'], 'createdAt')
+                resolved = store.timestamp(ticket['_id'], resolved_field)
+                if created is not None and resolved is not None and (resolved - created) / 3600 <= 24:
+                    summary['within_sla'] += 1
+            elif status == 'cancelled':
+                summary['cancelled'] += 1
+            if ticket.get('assignedTeam'):
+                summary['assigned'] += 1
+        week_summaries.append(summary)
+        week_state_counts.append(state_counts)
+
+    states_weekly = {
+        state: [tuple(counts.get(state, (0, 0, 0))) for counts in week_state_counts]
+        for state in states
+    }
+    states_totals = {}
+    for state in states:
+        state_tickets = store.where(state=state)
+        completed = sum(1 for t in state_tickets if t['status'] in _COMPLETED_GROUP)
+        states_totals[state] = (len(state_tickets), completed)
+
+    return {
+        'weeks': week_summaries,
+        'status_distribution': {
+            'open': store.count(status=list(_OPEN_GROUP)),
+            'in_progress': store.count(status='in_progress'),
+            'completed': store.count(status=list(_COMPLETED_GROUP)),
+            'cancelled': store.count(status='cancelled')
+        },
+        'states_weekly': states_weekly,
+        'states_totals': states_totals
+    }
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Travel Matrix - AIFF Backend
+Precomputed district x district and team x district travel times
+
+Travel estimates used to be made per call (random ranges in the data
+generator, distance * 1.5 min/km in GeolocationService.getFallbackTravelData)
+and the assignment engine had no travel factor at all. This module keeps
+them in two float32 NumPy arrays:
+
+    district_minutes  places x places, built once
+    team_minutes      teams x places, one row per team, recomputed only
+                      for teams whose position changed
+
+A place is a (state, district) pair from EnhancedDataGenerator, plus one
+(state, '') entry per state for locations without a known district. The
+generator only has per-state base coordinates, so districts are laid out
+on a fixed ring (DISTRICT_SPREAD_DEGREES) around their state's base.
+Minutes use the same 1.5 min/km (40 km/h) as the JS fallback.
+"""
+
+import math
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from spatial_index import EARTH_RADIUS_KM, team_coordinates
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'data'))
+
+# The generator holds the state/district geography; without it the matrix
+# is empty and every lookup reports an unknown travel time
+try:
+    from enhanced_data_generator import EnhancedDataGenerator
+    GENERATOR_AVAILABLE = True
+except ImportError:
+    GENERATOR_AVAILABLE = False
+
+MINUTES_PER_KM = 1.5
+DISTRICT_SPREAD_DEGREES = 0.12
+UNKNOWN = -1
+
+Place = Tuple[str, str]
+
+
+def haversine_matrix_km(origins: 'np.ndarray', destinations: 'np.ndarray') -> 'np.ndarray':
+    """Great-circle distances (km) between (n, 2) and (m, 2) lat/lng arrays -> (n, m)"""
+    phi1 = np.radians(origins[:, 0])[:, None]
+    phi2 = np.radians(destinations[:, 0])[None, :]
+    dlmb = np.radians(destinations[:, 1][None, :] - origins[:, 1][:, None])
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def district_places(generator: 'EnhancedDataGenerator' = None) -> Dict[Place, Tuple[float, float]]:
+    """
+    Coordinates of every (state, district) and (state, '') place
+
+    Args:
+        generator: Source of state_coordinates and districts (default: a new
+            EnhancedDataGenerator)
+
+    Returns:
+        {(state, district): (lat, lng)}; empty if the generator is unavailable
+    """
+    if generator is None:
+        if not GENERATOR_AVAILABLE:
+            return {}
+        generator = EnhancedDataGenerator()
+    places = {}
+    for state, base in generator.state_coordinates.items():
+        places[(state, '')] = (base['lat'], base['lng'])
+        districts = generator.districts.get(state, [])
+        for i, district in enumerate(districts):
+            if len(districts) == 1:
+                places[(state, district)] = (base['lat'], base['lng'])
+                continue
+            angle = 2 * math.pi * i / len(districts)
+            places[(state, district)] = (
+                round(base['lat'] + DISTRICT_SPREAD_DEGREES * math.sin(angle), 4),
+                round(base['lng'] + DISTRICT_SPREAD_DEGREES * math.cos(angle), 4)
+            )
+    return places
+
+
+class TravelTimeMatrix:
+    """
+    Travel minutes between places and from teams to places
+
+    Lookups take integer place codes and team rows (from place_code and
+    team_rows) and broadcast like NumPy indexing; UNKNOWN codes or rows
+    yield NaN.
+    """
+
+    def __init__(self, places: Dict[Place, Tuple[float, float]] = None, minutes_per_km: float = MINUTES_PER_KM):
+        if places is None:
+            places = district_places()
+        self.minutes_per_km = minutes_per_km
+        self.places: List[Place] = list(places)
+        self.place_index: Dict[Place, int] = {place: i for i, place in enumerate(self.places)}
+        self.place_coordinates = np.array([places[place] for place in self.places], dtype=np.float64).reshape(-1, 2)
+        self.district_minutes = self._minutes(self.place_coordinates)
+
+        self.team_index: Dict[str, int] = {}
+        self._team_points: List[Optional[Tuple[float, float]]] = []
+        self._team_minutes = np.empty((0, len(self.places)), dtype=np.float32)
+
+    @classmethod
+    def for_teams(cls, teams: Iterable[Dict], places: Dict[Place, Tuple[float, float]] = None) -> 'TravelTimeMatrix':
+        matrix = cls(places)
+        for team in teams:
+            matrix.update_team(team)
+        return matrix
+
+    def _minutes(self, points: 'np.ndarray') -> 'np.ndarray':
+        return (haversine_matrix_km(points, self.place_coordinates) * self.minutes_per_km).astype(np.float32)
+
+    @property
+    def team_minutes(self) -> 'np.ndarray':
+        """teams x places minutes (rows as in team_index)"""
+        return self._team_minutes[:len(self._team_points)]
+
+    # ------------------------------------------------------------------
+    # Codes
+    # ------------------------------------------------------------------
+
+    def place_code(self, state: str, district: str = None) -> int:
+        """Code of (state, district), else of the state, else UNKNOWN"""
+        code = self.place_index.get((state, district or ''))
+        if code is None:
+            code = self.place_index.get((state, ''), UNKNOWN)
+        return code
+
+    def team_rows(self, team_ids: Iterable[str]) -> 'np.ndarray':
+        return np.array([self.team_index.get(team_id, UNKNOWN) for team_id in team_ids], dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Team positions
+    # ------------------------------------------------------------------
+
+    def update_team(self, team: Dict) -> bool:
+        """
+        Add a team or refresh its row after it moved
+
+        Teams without coordinates are placed at their district (or state).
+
+        Returns:
+            True if the team's row was (re)computed
+        """
+        point = team_coordinates(team)
+        if point is None:
+            code = self.place_code(team.get('state'), team.get('district'))
+            point = None if code == UNKNOWN else tuple(self.place_coordinates[code])
+        row = self.team_index.get(team['_id'])
+        if row is not None and self._team_points[row] == point:
+            return False
+        if row is None:
+            row = len(self._team_points)
+            self.team_index[team['_id']] = row
+            self._team_points.append(None)
+            if row == len(self._team_minutes):
+                # Grow by doubling so adding teams one by one stays linear
+                grown = np.full((max(8, 2 * row), len(self.places)), np.nan, dtype=np.float32)
+                grown[:row] = self._team_minutes[:row]
+                self._team_minutes = grown
+        self._team_points[row] = point
+        if point is None:
+            self._team_minutes[row] = np.nan
+        else:
+            self._team_minutes[row] = self._minutes(np.array([point], dtype=np.float64))[0]
+        return True
+
+    def clear_teams(self):
+        self.team_index.clear()
+        self._team_points.clear()
+        self._team_minutes = np.empty((0, len(self.places)), dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _take(table: 'np.ndarray', rows, columns) -> 'np.ndarray':
+        rows, columns = np.asarray(rows), np.asarray(columns)
+        known = (rows >= 0) & (columns >= 0)
+        if not table.size:
+            return np.where(known, np.nan, np.nan)
+        values = table[np.maximum(rows, 0), np.maximum(columns, 0)].astype(np.float64)
+        return np.where(known, values, np.nan)
+
+    def between(self, origin_codes, destination_codes) -> 'np.ndarray':
+        """Minutes between places (vectorized over broadcastable code arrays)"""
+        return self._take(self.district_minutes, origin_codes, destination_codes)
+
+    def from_teams(self, team_rows, place_codes) -> 'np.ndarray':
+        """Minutes from teams to places (vectorized over broadcastable arrays)"""
+        return self._take(self.team_minutes, team_rows, place_codes)
+
+    def team_to(self, team_id: str, state: str, district: str = None) -> Optional[float]:
+        """Minutes from one team to a state/district, or None if either is unknown"""
+        minutes = self.from_teams(self.team_index.get(team_id, UNKNOWN), self.place_code(state, district))
+        return None if np.isnan(minutes) else float(minutes)